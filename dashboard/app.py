@@ -1,8 +1,22 @@
+import os
+import math
+import datetime
+import tempfile
 import streamlit as st
 import pandas as pd
 import altair as alt
 from pathlib import Path
-from report_data import DataLoader
+from explorer import EXPORT_FORMATS, EXPORT_MAX_ROWS, export_file, fetch_page
+from trend import TREND_MEASURES, TREND_METHOD, load_trend, point_budget
+from report_data import (
+    APPROX_Z,
+    DataLoader,
+    confidence_interval,
+    current_generation,
+    load_combined,
+    load_concurrently,
+    pool_stats,
+)
 
 # --- Page Config ---
 st.set_page_config(
@@ -49,6 +63,27 @@
             text-transform: uppercase;
             letter-spacing: 1px;
         }
+        .kpi-note {
+            font-size: 0.7rem;
+            color: #95a5a6;
+            margin-top: 2px;
+        }
+
+        /* APPROXIMATE BADGE */
+        .approx-badge {
+            display: inline-block;
+            background-color: #fdebd0;
+            color: #b9770e;
+            border: 1px solid #f5cba7;
+            border-radius: 10px;
+            padding: 1px 8px;
+            margin-left: 8px;
+            font-size: 0.7rem;
+            font-weight: 700;
+            text-transform: uppercase;
+            letter-spacing: 1px;
+            vertical-align: middle;
+        }
 
         /* 3. CHART CARD STYLING */
         /* Targets the st.container(border=True) */
@@ -85,30 +120,105 @@
 ROOT = Path(__file__).resolve().parent.parent
 QUERIES = ROOT / "models" / "queries"
 
+# "combined": one GROUPING SETS scan; "concurrent": four queries in parallel
+QUERY_MODE = os.getenv("DASHBOARD_QUERY_MODE", "combined")
+
+# Query precision -> stratified sample estimated from (None = exact)
+PRECISIONS = {
+    "Exact": None,
+    "Approximate (1% sample)": "1pct",
+    "Approximate (0.1% sample)": "0.1pct",
+}
+CONFIDENCE = math.erf(APPROX_Z / math.sqrt(2))
+
+
+# Streamlit's in-memory caches are keyed by the refresh generation too, so a
+# refresh invalidates them along with the shared on-disk result cache
+generation = current_generation()
+
 
 # --- Load Filter Options ---
 @st.cache_data
-def load_years():
+def load_years(generation):
     df = DataLoader(QUERIES / "year_options.sql").get_data()
     if not df.empty:
         return df["report_year"].tolist()
     return [2019, 2018, 2017]
 
 
-years_list = load_years()
+years_list = load_years(generation)
+
+
+@st.cache_data
+def load_slice_options(generation):
+    df = DataLoader(QUERIES / "slice_options.sql").get_data()
+    return {
+        column: sorted(df[column].dropna().unique().tolist()) if not df.empty else []
+        for column in ["card_brand", "card_type", "gender"]
+    }
+
+
+slice_options = load_slice_options(generation)
 
 # --- Sidebar ---
 st.sidebar.title("Report Settings")
 selected_year = st.sidebar.selectbox("Select Fiscal Year", years_list, index=0)
 
+# Slices beyond the year are answered from the mart, not the rollups; the
+# approximate modes answer them from a stratified sample instead
+with st.sidebar.expander("Slice", expanded=False):
+    slice_filters = {
+        "card_brand": st.multiselect("Card Brand", slice_options["card_brand"]),
+        "card_type": st.multiselect("Card Type", slice_options["card_type"]),
+        "gender": st.multiselect("Gender", slice_options["gender"]),
+    }
+slice_filters = {name: values for name, values in slice_filters.items() if values}
+
+precision = st.sidebar.radio("Query Precision", list(PRECISIONS), key="precision")
+
+
+def run_exact_query():
+    # Button callback: runs before the rerun, so the radio can still be changed
+    st.session_state["precision"] = "Exact"
+
 
 # --- Data Loading ---
 @st.cache_data(show_spinner=False)
-def load_dashboard_data(year):
-    daily = DataLoader(QUERIES / "daily_metrics.sql").get_data(year=year)
-    hourly = DataLoader(QUERIES / "hourly_stats.sql").get_data(year=year)
-    demos = DataLoader(QUERIES / "demographic_stats.sql").get_data(year=year)
-    cats = DataLoader(QUERIES / "category_stats.sql").get_data(year=year)
+def load_dashboard_data(year, filters, sample, generation):
+    if QUERY_MODE == "combined":
+        frames, timings, errors = load_combined(
+            QUERIES / "dashboard_combined.sql", sample=sample, year=year, **filters
+        )
+    else:
+        # The four queries run concurrently; a failed one comes back empty
+        frames, timings, errors = load_concurrently(
+            {
+                "daily": QUERIES / "daily_metrics.sql",
+                "hourly": QUERIES / "hourly_stats.sql",
+                "demos": QUERIES / "demographic_stats.sql",
+                "cats": QUERIES / "category_stats.sql",
+            },
+            sample=sample,
+            year=year,
+            **filters,
+        )
+    daily, hourly, demos, cats = (
+        frames["daily"],
+        frames["hourly"],
+        frames["demos"],
+        frames["cats"],
+    )
+
+    # Failed queries degrade to empty frames with the expected columns
+    rate_columns = ["vol", "fraud_cases", "fraud_rate"]
+    if hourly.empty:
+        hourly = pd.DataFrame(columns=["hour_of_day"] + rate_columns)
+    if demos.empty:
+        demos = pd.DataFrame(columns=["age_group"] + rate_columns)
+    if cats.empty:
+        cats = pd.DataFrame(
+            columns=["merchant_category", "rev", "fraud_loss"] + rate_columns
+        )
 
     # Pre-processing
     if not hourly.empty:
@@ -119,10 +229,23 @@ def load_dashboard_data(year):
         cats["fraud_rate"] = cats["fraud_cases"] / cats["vol"]
         cats["fraud_loss"] = cats.get("fraud_loss", 0)
 
-    return daily, hourly, demos, cats
+    return daily, hourly, demos, cats, timings, errors
 
 
-daily_df, hourly_df, demo_df, cat_df = load_dashboard_data(selected_year)
+daily_df, hourly_df, demo_df, cat_df, query_timings, query_errors = (
+    load_dashboard_data(
+        selected_year, slice_filters, PRECISIONS[precision], generation
+    )
+)
+# Estimates carry variance columns; a missing sample falls back to exact results
+approximate = "vol_var" in daily_df.columns
+
+with st.sidebar.expander("Query Timings", expanded=False):
+    for name, elapsed in sorted(query_timings.items()):
+        st.caption(f"{name}: {elapsed * 1000:,.0f} ms")
+
+for name, error in query_errors.items():
+    st.warning(f"The {name} query failed; its panels are unavailable. ({error})")
 
 if daily_df.empty:
     st.warning(f"No data found for {selected_year}.")
@@ -133,6 +256,19 @@ def load_dashboard_data(year):
     f"<h1 style='text-align: center;'>Revenue Ops: {selected_year} Strategic Risk Profile</h1>",
     unsafe_allow_html=True,
 )
+
+APPROX_BADGE = "<span class='approx-badge'>Approximate</span>" if approximate else ""
+
+if approximate:
+    badge_col, button_col = st.columns([5, 1])
+    badge_col.markdown(
+        f"{APPROX_BADGE} Estimated from the {precision.split('(')[1].rstrip(')')}; "
+        f"ranges are {CONFIDENCE:.0%} confidence intervals.",
+        unsafe_allow_html=True,
+    )
+    button_col.button("Run Exact Query", on_click=run_exact_query)
+elif PRECISIONS[precision] is not None:
+    st.info("No sample is available for this view; showing exact results.")
 st.markdown("---")
 
 # --- KPI ROW (6 Columns) ---
@@ -153,49 +289,62 @@ def load_dashboard_data(year):
 fraud_rate_str = f"{fraud_rate:.2%}"
 
 
-def render_kpi(col, value, label):
+def render_kpi(col, value, label, note=None):
+    note_html = f'<div class="kpi-note">{note}</div>' if note else ""
     col.markdown(
         f"""
         <div class="kpi-card">
             <div class="kpi-value">{value}</div>
             <div class="kpi-label">{label}</div>
+            {note_html}
         </div>
     """,
         unsafe_allow_html=True,
     )
 
 
-render_kpi(kpi1, vol_str, "Annual Volume")
+def total_margin(column):
+    # Relative margin of an estimated annual total; days are sampled
+    # independently, so their variances add up
+    if not approximate:
+        return None
+    total = daily_df[column].sum()
+    low, high = confidence_interval(total, daily_df[f"{column}_var"].sum())
+    return f"± {(high - low) / 2 / abs(total):.1%}" if total else None
+
+
+render_kpi(kpi1, vol_str, "Annual Volume", total_margin("vol"))
 render_kpi(kpi2, f"{daily_df['vol'].mean():,.0f}", "Avg Daily Tx")
-render_kpi(kpi3, rev_str, "Annual Revenue")
+render_kpi(kpi3, rev_str, "Annual Revenue", total_margin("rev"))
 render_kpi(kpi4, avg_ticket, "Avg Ticket")
 render_kpi(kpi5, fraud_rate_str, "Fraud Rate")
-render_kpi(kpi6, loss_str, "Fraud Loss")
+render_kpi(kpi6, loss_str, "Fraud Loss", total_margin("fraud_loss"))
 
 st.markdown("---")
 
 
 # --- CHART HELPER ---
-def render_chart_in_card(title, chart_obj):
-    with st.container(border=True):
-        st.markdown(f"#### {title}")
-
-        # CHART CONFIGURATION
-        final_chart = (
-            chart_obj.properties(
-                background="#ffffff",
-                padding={"left": 20, "top": 20, "right": 50, "bottom": 20},
-            )
-            .configure_view(strokeWidth=0)
-            .configure_axis(
-                gridColor="#f0f0f0",
-                labelColor="#555",
-                titleColor="#555",
-                titleFontWeight="bold",
-            )
+def style_chart(chart_obj):
+    # CHART CONFIGURATION
+    return (
+        chart_obj.properties(
+            background="#ffffff",
+            padding={"left": 20, "top": 20, "right": 50, "bottom": 20},
+        )
+        .configure_view(strokeWidth=0)
+        .configure_axis(
+            gridColor="#f0f0f0",
+            labelColor="#555",
+            titleColor="#555",
+            titleFontWeight="bold",
         )
+    )
 
-        st.altair_chart(final_chart, width="stretch")
+
+def render_chart_in_card(title, chart_obj):
+    with st.container(border=True):
+        st.markdown(f"#### {title}{APPROX_BADGE}", unsafe_allow_html=True)
+        st.altair_chart(style_chart(chart_obj), width="stretch")
 
 
 # --- DASHBOARD LAYOUT ---
@@ -295,6 +444,109 @@ def render_chart_in_card(title, chart_obj):
     chart_q4 = (bar_q4 + text_q4).properties(height=320)
     render_chart_in_card("Q4. High-Risk Segments (Top 10)", chart_q4)
 
+# --- MULTI-YEAR TREND ---
+# Both charts are downsampled to a point budget set by the chart width
+# (DASHBOARD_TREND_WIDTH_PX); brushing the overview re-fetches the brushed range
+# at the full budget for the detail chart
+@st.cache_data(show_spinner=False)
+def load_trend_data(start_date, end_date, filters, sample, generation):
+    return load_trend(
+        start_date, end_date, point_budget(), TREND_METHOD, sample=sample, **filters
+    )
+
+
+def brushed_range(state):
+    # [start, end) dates of the overview brush, or None for the whole history
+    bounds = (state or {}).get("selection", {}).get("trend_zoom", {})
+    bounds = bounds.get("transaction_date")
+    if not bounds:
+        return None
+    start, end = [
+        pd.to_datetime(v, unit="ms" if isinstance(v, (int, float)) else None)
+        for v in bounds
+    ]
+    return start.date(), end.date() + datetime.timedelta(days=1)
+
+
+overview_df, history_days, trend_error = load_trend_data(
+    None, None, slice_filters, PRECISIONS[precision], generation
+)
+zoom_range = brushed_range(st.session_state.get("trend_overview"))
+if zoom_range:
+    trend_df, trend_days, trend_error = load_trend_data(
+        *zoom_range, slice_filters, PRECISIONS[precision], generation
+    )
+else:
+    trend_df, trend_days = overview_df, history_days
+
+st.markdown("---")
+with st.container(border=True):
+    st.markdown(
+        f"#### Q5. Multi-Year Trend (Revenue vs Fraud Loss){APPROX_BADGE}",
+        unsafe_allow_html=True,
+    )
+
+    if trend_error:
+        st.warning(f"The trend query failed; the trend is unavailable. ({trend_error})")
+    elif not overview_df.empty:
+        trend_df = trend_df.assign(label=trend_df["measure"].map(TREND_MEASURES))
+        base_q5 = alt.Chart(trend_df).encode(
+            x=alt.X("transaction_date:T", title=None),
+            tooltip=[
+                alt.Tooltip("transaction_date:T", title="Date"),
+                alt.Tooltip("label:N", title="Series"),
+                alt.Tooltip("value:Q", format="$,.0f", title="Amount"),
+            ],
+        )
+        rev_q5 = (
+            base_q5.transform_filter(alt.datum.measure == "rev")
+            .mark_line(color="#2c3e50", strokeWidth=1.5)
+            .encode(y=alt.Y("value:Q", title="Revenue", axis=alt.Axis(format="$.2s")))
+        )
+        loss_q5 = (
+            base_q5.transform_filter(alt.datum.measure == "fraud_loss")
+            .mark_line(color="#e74c3c", strokeWidth=1.5)
+            .encode(
+                y=alt.Y(
+                    "value:Q",
+                    title="Fraud Loss",
+                    axis=alt.Axis(format="$.2s", titleColor="#e74c3c"),
+                )
+            )
+        )
+        chart_q5 = (
+            alt.layer(rev_q5, loss_q5)
+            .resolve_scale(y="independent")
+            .properties(height=320)
+        )
+        st.altair_chart(style_chart(chart_q5), width="stretch")
+
+        # The overview only changes with the slice, so its brush survives reruns
+        trend_zoom = alt.selection_interval(encodings=["x"], name="trend_zoom")
+        overview_q5 = (
+            alt.Chart(overview_df[overview_df["measure"] == "rev"])
+            .mark_area(color="#95a5a6", opacity=0.4)
+            .encode(
+                x=alt.X("transaction_date:T", title=None),
+                y=alt.Y("value:Q", title=None, axis=None),
+            )
+            .add_params(trend_zoom)
+            .properties(height=60)
+        )
+        st.altair_chart(
+            style_chart(overview_q5),
+            width="stretch",
+            on_select="rerun",
+            key="trend_overview",
+        )
+
+        shown = trend_df.groupby("measure").size().max()
+        st.caption(
+            f"{shown:,} of {trend_days:,} daily points per series "
+            f"({TREND_METHOD} downsampling). Drag across the overview to zoom in; "
+            "click outside the brush to reset."
+        )
+
 # --- DETAIL TABLE ---
 st.markdown("---")
 with st.expander("Detailed Performance Data", expanded=False):
@@ -315,12 +567,104 @@ def render_chart_in_card(title, chart_obj):
     st.dataframe(
         display_df.sort_values("Fraud Rate", ascending=False).style.format(
             {
-                "Volume": "{:,}",
+                "Volume": "{:,.0f}",
                 "Revenue": "${:,.0f}",  # No decimals
-                "Fraud Cases": "{:,}",
+                "Fraud Cases": "{:,.0f}",
                 "Fraud Loss": "${:,.0f}",
                 "Fraud Rate": "{:.2%}",
             }
         ),
         width="stretch",
     )
+
+# --- TRANSACTION EXPLORER ---
+with st.expander("Transaction Explorer", expanded=False):
+    f1, f2, f3 = st.columns(3)
+    explorer_category = f1.selectbox(
+        "Merchant Category",
+        ["All"] + sorted(cat_df["merchant_category"].dropna().tolist()),
+    )
+    explorer_day = f2.date_input(
+        "Day",
+        value=None,
+        min_value=datetime.date(selected_year, 1, 1),
+        max_value=datetime.date(selected_year, 12, 31),
+    )
+    explorer_hour = f3.selectbox("Hour of Day", ["All"] + list(range(24)))
+
+    # Same year and slice as the panels above, narrowed by the explorer's own filters
+    explorer_filters = {
+        "year": selected_year,
+        **slice_filters,
+        "merchant_category": None if explorer_category == "All" else explorer_category,
+        "hour": None if explorer_hour == "All" else explorer_hour,
+    }
+    if explorer_day is not None:
+        explorer_filters["start_date"] = explorer_day
+        explorer_filters["end_date"] = explorer_day + datetime.timedelta(days=1)
+
+    # Keyset cursor per page; reset whenever the filters change
+    if st.session_state.get("explorer_filters") != explorer_filters:
+        st.session_state["explorer_filters"] = explorer_filters
+        st.session_state["explorer_keys"] = [None]
+
+    keys = st.session_state["explorer_keys"]
+    try:
+        page_df, next_key = fetch_page(after=keys[-1], **explorer_filters)
+    except Exception as e:
+        st.warning(f"The transaction explorer is unavailable. ({e})")
+        page_df, next_key = pd.DataFrame(), None
+    st.dataframe(page_df, width="stretch", hide_index=True)
+
+    p1, p2, p3 = st.columns([1, 1, 4])
+    if p1.button("← Previous", disabled=len(keys) == 1):
+        keys.pop()
+        st.rerun()
+    if p2.button("Next →", disabled=next_key is None):
+        keys.append(next_key)
+        st.rerun()
+    p3.caption(f"Page {len(keys)}")
+
+    # Exports stream in batches to a temporary file. The download button serves
+    # that file from memory, so in-app exports are capped at EXPORT_MAX_ROWS
+    e1, e2 = st.columns([1, 3])
+    export_format = e1.selectbox("Export Format", EXPORT_FORMATS)
+    if e2.button("Prepare Export"):
+        # Replace the previous export file rather than accumulating them
+        previous = st.session_state.pop("explorer_export", None)
+        if previous and os.path.exists(previous[0]):
+            os.remove(previous[0])
+
+        suffix = f".{export_format}"
+        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as f:
+            export_path = f.name
+        try:
+            export_rows = export_file(
+                export_path, export_format, EXPORT_MAX_ROWS, **explorer_filters
+            )
+            st.session_state["explorer_export"] = (
+                export_path,
+                export_format,
+                export_rows,
+            )
+        except Exception as e:
+            st.error(f"Export failed. ({e})")
+
+    if "explorer_export" in st.session_state:
+        export_path, export_format, export_rows = st.session_state["explorer_export"]
+        if os.path.exists(export_path):
+            with open(export_path, "rb") as f:
+                st.download_button(
+                    f"Download {export_rows:,} rows ({export_format.upper()})",
+                    f,
+                    file_name=f"transactions_{selected_year}.{export_format}",
+                )
+            if export_rows >= EXPORT_MAX_ROWS:
+                st.caption(
+                    f"Capped at {EXPORT_MAX_ROWS:,} rows. Export the full result with "
+                    "`python dashboard/explorer.py <file> --year ...` (see README)."
+                )
+
+# --- CONNECTION POOL ---
+with st.sidebar.expander("Connection Pool", expanded=False):
+    st.json(pool_stats())
@@ -0,0 +1,220 @@
+import os
+import csv
+import time
+import argparse
+import pandas as pd
+from sqlalchemy import text
+from report_data import TELEMETRY, compile_filters, connect, get_engine
+
+# Row-level access to enriched_transactions for the dashboard drill-down.
+# Pages are read with keyset pagination on (transaction_date, transaction_id):
+# each page starts after the last key of the previous one, so page N costs the
+# same as page 1. Exports stream through a server-side cursor in batches.
+
+EXPLORER_COLUMNS = [
+    "transaction_date",
+    "transaction_time",
+    "transaction_id",
+    "client_id",
+    "card_id",
+    "transaction_amount",
+    "transaction_type",
+    "transaction_status",
+    "is_fraud",
+    "fraud_loss_amount",
+    "merchant_category",
+    "merchant_city",
+    "merchant_state",
+    "card_brand",
+    "card_type",
+]
+PAGE_SIZE = 100
+EXPORT_BATCH_ROWS = 50000
+# The browser download is served from the dashboard's memory, so in-app exports
+# stop at this many rows; full exports go through the command line below
+EXPORT_MAX_ROWS = int(os.getenv("DASHBOARD_EXPORT_MAX_ROWS", "200000"))
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+EXPORT_FORMATS = ["csv", "parquet"] if pyarrow is not None else ["csv"]
+
+
+def compile_explorer_filters(hour=None, **filters):
+    """
+    Dashboard filters (see compile_filters) plus an optional hour of day,
+    matched against the precomputed hour_of_day column.
+    """
+    filter_sql, params = compile_filters(**filters)
+
+    if hour is not None:
+        filter_sql += " AND hour_of_day = :f_hour"
+        params["f_hour"] = int(hour)
+
+    return filter_sql, params
+
+
+def _select(filter_sql, keyset_sql="", limit_sql=""):
+    return text(
+        f"""
+        SELECT {", ".join(EXPLORER_COLUMNS)}
+        FROM enriched_transactions
+        WHERE 1 = 1{filter_sql}{keyset_sql}
+        ORDER BY transaction_date, transaction_id
+        {limit_sql}
+        """
+    )
+
+
+def fetch_page(after=None, page_size=PAGE_SIZE, **filters):
+    """
+    Returns (df, next_after): one page of transactions ordered by
+    (transaction_date, transaction_id), starting after the `after` key.
+    next_after is None on the last page.
+    """
+    filter_sql, params = compile_explorer_filters(**filters)
+    keyset_sql = ""
+
+    if after is not None:
+        # The leading date bound is sargable on idx_int_date_status; ids within
+        # the boundary date are ordered with an incremental sort
+        keyset_sql = (
+            " AND transaction_date >= :k_date"
+            " AND (transaction_date > :k_date OR transaction_id > :k_id)"
+        )
+        params["k_date"], params["k_id"] = after
+
+    params["limit"] = page_size + 1
+    query = _select(filter_sql, keyset_sql, "LIMIT :limit")
+
+    with TELEMETRY.span("query", "explorer_page") as span:
+        with connect() as connection:
+            df = pd.read_sql(query, connection, params=params)
+        span.rows = len(df)
+
+    next_after = None
+    if len(df) > page_size:
+        df = df.iloc[:page_size]
+        last = df.iloc[-1]
+        next_after = (last["transaction_date"], int(last["transaction_id"]))
+    return df, next_after
+
+
+def iter_batches(batch_rows=EXPORT_BATCH_ROWS, max_rows=None, **filters):
+    # Stream the filtered rows through a server-side cursor, one DataFrame per
+    # batch; at most max_rows rows when set
+    filter_sql, params = compile_explorer_filters(**filters)
+    limit_sql = ""
+    if max_rows is not None:
+        limit_sql = "LIMIT :limit"
+        params["limit"] = int(max_rows)
+    query = _select(filter_sql, limit_sql=limit_sql)
+
+    with connect() as connection:
+        connection = connection.execution_options(
+            stream_results=True, max_row_buffer=batch_rows
+        )
+        for batch in pd.read_sql(
+            query, connection, params=params, chunksize=batch_rows
+        ):
+            yield batch
+
+
+def export_csv(file, max_rows=None, **filters):
+    # Write the filtered rows to a text file object; returns the row count
+    rows = 0
+    header = True
+    with TELEMETRY.span("export", "csv") as span:
+        for batch in iter_batches(max_rows=max_rows, **filters):
+            batch.to_csv(file, index=False, header=header, quoting=csv.QUOTE_MINIMAL)
+            header = False
+            rows += len(batch)
+        span.rows = rows
+
+    if header:
+        file.write(",".join(EXPLORER_COLUMNS) + "\n")
+    return rows
+
+
+def export_parquet(file, max_rows=None, **filters):
+    # Write the filtered rows to a Parquet file (path or binary file object),
+    # one row group per batch; returns the row count
+    if pyarrow is None:
+        raise RuntimeError("Parquet export requires pyarrow")
+
+    rows = 0
+    writer = None
+    with TELEMETRY.span("export", "parquet") as span:
+        try:
+            for batch in iter_batches(max_rows=max_rows, **filters):
+                table = pyarrow.Table.from_pandas(batch, preserve_index=False)
+                if writer is None:
+                    writer = pyarrow.parquet.ParquetWriter(file, table.schema)
+                else:
+                    table = table.cast(writer.schema)
+                writer.write_table(table)
+                rows += len(batch)
+        finally:
+            if writer is not None:
+                writer.close()
+        span.rows = rows
+
+    return rows
+
+
+def export_file(path, export_format, max_rows=None, **filters):
+    """
+    Exports the filtered rows to path as "csv" or "parquet" and returns the row
+    count. A failed export removes the partly written file and re-raises.
+    """
+    try:
+        if export_format == "parquet":
+            return export_parquet(path, max_rows, **filters)
+        with open(path, "w", newline="") as f:
+            return export_csv(f, max_rows, **filters)
+    except Exception:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Export enriched_transactions rows without loading them into memory"
+    )
+    parser.add_argument("out", help="Output file (.csv or .parquet)")
+    parser.add_argument("--year", type=int)
+    parser.add_argument("--start-date", help="YYYY-MM-DD (inclusive)")
+    parser.add_argument("--end-date", help="YYYY-MM-DD (exclusive)")
+    parser.add_argument("--hour", type=int)
+    parser.add_argument("--merchant-category")
+    # The dashboard's Slice filters; repeat a flag to match any of several values
+    parser.add_argument("--card-brand", action="append")
+    parser.add_argument("--card-type", action="append")
+    parser.add_argument("--gender", action="append")
+    args = parser.parse_args()
+
+    if get_engine() is None:
+        print("Error: DB_CONNECTION_STRING not found in .env file.")
+        exit()
+
+    filters = {
+        "year": args.year,
+        "start_date": args.start_date,
+        "end_date": args.end_date,
+        "hour": args.hour,
+        "merchant_category": args.merchant_category,
+        "card_brand": args.card_brand,
+        "card_type": args.card_type,
+        "gender": args.gender,
+    }
+
+    start_time = time.perf_counter()
+    export_format = "parquet" if args.out.endswith(".parquet") else "csv"
+    rows = export_file(args.out, export_format, **filters)
+
+    elapsed = time.perf_counter() - start_time
+    print(f"Exported {rows:,} rows to {args.out} [{elapsed:.2f}s]")
@@ -1,53 +1,671 @@
 import os
+import sys
+import math
+import time
+import datetime
+import tempfile
+import threading
 import pandas as pd
-from sqlalchemy import create_engine
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from sqlalchemy import create_engine, event, text
 from dotenv import load_dotenv
 from pathlib import Path
+from result_cache import ResultCache, cache_key
+import snapshot
+
+# Telemetry is shared with the pipeline scripts
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+from telemetry import Telemetry, record_client_sql_time, submit_in_context
 
 # Load environment variables
 env_path = Path(__file__).resolve().parent.parent / ".env"
 load_dotenv(dotenv_path=env_path)
 
+# Same-named queries answered from the pre-aggregated rollup_transactions table
+ROLLUP_QUERIES = Path(__file__).resolve().parent.parent / "models" / "rollup_queries"
+# Same-named queries estimated from the stratified sample_transactions table
+SAMPLE_QUERIES = Path(__file__).resolve().parent.parent / "models" / "sample_queries"
+
+# --- Shared Engine ---
+# One pooled engine per process, shared by every Streamlit session.
+# Pool settings come from the environment (.env) with conservative defaults.
+POOL_SETTINGS = {
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+    "max_overflow": int(os.getenv("DB_POOL_MAX_OVERFLOW", "5")),
+    "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "30")),
+    "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() == "true",
+}
+STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "60000"))
+
+# --- Fetch Path ---
+# "copy": COPY ... TO STDOUT parsed by pandas' C reader into typed columns;
+# "read_sql": pd.read_sql over DB-API row tuples (Decimal objects for NUMERIC)
+FETCH_MODE = os.getenv("DASHBOARD_FETCH_MODE", "copy")
+# COPY output is buffered in memory up to this size, then spilled to disk
+COPY_SPOOL_BYTES = 64 * 1024 * 1024
+
+# --- Query Backend ---
+# "postgres": every query runs in the database; "snapshot": queries are answered
+# in-process from the columnar snapshot (dashboard/snapshot.py), falling back to
+# Postgres when no snapshot exists or a query has no snapshot implementation
+BACKEND = os.getenv("DASHBOARD_BACKEND", "postgres")
+
+# --- Approximate Mode ---
+# Samples built by models/samples (sample_name -> share of the mart's rows)
+SAMPLES = {"1pct": 0.01, "0.1pct": 0.001}
+# Standard normal quantile of the confidence intervals (1.96 -> 95%)
+APPROX_Z = float(os.getenv("DASHBOARD_APPROX_Z", "1.96"))
+
+# --- Result Cache ---
+# Query results persisted on disk and shared by every dashboard process,
+# invalidated by the refresh generation that each mart refresh bumps.
+RESULT_CACHE_ENABLED = os.getenv("RESULT_CACHE_ENABLED", "true").lower() == "true"
+RESULT_CACHE_PATH = os.getenv(
+    "RESULT_CACHE_PATH",
+    str(Path(__file__).resolve().parent.parent / ".cache" / "dashboard_results.sqlite"),
+)
+RESULT_CACHE_MAX_MB = int(os.getenv("RESULT_CACHE_MAX_MB", "256"))
+# How long a process trusts its last read of the generation before re-checking
+GENERATION_TTL_S = float(os.getenv("RESULT_CACHE_GENERATION_TTL_S", "10"))
+
+_engine = None
+_engine_lock = threading.Lock()
+_pool_metrics = {
+    "connects": 0,
+    "checkouts": 0,
+    "wait_total_s": 0.0,
+    "wait_max_s": 0.0,
+}
+_metrics_lock = threading.Lock()
+# One span per dashboard query (rows, wall/CPU/client SQL time, cache hit, errors)
+TELEMETRY = Telemetry("dashboard")
+_result_cache = None
+_cache_lock = threading.Lock()
+_generation = {"value": None, "checked_at": 0.0}
+
+
+def _count(name):
+    with _metrics_lock:
+        _pool_metrics[name] += 1
+
+
+def get_engine():
+    # Lazily create the process-wide engine; None when no connection string is set
+    global _engine
+
+    if _engine is None:
+        db_url = os.getenv("DB_CONNECTION_STRING")
+        if not db_url:
+            return None
+
+        with _engine_lock:
+            if _engine is None:
+                timeout = f"-c statement_timeout={STATEMENT_TIMEOUT_MS}"
+                engine = create_engine(
+                    db_url, connect_args={"options": timeout}, **POOL_SETTINGS
+                )
+                event.listen(engine, "connect", lambda *args: _count("connects"))
+                event.listen(engine, "checkout", lambda *args: _count("checkouts"))
+                TELEMETRY.instrument(engine)
+                _engine = engine
+
+    return _engine
+
+
+def connect():
+    # Check out a pooled connection, recording how long the caller waited for it
+    engine = get_engine()
+    start = time.perf_counter()
+    connection = engine.connect()
+    waited = time.perf_counter() - start
+
+    with _metrics_lock:
+        _pool_metrics["wait_total_s"] += waited
+        _pool_metrics["wait_max_s"] = max(_pool_metrics["wait_max_s"], waited)
+    return connection
+
+
+def pool_stats():
+    # Snapshot of pool state and checkout/wait counters for monitoring
+    with _metrics_lock:
+        stats = dict(_pool_metrics)
+
+    if _engine is not None:
+        stats["pool_size"] = _engine.pool.size()
+        stats["checked_out"] = _engine.pool.checkedout()
+        stats["idle"] = _engine.pool.checkedin()
+        stats["overflow"] = _engine.pool.overflow()
+    if stats["checkouts"]:
+        stats["wait_avg_s"] = stats["wait_total_s"] / stats["checkouts"]
+    return stats
+
+
+# Postgres type OIDs, grouped by how the COPY path parses them
+FLOAT_OIDS = {700, 701, 1700}  # real, double precision, numeric
+DATE_OIDS = {1082, 1114, 1184}  # date, timestamp, timestamptz
+BOOL_OIDS = {16}
+
+
+def fetch_read_sql(query, params):
+    with connect() as connection:
+        return pd.read_sql(query, connection, params=params)
+
+
+def fetch_copy(query, params):
+    """
+    Streams the result as CSV through COPY ... TO STDOUT and parses it with the
+    C reader, skipping per-row Python tuples and Decimal objects. NUMERIC and
+    float columns arrive as float64, integers as int64 (float64 when a column
+    holds NULLs), dates and timestamps as datetime64, booleans as bool.
+    """
+    compiled = query.compile(dialect=get_engine().dialect)
+
+    with connect() as connection:
+        cursor = connection.connection.cursor()
+        try:
+            # COPY takes no bind parameters; the driver quotes them client-side
+            sql = cursor.mogrify(compiled.string, compiled.construct_params(params))
+            sql = sql.decode().strip().rstrip(";")
+
+            # Column types come from a zero-row run of the same query
+            start = time.perf_counter()
+            cursor.execute(f"SELECT * FROM ({sql}) AS q LIMIT 0")
+            columns = [(column.name, column.type_code) for column in cursor.description]
+
+            with tempfile.SpooledTemporaryFile(max_size=COPY_SPOOL_BYTES) as buffer:
+                cursor.copy_expert(
+                    f"COPY ({sql}) TO STDOUT WITH (FORMAT csv, HEADER)", buffer
+                )
+                record_client_sql_time(time.perf_counter() - start)
+                buffer.seek(0)
+                df = pd.read_csv(
+                    buffer,
+                    dtype={name: "float64" for name, oid in columns if oid in FLOAT_OIDS},
+                    parse_dates=[name for name, oid in columns if oid in DATE_OIDS],
+                )
+        finally:
+            cursor.close()
+
+    return parse_bools(df, [name for name, oid in columns if oid in BOOL_OIDS])
+
+
+def parse_bools(df, bool_columns):
+    # COPY writes booleans as t/f. Only the boolean columns are mapped, so a text
+    # value that happens to be "t" or "f" stays a string; NULLs stay missing.
+    for name in bool_columns:
+        df[name] = df[name].map({"t": True, "f": False})
+    return df
+
+
+FETCHERS = {"copy": fetch_copy, "read_sql": fetch_read_sql}
+
+
+def get_result_cache():
+    # Lazily open the shared cache; None when disabled or unusable
+    global _result_cache, RESULT_CACHE_ENABLED
+
+    if _result_cache is None and RESULT_CACHE_ENABLED:
+        with _cache_lock:
+            if _result_cache is None:
+                try:
+                    _result_cache = ResultCache(
+                        RESULT_CACHE_PATH, RESULT_CACHE_MAX_MB * 1024 * 1024
+                    )
+                except Exception as e:
+                    print(f"WARNING: Result cache disabled: {e}")
+                    RESULT_CACHE_ENABLED = False
+
+    return _result_cache
+
+
+def current_generation(max_age=None):
+    """
+    Returns the refresh generation of the data the dashboard reads: the
+    snapshot's when it is current, else the mart's. None when it cannot be read
+    (no refresh has recorded one yet, or the database is unreachable), which
+    bypasses the cache.
+    """
+    if BACKEND == "snapshot" and snapshot_is_current(max_age):
+        return snapshot.snapshot_generation()
+    return database_generation(max_age)
+
+
+def snapshot_is_current(max_age=None):
+    """
+    True when the published snapshot was exported at the mart's current refresh
+    generation. A snapshot is trusted when the database cannot say otherwise (no
+    connection string, unreachable, or no generation recorded yet).
+    """
+    generation = snapshot.snapshot_generation()
+    if generation is None:
+        return False
+    database = database_generation(max_age)
+    return database is None or database == generation
+
+
+def database_generation(max_age=None):
+    # The mart's refresh generation, re-read at most every GENERATION_TTL_S seconds
+    if get_engine() is None:
+        return None
+
+    max_age = GENERATION_TTL_S if max_age is None else max_age
+    now = time.monotonic()
+    if _generation["value"] is not None and now - _generation["checked_at"] < max_age:
+        return _generation["value"]
+
+    try:
+        with connect() as connection:
+            value = connection.execute(
+                text("SELECT generation FROM refresh_generation WHERE id = 1")
+            ).scalar()
+    except Exception:
+        value = None
+
+    _generation.update(value=value, checked_at=now)
+    return value
+
+
+def fetch_cached(query, params, mode=None, span=None):
+    # Fetch through the shared result cache, falling back to pd.read_sql
+    mode = mode or FETCH_MODE
+    cache = get_result_cache()
+    generation = current_generation() if cache is not None else None
+    key = cache_key(f"{mode}:{query.text}", params)
+
+    if generation is not None:
+        try:
+            df = cache.get(key, generation)
+            if df is not None:
+                if span is not None:
+                    span.attrs["cache"] = "hit"
+                return df
+        except Exception as e:
+            print(f"WARNING: Result cache read failed: {e}")
+
+    if span is not None:
+        span.attrs["cache"] = "miss" if generation is not None else "off"
+    try:
+        df = FETCHERS[mode](query, params)
+    except Exception as e:
+        if mode == "read_sql":
+            raise
+        print(f"WARNING: {mode} fetch failed, using pd.read_sql instead: {e}")
+        df = fetch_read_sql(query, params)
+
+    if generation is not None:
+        try:
+            cache.put(key, generation, df)
+        except Exception as e:
+            print(f"WARNING: Result cache write failed: {e}")
+    return df
+
+
+# Filter name -> enriched_transactions column. Values may be a scalar or a list.
+FILTER_COLUMNS = {
+    "merchant_category": "merchant_category",
+    "merchant_state": "merchant_state",
+    "merchant_city": "merchant_city",
+    "mcc": "mcc",
+    "card_brand": "card_brand",
+    "card_type": "card_type",
+    "transaction_type": "transaction_type",
+    "transaction_status": "transaction_status",
+    "gender": "gender",
+    "client_id": "client_id",
+    "card_id": "card_id",
+    "is_fraud": "is_fraud",
+}
+
+
+def date_range(year=None, start_date=None, end_date=None):
+    # The [start_date, end_date) window selected by a year and/or explicit dates
+    # Accept ISO strings as well as date objects
+    if isinstance(start_date, str):
+        start_date = datetime.date.fromisoformat(start_date)
+    if isinstance(end_date, str):
+        end_date = datetime.date.fromisoformat(end_date)
+
+    if year is not None:
+        safe_year = int(year)
+        start_date = max(start_date or datetime.date.min, datetime.date(safe_year, 1, 1))
+        year_end = datetime.date(safe_year + 1, 1, 1)
+        end_date = min(end_date, year_end) if end_date else year_end
+
+    return start_date, end_date
+
+
+def compile_filters(year=None, start_date=None, end_date=None, **columns):
+    """
+    Compiles dashboard filters into a SQL fragment with bound parameters.
+    Dates become half-open ranges on transaction_date (never EXTRACT), so the
+    predicate can use idx_int_date_status and prune year partitions.
+    Returns (sql, params); sql starts with ' AND' to follow the '1 = 1' base.
+    """
+    clauses = []
+    params = {}
+    start_date, end_date = date_range(year, start_date, end_date)
+
+    if start_date is not None:
+        clauses.append("transaction_date >= :f_start_date")
+        params["f_start_date"] = start_date
+    if end_date is not None:
+        clauses.append("transaction_date < :f_end_date")
+        params["f_end_date"] = end_date
+
+    for name, value in columns.items():
+        if value is None:
+            continue
+        if name not in FILTER_COLUMNS:
+            raise ValueError(f"Unknown filter: {name}")
+
+        column = FILTER_COLUMNS[name]
+        if isinstance(value, (list, tuple, set)):
+            # One parameter per value rather than a text[] array, so the values
+            # also compare against the enum columns of the compact mart
+            values = list(value)
+            if not values:
+                clauses.append("FALSE")
+                continue
+            names = [f"f_{name}_{i}" for i in range(len(values))]
+            clauses.append(f"{column} IN ({', '.join(':' + n for n in names)})")
+            params.update(zip(names, values))
+        else:
+            clauses.append(f"{column} = :f_{name}")
+            params[f"f_{name}"] = value
+
+    sql = "".join(f" AND {clause}" for clause in clauses)
+    return sql, params
+
+
+def confidence_interval(estimate, variance, z=None):
+    # (low, high) bounds of an estimate from its variance; works on Series too
+    z = APPROX_Z if z is None else z
+    if isinstance(variance, pd.Series):
+        margin = z * variance.clip(lower=0) ** 0.5
+    else:
+        margin = z * math.sqrt(max(variance, 0))
+    return estimate - margin, estimate + margin
+
+
+def add_confidence_intervals(df, z=None):
+    # <measure>_lo / <measure>_hi columns for every <measure>_var column
+    for column in [c for c in df.columns if c.endswith("_var")]:
+        measure = column[: -len("_var")]
+        df[f"{measure}_lo"], df[f"{measure}_hi"] = confidence_interval(
+            df[measure], df[column], z
+        )
+    return df
+
 
 class DataLoader:
-    def __init__(self, query_path):
-        self.db_url = os.getenv("DB_CONNECTION_STRING")
+    def __init__(
+        self,
+        query_path,
+        use_rollups=True,
+        fetch_mode=None,
+        backend=None,
+        sample=None,
+    ):
+        self.engine = get_engine()
         self.query_path = Path(query_path)
+        self.use_rollups = use_rollups
+        self.fetch_mode = fetch_mode or FETCH_MODE
+        self.backend = backend or BACKEND
+        # A SAMPLES name to estimate from, or None for exact results
+        self.sample = sample
+        # Set when get_data degrades to an empty DataFrame
+        self.error = None
+        # Set when get_data answered from a sample
+        self.approximate = False
+
+    def _build_query(self, query_path, filter_sql):
+        with open(query_path, "r") as f:
+            query = f.read().strip()
+
+        # We use 1=1 in the base queries, so the filters just append AND ...
+        return text(query.replace("-- FILTERS --", filter_sql))
 
-    def get_data(self, year=None):
+    def _query_path(self, filters):
+        # Rollups only carry the date and the one grouped dimension
+        rollup_path = ROLLUP_QUERIES / self.query_path.name
+        if self.use_rollups and not filters and rollup_path.exists():
+            return rollup_path
+        return self.query_path
+
+    def _sample_path(self):
+        # Approximate mode, for the queries that have a sample version
+        sample_path = SAMPLE_QUERIES / self.query_path.name
+        if self.sample and sample_path.exists():
+            return sample_path
+        return None
+
+    def get_data(self, year=None, start_date=None, end_date=None, **filters):
         """
         Loads data from SQL file.
-        If 'year' is provided, injects SQL into '-- FILTERS --' placeholder.
+        Filters (year, start_date/end_date, and FILTER_COLUMNS such as
+        merchant_category or card_brand) are compiled into bound parameters and
+        injected into the '-- FILTERS --' placeholder.
+        Prefers the rollup version of the query, falling back to the mart.
+        With a sample, returns estimates from the sample version of the query
+        instead, with <measure>_var, _lo and _hi columns (confidence interval).
         """
-        if not self.db_url:
-            print("ERROR: DB_CONNECTION_STRING not found")
-            return pd.DataFrame()
+        with TELEMETRY.span("query", self.query_path.name) as span:
+            df = self._load(span, year, start_date, end_date, **filters)
+            span.rows = len(df)
+            if self.error:
+                span.fail(self.error)
+        return df
 
+    def _load(self, span, year, start_date, end_date, **filters):
         if not self.query_path.exists():
-            print(f"ERROR: Query file not found at: {self.query_path}")
+            self.error = f"Query file not found at: {self.query_path}"
+            print(f"ERROR: {self.error}")
             return pd.DataFrame()
 
         try:
-            with open(self.query_path, "r") as f:
-                query = f.read().strip()
+            filter_sql, params = compile_filters(year, start_date, end_date, **filters)
+        except ValueError as e:
+            self.error = f"Invalid filter: {e}"
+            print(self.error)
+            return pd.DataFrame()
 
-            # --- Dynamic Year Injection ---
-            if year:
-                try:
-                    # Validate year is an integer to prevent injection
-                    safe_year = int(year)
-                    # We use 1=1 in the base queries, so we just append AND ...
-                    injection = (
-                        f" AND EXTRACT(YEAR FROM transaction_date) = {safe_year}"
+        if self.sample is not None and self.sample not in SAMPLES:
+            self.error = f"Unknown sample: {self.sample}"
+            print(f"ERROR: {self.error}")
+            return pd.DataFrame()
+
+        if self.backend == "snapshot":
+            try:
+                if not snapshot_is_current():
+                    raise RuntimeError(
+                        f"snapshot generation {snapshot.snapshot_generation()} "
+                        "is behind the mart"
                     )
-                    query = query.replace("-- FILTERS --", injection)
-                except ValueError:
-                    print(f"Invalid year format: {year}")
+                columns = {
+                    FILTER_COLUMNS[name]: value
+                    for name, value in filters.items()
+                    if value is not None
+                }
+                df = snapshot.run_query(
+                    self.query_path.name,
+                    *date_range(year, start_date, end_date),
+                    **columns,
+                )
+                span.attrs["source"] = "snapshot"
+                return df
+            except Exception as e:
+                if self.engine is None:
+                    self.error = f"Snapshot unavailable and no database configured: {e}"
+                    print(f"ERROR: {self.error}")
+                    return pd.DataFrame()
+                print(f"WARNING: Snapshot unavailable, querying Postgres instead: {e}")
 
-            engine = create_engine(self.db_url)
-            df = pd.read_sql(query, engine)
-            return df
+        if self.engine is None:
+            self.error = "DB_CONNECTION_STRING not found"
+            print(f"ERROR: {self.error}")
+            return pd.DataFrame()
+
+        sample_path = self._sample_path()
+        if sample_path is not None:
+            try:
+                query = self._build_query(sample_path, filter_sql)
+                span.attrs["source"] = f"sample {self.sample}"
+                df = fetch_cached(
+                    query, {**params, "sample_name": self.sample}, self.fetch_mode, span
+                )
+                self.approximate = True
+                return add_confidence_intervals(df)
+            except Exception as e:
+                print(f"WARNING: Sample unavailable, running the exact query: {e}")
+
+        query_path = self._query_path(filters)
+
+        if query_path != self.query_path:
+            try:
+                query = self._build_query(query_path, filter_sql)
+                span.attrs["source"] = "rollup"
+                return fetch_cached(query, params, self.fetch_mode, span)
+            except Exception as e:
+                print(f"WARNING: Rollup unavailable, querying the mart instead: {e}")
+
+        try:
+            query = self._build_query(self.query_path, filter_sql)
+            span.attrs["source"] = "mart"
+            return fetch_cached(query, params, self.fetch_mode, span)
 
         except Exception as e:
-            print(f"ERROR: Failed to load data: {e}")
+            self.error = f"Failed to load data: {e}"
+            print(f"ERROR: {self.error}")
             return pd.DataFrame()
+
+    def explain(
+        self, year=None, start_date=None, end_date=None, analyze=False, **filters
+    ):
+        """
+        Returns the Postgres plan for the filtered query as text, to confirm that
+        the date range and filters hit indexes / prune partitions.
+        """
+        filter_sql, params = compile_filters(year, start_date, end_date, **filters)
+        query_path = self._sample_path() or self._query_path(filters)
+        if query_path.parent == SAMPLE_QUERIES:
+            params["sample_name"] = self.sample
+        query = self._build_query(query_path, filter_sql)
+        options = "ANALYZE, BUFFERS" if analyze else "COSTS"
+
+        with connect() as connection:
+            rows = connection.execute(
+                text(f"EXPLAIN ({options}) {query.text}"), params
+            ).fetchall()
+        return "\n".join(row[0] for row in rows)
+
+
+def load_concurrently(query_paths, max_workers=None, sample=None, **filters):
+    """
+    Runs several queries at once on the shared pool, so a cold load costs the
+    slowest query rather than the sum. query_paths maps a name to a SQL file.
+    Returns (frames, timings, errors) keyed by name; a failed query yields an
+    empty DataFrame plus an entry in errors without affecting the others.
+    With a sample, frames hold estimates (see DataLoader.get_data).
+    """
+    frames, timings, errors = {}, {}, {}
+
+    def run(name, query_path):
+        start = time.perf_counter()
+        loader = DataLoader(query_path, sample=sample)
+        df = loader.get_data(**filters)
+        return name, df, time.perf_counter() - start, loader.error
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(query_paths)) as executor:
+        futures = [
+            submit_in_context(executor, run, name, path)
+            for name, path in query_paths.items()
+        ]
+        for future in as_completed(futures):
+            name, df, elapsed, error = future.result()
+            frames[name] = df
+            timings[name] = elapsed
+            if error:
+                errors[name] = error
+
+    return frames, timings, errors
+
+
+# Combined-query grain -> (frame name, columns of the equivalent single query)
+COMBINED_GRAINS = {
+    "date": (
+        "daily",
+        ["transaction_date", "vol", "rev", "fraud_cases", "fraud_loss"],
+    ),
+    "hour": ("hourly", ["hour_of_day", "vol", "fraud_cases"]),
+    "age_group": ("demos", ["age_group", "vol", "fraud_cases"]),
+    "merchant_category": (
+        "cats",
+        ["merchant_category", "vol", "rev", "fraud_cases", "fraud_loss"],
+    ),
+}
+
+
+def load_combined(query_path, sample=None, **filters):
+    """
+    Runs the single-pass GROUPING SETS query and splits it into the daily,
+    hourly, demographic and category frames. Same return shape as
+    load_concurrently: (frames, timings, errors).
+    """
+    start = time.perf_counter()
+    loader = DataLoader(query_path, sample=sample)
+    df = loader.get_data(**filters)
+    timings = {"combined": time.perf_counter() - start}
+    errors = {"combined": loader.error} if loader.error else {}
+
+    frames = {}
+    for grain, (name, columns) in COMBINED_GRAINS.items():
+        if df.empty:
+            frames[name] = pd.DataFrame()
+            continue
+
+        # Estimates keep their variance and confidence interval columns
+        columns = columns + [
+            f"{measure}_{suffix}"
+            for measure in columns[1:]
+            for suffix in ["var", "lo", "hi"]
+            if f"{measure}_{suffix}" in df.columns
+        ]
+        frame = df.loc[df["grain"] == grain, columns].sort_values(columns[0])
+        if grain == "hour":
+            frame["hour_of_day"] = frame["hour_of_day"].astype(int)
+        frames[name] = frame.reset_index(drop=True)
+
+    return frames, timings, errors
+
+
+def warm_cache(query_dir, years=None):
+    """
+    Pre-computes the dashboard queries for every report year (or just `years`)
+    so the first visitor after a refresh reads from the result cache. Warms both
+    the combined and the concurrent query modes. Returns the years warmed.
+    """
+    query_dir = Path(query_dir)
+
+    # Pick up the generation the refresh just bumped
+    if current_generation(max_age=0) is None:
+        print("WARNING: No refresh generation recorded; nothing to warm.")
+        return []
+
+    if years is None:
+        df = DataLoader(query_dir / "year_options.sql").get_data()
+        years = df["report_year"].tolist() if not df.empty else []
+
+    for year in years:
+        load_combined(query_dir / "dashboard_combined.sql", year=year)
+        load_concurrently(
+            {
+                "daily": query_dir / "daily_metrics.sql",
+                "hourly": query_dir / "hourly_stats.sql",
+                "demos": query_dir / "demographic_stats.sql",
+                "cats": query_dir / "category_stats.sql",
+            },
+            year=year,
+        )
+
+    return years
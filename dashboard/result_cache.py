@@ -0,0 +1,110 @@
+import io
+import time
+import sqlite3
+import hashlib
+import threading
+import pandas as pd
+from pathlib import Path
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+# On-disk result cache shared by every dashboard process on the host.
+# Entries are keyed by query text + bound parameters and tagged with the
+# refresh generation they were computed under; a refresh bumps the generation,
+# which turns every older entry into a miss. Size is capped with LRU eviction.
+# Results are stored as Parquet, never pickled: every dashboard replica can
+# write the file, and reading a payload must not be able to run code.
+
+# Bumped when the payload format changes; older cache files are cleared on open
+SCHEMA_VERSION = 2
+
+
+def cache_key(query_text, params):
+    payload = repr((query_text, sorted((params or {}).items())))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    def __init__(self, path, max_bytes):
+        if pyarrow is None:
+            raise RuntimeError("the result cache requires pyarrow")
+
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._connect() as db:
+            if db.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                db.execute("DROP TABLE IF EXISTS results")
+                db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS results (
+                    key TEXT PRIMARY KEY,
+                    generation INTEGER NOT NULL,
+                    payload BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_used REAL NOT NULL
+                )
+                """
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON results (last_used)")
+
+    def _connect(self):
+        # One SQLite connection per thread; WAL lets readers and a writer overlap
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30)
+            db.execute("PRAGMA journal_mode=WAL")
+            self._local.db = db
+        return db
+
+    def get(self, key, generation):
+        db = self._connect()
+        row = db.execute(
+            "SELECT payload FROM results WHERE key = ? AND generation = ?",
+            (key, generation),
+        ).fetchone()
+        if row is None:
+            return None
+
+        with db:
+            db.execute(
+                "UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key)
+            )
+        return pd.read_parquet(io.BytesIO(row[0]))
+
+    def put(self, key, generation, df):
+        buffer = io.BytesIO()
+        df.to_parquet(buffer)
+        payload = buffer.getvalue()
+        if len(payload) > self.max_bytes:
+            return
+
+        db = self._connect()
+        with db:
+            # Entries from older refresh generations can never hit again
+            db.execute("DELETE FROM results WHERE generation < ?", (generation,))
+            db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                (key, generation, payload, len(payload), time.time()),
+            )
+            self._evict(db)
+
+    def _evict(self, db):
+        # Drop least recently used entries until the cache fits its budget
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        for key, size in db.execute(
+            "SELECT key, size FROM results ORDER BY last_used"
+        ).fetchall():
+            db.execute("DELETE FROM results WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
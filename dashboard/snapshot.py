@@ -0,0 +1,413 @@
+import os
+import re
+import json
+import time
+import shutil
+import argparse
+import datetime
+import threading
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from sqlalchemy import create_engine, text
+from dotenv import load_dotenv
+
+try:
+    import pyarrow
+    import pyarrow.compute
+    import pyarrow.ipc
+except ImportError:
+    pyarrow = None
+
+# Columnar snapshot of the mart for dashboards that run without a database.
+# After a refresh, the mart is exported as one Arrow IPC file per year, holding
+# only the columns the dashboard queries and filters use, with the labels
+# dictionary-encoded. The models/queries aggregations are then answered
+# in-process with Arrow group-bys over the memory-mapped files.
+#
+# Each snapshot is written beside the live one (g<generation>/) and published by
+# rewriting the CURRENT pointer, so readers never see a half-written snapshot.
+
+ROOT = Path(__file__).resolve().parent.parent
+SNAPSHOT_DIR = Path(os.getenv("SNAPSHOT_DIR", str(ROOT / ".cache" / "snapshot")))
+SNAPSHOT_BATCH_ROWS = 250000
+YEAR_FILE_PATTERN = re.compile(r"year=(\d+)\.arrow$")
+GENERATION_PATTERN = re.compile(r"g\d+")
+
+# Snapshot column -> mart expression (labels as text, NUMERIC as float8)
+SNAPSHOT_COLUMNS = {
+    "transaction_date": "transaction_date",
+    "hour_of_day": "hour_of_day",
+    "age": "age",
+    "transaction_amount": "transaction_amount :: FLOAT8",
+    "fraud_loss_amount": "fraud_loss_amount :: FLOAT8",
+    "is_fraud": "is_fraud",
+    "merchant_category": "merchant_category :: TEXT",
+    "merchant_state": "merchant_state :: TEXT",
+    "merchant_city": "merchant_city :: TEXT",
+    "mcc": "mcc",
+    "card_brand": "card_brand :: TEXT",
+    "card_type": "card_type :: TEXT",
+    "transaction_type": "transaction_type :: TEXT",
+    "transaction_status": "transaction_status :: TEXT",
+    "gender": "gender :: TEXT",
+    "client_id": "client_id",
+    "card_id": "card_id",
+}
+
+AGE_GROUPS = ["Gen Z (<25)", "Millennial (25-40)", "Gen X (41-60)", "Senior (60+)"]
+
+# Measure -> (input columns, Arrow aggregation), as computed by models/queries;
+# vol is COUNT(*), so it counts rows rather than non-null values
+MEASURES = {
+    "vol": ([], "count_all"),
+    "rev": ("transaction_amount", "sum"),
+    "fraud_cases": ("fraud_flag", "sum"),
+    "fraud_loss": ("fraud_loss_amount", "sum"),
+}
+
+# Query file -> (group key, measures); see models/queries
+QUERIES = {
+    "daily_metrics.sql": (
+        "transaction_date",
+        ["vol", "rev", "fraud_cases", "fraud_loss"],
+    ),
+    "hourly_stats.sql": ("hour_of_day", ["vol", "fraud_cases"]),
+    "demographic_stats.sql": ("age_group", ["vol", "fraud_cases"]),
+    "category_stats.sql": (
+        "merchant_category",
+        ["vol", "rev", "fraud_cases", "fraud_loss"],
+    ),
+}
+# Snapshot columns the aggregations read
+INPUT_COLUMNS = [
+    "transaction_date",
+    "hour_of_day",
+    "age",
+    "transaction_amount",
+    "fraud_loss_amount",
+    "is_fraud",
+    "merchant_category",
+]
+# dashboard_combined.sql grain -> group key
+COMBINED_GRAINS = {
+    "date": "transaction_date",
+    "hour": "hour_of_day",
+    "age_group": "age_group",
+    "merchant_category": "merchant_category",
+}
+
+_tables = {}
+_tables_lock = threading.Lock()
+
+
+def _schema():
+    # Fixed per-column types, so batches with and without NULLs line up
+    types = {
+        "transaction_date": pyarrow.date32(),
+        "hour_of_day": pyarrow.int16(),
+        "age": pyarrow.int32(),
+        "transaction_amount": pyarrow.float64(),
+        "fraud_loss_amount": pyarrow.float64(),
+        "is_fraud": pyarrow.bool_(),
+        "mcc": pyarrow.int32(),
+        "client_id": pyarrow.int32(),
+        "card_id": pyarrow.int32(),
+    }
+    return pyarrow.schema(
+        [(name, types.get(name, pyarrow.string())) for name in SNAPSHOT_COLUMNS]
+    )
+
+
+def _dictionary_encode(table):
+    for index, field in enumerate(table.schema):
+        if pyarrow.types.is_string(field.type):
+            column = pyarrow.compute.dictionary_encode(table.column(index))
+            table = table.set_column(index, field.name, column)
+    return table
+
+
+def export_snapshot(engine, snapshot_dir=SNAPSHOT_DIR, batch_rows=SNAPSHOT_BATCH_ROWS):
+    """
+    Exports enriched_transactions as one Arrow file per year and publishes it
+    as the current snapshot. Returns the manifest (generation, rows per year).
+    """
+    if pyarrow is None:
+        raise RuntimeError("Snapshots require pyarrow")
+
+    snapshot_dir = Path(snapshot_dir)
+    schema = _schema()
+    select = ", ".join(f"{expr} AS {name}" for name, expr in SNAPSHOT_COLUMNS.items())
+
+    with engine.connect() as connection:
+        # One REPEATABLE READ transaction, so every year (and the generation)
+        # comes from the same state of the mart
+        connection = connection.execution_options(
+            isolation_level="REPEATABLE READ",
+            stream_results=True,
+            max_row_buffer=batch_rows,
+        )
+        generation = 0
+        exists = connection.execute(text("SELECT to_regclass('refresh_generation')"))
+        if exists.scalar():
+            generation = (
+                connection.execute(
+                    text("SELECT generation FROM refresh_generation WHERE id = 1")
+                ).scalar()
+                or 0
+            )
+        first, last = connection.execute(
+            text(
+                "SELECT MIN(transaction_date), MAX(transaction_date) "
+                "FROM enriched_transactions"
+            )
+        ).one()
+
+        name = f"g{generation}"
+        staging = snapshot_dir / f"{name}.tmp-{os.getpid()}"
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+
+        manifest = {"generation": generation, "created_at": time.time(), "years": {}}
+        for year in range(first.year, last.year + 1) if first else []:
+            query = text(
+                f"""
+                SELECT {select}
+                FROM enriched_transactions
+                WHERE transaction_date >= :start_date AND transaction_date < :end_date
+                """
+            )
+            params = {
+                "start_date": datetime.date(year, 1, 1),
+                "end_date": datetime.date(year + 1, 1, 1),
+            }
+            batches = [
+                pyarrow.Table.from_pandas(batch, schema=schema, preserve_index=False)
+                for batch in pd.read_sql(
+                    query, connection, params=params, chunksize=batch_rows
+                )
+            ]
+            if not batches:
+                continue
+
+            table = _dictionary_encode(pyarrow.concat_tables(batches).combine_chunks())
+            with pyarrow.OSFile(str(staging / f"year={year}.arrow"), "wb") as sink:
+                with pyarrow.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            manifest["years"][year] = table.num_rows
+
+    with open(staging / "manifest.json", "w") as f:
+        json.dump(manifest, f)
+
+    # Publish: move the snapshot into place, then repoint CURRENT atomically
+    target = snapshot_dir / name
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(staging, target)
+    pointer = snapshot_dir / f"CURRENT.tmp-{os.getpid()}"
+    pointer.write_text(name)
+    os.replace(pointer, snapshot_dir / "CURRENT")
+
+    # Older snapshots stay readable by processes that already mapped them
+    # and other writers' g<n>.tmp-<pid> staging directories are left alone
+    for old in snapshot_dir.glob("g*"):
+        published = GENERATION_PATTERN.fullmatch(old.name)
+        if published and old.name != name and old.is_dir():
+            shutil.rmtree(old, ignore_errors=True)
+
+    return manifest
+
+
+def current_snapshot(snapshot_dir=SNAPSHOT_DIR):
+    # Directory of the published snapshot; None when none has been exported
+    try:
+        name = (Path(snapshot_dir) / "CURRENT").read_text().strip()
+    except OSError:
+        return None
+    path = Path(snapshot_dir) / name
+    return path if path.is_dir() else None
+
+
+def snapshot_generation(snapshot_dir=SNAPSHOT_DIR):
+    path = current_snapshot(snapshot_dir)
+    return int(path.name[1:]) if path is not None else None
+
+
+def _year_files(path):
+    years = {}
+    for f in path.glob("year=*.arrow"):
+        match = YEAR_FILE_PATTERN.search(f.name)
+        if match:
+            years[int(match.group(1))] = f
+    return years
+
+
+def _open(path):
+    # Memory-mapped and zero-copy; kept open until another snapshot is published
+    with _tables_lock:
+        table = _tables.get(path)
+        if table is None:
+            source = pyarrow.memory_map(str(path), "r")
+            table = pyarrow.ipc.open_file(source).read_all()
+            for stale in [p for p in _tables if p.parent != path.parent]:
+                del _tables[stale]
+            _tables[path] = table
+    return table
+
+
+def _decoded(column):
+    if pyarrow.types.is_dictionary(column.type):
+        return column.cast(column.type.value_type)
+    return column
+
+
+def _load(start_date, end_date, columns, filters, snapshot_dir):
+    path = current_snapshot(snapshot_dir)
+    if path is None:
+        raise RuntimeError(f"No snapshot found in {snapshot_dir}")
+
+    unknown = set(filters) - set(SNAPSHOT_COLUMNS)
+    if unknown:
+        raise RuntimeError(f"Snapshot has no column for filter(s): {sorted(unknown)}")
+
+    # Year files outside the date range are never opened
+    first = start_date.year if start_date else None
+    last = (end_date - datetime.timedelta(days=1)).year if end_date else None
+    selected = columns + [name for name in filters if name not in columns]
+    tables = [
+        _open(f).select(selected)
+        for year, f in sorted(_year_files(path).items())
+        if (first is None or year >= first) and (last is None or year <= last)
+    ]
+    if not tables:
+        return pyarrow.schema(_schema().field(c) for c in columns).empty_table()
+    table = pyarrow.concat_tables(tables)
+
+    mask = None
+    conditions = []
+    if start_date is not None:
+        conditions.append(
+            pyarrow.compute.greater_equal(
+                table["transaction_date"], pyarrow.scalar(start_date, pyarrow.date32())
+            )
+        )
+    if end_date is not None:
+        conditions.append(
+            pyarrow.compute.less(
+                table["transaction_date"], pyarrow.scalar(end_date, pyarrow.date32())
+            )
+        )
+    for name, value in filters.items():
+        column = _decoded(table[name])
+        values = list(value) if isinstance(value, (list, tuple, set)) else [value]
+        conditions.append(
+            pyarrow.compute.is_in(
+                column, value_set=pyarrow.array(values, type=column.type)
+            )
+        )
+    for condition in conditions:
+        mask = condition if mask is None else pyarrow.compute.and_(mask, condition)
+
+    if mask is not None:
+        table = table.filter(mask)
+    return table.select(columns)
+
+
+def _with_keys(table):
+    # Derived inputs: 0/1 fraud flag, age group and decoded labels for grouping
+    fraud_flag = pyarrow.compute.cast(table["is_fraud"], pyarrow.int64())
+    table = table.append_column("fraud_flag", fraud_flag)
+
+    # CASE WHEN age < 25 ... ELSE 'Senior (60+)' (NULL ages fall through too)
+    age = table["age"].to_numpy(zero_copy_only=False).astype("float64")
+    age_group = np.select(
+        [age < 25, age <= 40, age <= 60], AGE_GROUPS[:3], default=AGE_GROUPS[3]
+    )
+    table = table.append_column("age_group", pyarrow.array(age_group))
+
+    index = table.schema.get_field_index("merchant_category")
+    return table.set_column(
+        index, "merchant_category", _decoded(table["merchant_category"])
+    )
+
+
+def _group(table, key, measures):
+    aggregations = [MEASURES[m] for m in measures]
+    grouped = table.group_by(key).aggregate(aggregations)
+
+    # Arrow names the outputs <column>_<function>, or just <function> when the
+    # aggregation reads no column; map them back to the measures
+    names = {
+        f"{column}_{function}" if column else function: measure
+        for measure, (column, function) in zip(measures, aggregations)
+    }
+    df = grouped.to_pandas(date_as_object=False).rename(columns=names)
+    return df[[key] + measures].sort_values(key).reset_index(drop=True)
+
+
+def run_query(
+    query_name, start_date=None, end_date=None, snapshot_dir=SNAPSHOT_DIR, **filters
+):
+    """
+    Answers a models/queries query from the current snapshot, with the same
+    columns as the SQL version. start_date/end_date bound transaction_date
+    ([start, end)); filters are mart columns matched against a value or a list.
+    Raises RuntimeError when there is no snapshot or the query is not supported.
+    """
+    if pyarrow is None:
+        raise RuntimeError("Snapshots require pyarrow")
+
+    if query_name == "year_options.sql":
+        path = current_snapshot(snapshot_dir)
+        if path is None:
+            raise RuntimeError(f"No snapshot found in {snapshot_dir}")
+        years = sorted(_year_files(path), reverse=True)
+        return pd.DataFrame({"report_year": years}, dtype="int64")
+
+    if query_name not in QUERIES and query_name != "dashboard_combined.sql":
+        raise RuntimeError(f"{query_name} has no snapshot implementation")
+
+    table = _load(start_date, end_date, INPUT_COLUMNS, filters, snapshot_dir)
+    table = _with_keys(table)
+
+    if query_name != "dashboard_combined.sql":
+        key, measures = QUERIES[query_name]
+        return _group(table, key, measures)
+
+    # One frame per grouping set, tagged by grain like the GROUPING SETS query
+    frames = []
+    for grain, key in COMBINED_GRAINS.items():
+        frame = _group(table, key, list(MEASURES))
+        frame.insert(0, "grain", grain)
+        frames.append(frame)
+    columns = ["grain"] + list(COMBINED_GRAINS.values()) + list(MEASURES)
+    return pd.concat(frames, ignore_index=True).reindex(columns=columns)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Export enriched_transactions as a columnar dashboard snapshot"
+    )
+    parser.add_argument(
+        "--out", default=str(SNAPSHOT_DIR), help=f"Snapshot directory ({SNAPSHOT_DIR})"
+    )
+    args = parser.parse_args()
+
+    load_dotenv(dotenv_path=ROOT / ".env")
+    DB_CONNECTION_STRING = os.getenv("DB_CONNECTION_STRING")
+    if not DB_CONNECTION_STRING:
+        print("Error: DB_CONNECTION_STRING not found in .env file.")
+        exit()
+
+    engine = create_engine(DB_CONNECTION_STRING)
+    try:
+        start_time = time.perf_counter()
+        manifest = export_snapshot(engine, args.out)
+        elapsed = time.perf_counter() - start_time
+    finally:
+        engine.dispose()
+
+    rows = sum(manifest["years"].values())
+    print(
+        f"Exported {rows:,} rows in {len(manifest['years'])} year file(s) "
+        f"(generation {manifest['generation']}) to {args.out} [{elapsed:.2f}s]"
+    )
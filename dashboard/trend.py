@@ -0,0 +1,157 @@
+import os
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from report_data import DataLoader
+
+# Multi-year daily trend for the dashboard. Daily rows are downsampled in the
+# dashboard process before they are handed to Altair, so a chart carries at most
+# a fixed number of points per series however long the history is. Zooming
+# fetches just the selected date range, which then gets the whole point budget.
+
+DAILY_QUERY = (
+    Path(__file__).resolve().parent.parent / "models" / "queries" / "daily_metrics.sql"
+)
+# Trend measure -> label
+TREND_MEASURES = {"rev": "Revenue", "fraud_loss": "Fraud Loss"}
+# Point budget per series: one point per PIXELS_PER_POINT of chart width
+TREND_WIDTH_PX = int(os.getenv("DASHBOARD_TREND_WIDTH_PX", "1100"))
+PIXELS_PER_POINT = 2
+# "lttb": Largest-Triangle-Three-Buckets; "minmax": each bucket's extremes
+TREND_METHOD = os.getenv("DASHBOARD_TREND_METHOD", "lttb")
+
+
+def point_budget(width_px=None):
+    return max(3, (width_px or TREND_WIDTH_PX) // PIXELS_PER_POINT)
+
+
+def lttb(x, y, points):
+    """
+    Indices of the `points` samples that Largest-Triangle-Three-Buckets keeps:
+    the first and last points, plus per bucket the point forming the largest
+    triangle with the previously kept point and the next bucket's average.
+    """
+    n = len(x)
+    if points >= n or points < 3:
+        return np.arange(n)
+
+    kept = np.empty(points, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    # points - 2 buckets over the interior points
+    edges = np.linspace(1, n - 1, points - 1).astype(np.int64)
+
+    a = 0
+    for bucket in range(points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        cx, cy = x[end:next_end].mean(), y[end:next_end].mean()
+
+        bx, by = x[start:end], y[start:end]
+        area = np.abs((x[a] - cx) * (by - y[a]) - (x[a] - bx) * (cy - y[a]))
+        a = start + int(np.argmax(area))
+        kept[bucket + 1] = a
+
+    return kept
+
+
+def minmax(x, y, points):
+    """
+    Indices of the first and last points plus the lowest and highest point of
+    each of (points - 2) / 2 equal-count buckets, so peaks are never averaged away.
+    """
+    n = len(x)
+    if points >= n or points < 4:
+        return np.arange(n)
+
+    edges = np.linspace(0, n, (points - 2) // 2 + 1).astype(np.int64)
+    kept = {0, n - 1}
+    for start, end in zip(edges[:-1], edges[1:]):
+        if end > start:
+            kept.add(start + int(np.argmin(y[start:end])))
+            kept.add(start + int(np.argmax(y[start:end])))
+
+    return np.array(sorted(kept), dtype=np.int64)
+
+
+DOWNSAMPLERS = {"lttb": lttb, "minmax": minmax}
+
+
+def downsample(df, points, method=None, measures=None):
+    """
+    Long-format (transaction_date, measure, value) rows for each measure of a
+    daily frame, each series downsampled on its own to at most `points` rows.
+    """
+    method = method or TREND_METHOD
+    measures = measures or list(TREND_MEASURES)
+    if method not in DOWNSAMPLERS:
+        raise ValueError(f"Unknown downsampling method: {method}")
+
+    df = df.sort_values("transaction_date")
+    dates = pd.to_datetime(df["transaction_date"])
+    # Days since the epoch, as the x coordinate of the triangle areas
+    x = dates.to_numpy().astype("datetime64[D]").astype(np.float64)
+
+    frames = []
+    for measure in measures:
+        y = df[measure].fillna(0).to_numpy(dtype=np.float64)
+        kept = DOWNSAMPLERS[method](x, y, points)
+        frames.append(
+            pd.DataFrame(
+                {
+                    "transaction_date": dates.to_numpy()[kept],
+                    "measure": measure,
+                    "value": y[kept],
+                }
+            )
+        )
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def load_trend(
+    start_date=None,
+    end_date=None,
+    points=None,
+    method=None,
+    sample=None,
+    **filters,
+):
+    """
+    Daily revenue and fraud loss for [start_date, end_date) (the whole history
+    by default), downsampled to `points` per series (see point_budget).
+    Filters and sample are passed to DataLoader as for the other panels.
+    Returns (df, days, error): long-format rows, the number of daily rows they
+    were drawn from, and the loader's error if the query failed.
+    """
+    loader = DataLoader(DAILY_QUERY, sample=sample)
+    daily = loader.get_data(start_date=start_date, end_date=end_date, **filters)
+
+    if daily.empty:
+        empty = pd.DataFrame(columns=["transaction_date", "measure", "value"])
+        return empty, 0, loader.error
+
+    return downsample(daily, points or point_budget(), method), len(daily), None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Downsampled daily trend")
+    parser.add_argument("--since", help="Start date (inclusive), YYYY-MM-DD")
+    parser.add_argument("--until", help="End date (exclusive), YYYY-MM-DD")
+    parser.add_argument("--width", type=int, help="Chart width in pixels")
+    parser.add_argument("--method", choices=list(DOWNSAMPLERS))
+    args = parser.parse_args()
+
+    start_time = time.time()
+    df, days, error = load_trend(
+        args.since, args.until, point_budget(args.width), args.method
+    )
+    elapsed = time.time() - start_time
+    if error:
+        print(f"Failed → {error} [{elapsed:.2f}s]")
+    else:
+        print(
+            f"{days:,} daily rows → {len(df):,} points "
+            f"({df.groupby('measure').size().to_dict()}) [{elapsed:.2f}s]"
+        )
@@ -0,0 +1,15 @@
+-- Bumped whenever the mart or its rollups change, so cached dashboard
+-- results computed under an older generation are never served again.
+-- Runs after every other model of its run:
+-- depends_on: *
+CREATE TABLE IF NOT EXISTS refresh_generation (
+    id SMALLINT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    generation BIGINT NOT NULL,
+    refreshed_at TIMESTAMPTZ NOT NULL
+);
+
+INSERT INTO refresh_generation (id, generation, refreshed_at)
+VALUES (1, 1, NOW())
+ON CONFLICT (id) DO UPDATE
+SET generation = refresh_generation.generation + 1,
+    refreshed_at = NOW();
@@ -0,0 +1,60 @@
+-- Make sure a year-partitioned transactions_data can take the delta's years
+SELECT
+    ensure_year_partitions(
+        'transactions_data',
+        MIN(EXTRACT(YEAR FROM date)) :: INT,
+        MAX(EXTRACT(YEAR FROM date)) :: INT
+    )
+FROM
+    transactions_data_delta;
+
+-- Append the delta (transactions_data_delta), cleaned and typed while loading
+-- by the scripts/cleaning.py rules
+INSERT INTO
+    transactions_data (
+        id,
+        date,
+        client_id,
+        card_id,
+        amount,
+        use_chip,
+        merchant_id,
+        merchant_city,
+        merchant_state,
+        zip,
+        mcc,
+        errors,
+        transaction_time
+    )
+SELECT
+    id,
+    date,
+    client_id,
+    card_id,
+    amount,
+    use_chip,
+    merchant_id,
+    merchant_city,
+    merchant_state,
+    zip,
+    mcc,
+    errors,
+    transaction_time
+FROM
+    transactions_data_delta ON CONFLICT DO NOTHING;
+
+-- Queue the new transactions for the mart
+INSERT INTO
+    mart_pending_changes (transaction_id)
+SELECT
+    id
+FROM
+    transactions_data_delta ON CONFLICT (transaction_id) DO NOTHING;
+
+-- Queue them for risk scoring
+INSERT INTO
+    risk_pending_transactions (transaction_id)
+SELECT
+    id
+FROM
+    transactions_data_delta ON CONFLICT (transaction_id) DO NOTHING;
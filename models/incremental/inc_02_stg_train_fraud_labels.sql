@@ -0,0 +1,34 @@
+-- The delta (train_fraud_labels_delta) is the whole label file, cleaned and
+-- typed while loading by the scripts/cleaning.py rules: labels change in place,
+-- so only the new and relabelled transactions are applied and queued.
+
+-- Queue the new and relabelled transactions for the mart
+INSERT INTO
+    mart_pending_changes (transaction_id)
+SELECT
+    d.id
+FROM
+    train_fraud_labels_delta AS d
+    LEFT JOIN train_fraud_labels AS l ON l.id = d.id
+WHERE
+    d.id IS NOT NULL
+    AND (
+        l.id IS NULL
+        OR l.is_fraud IS DISTINCT FROM d.is_fraud
+    ) ON CONFLICT (transaction_id) DO NOTHING;
+
+-- Upsert them
+INSERT INTO
+    train_fraud_labels (id, is_fraud)
+SELECT
+    id,
+    is_fraud
+FROM
+    train_fraud_labels_delta
+WHERE
+    id IS NOT NULL ON CONFLICT (id) DO
+UPDATE
+SET
+    is_fraud = EXCLUDED.is_fraud
+WHERE
+    train_fraud_labels.is_fraud IS DISTINCT FROM EXCLUDED.is_fraud;
@@ -0,0 +1,37 @@
+-- Recompute only the queued transactions in the table form of the mart.
+-- Runs as one transaction, so readers keep seeing the previous rows until commit.
+SELECT
+    ensure_year_partitions(
+        'enriched_transactions',
+        MIN(EXTRACT(YEAR FROM t.date)) :: INT,
+        MAX(EXTRACT(YEAR FROM t.date)) :: INT
+    )
+FROM
+    transactions_data AS t
+    INNER JOIN mart_pending_changes AS p ON t.id = p.transaction_id;
+
+DELETE FROM
+    enriched_transactions
+WHERE
+    transaction_id IN (
+        SELECT
+            transaction_id
+        FROM
+            mart_pending_changes
+    );
+
+INSERT INTO
+    enriched_transactions
+SELECT
+    *
+FROM
+    enriched_transactions_source
+WHERE
+    transaction_id IN (
+        SELECT
+            transaction_id
+        FROM
+            mart_pending_changes
+    );
+
+TRUNCATE mart_pending_changes;
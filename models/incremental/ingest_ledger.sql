@@ -0,0 +1,23 @@
+-- Watermark ledger: how far each raw source has been ingested
+CREATE TABLE IF NOT EXISTS ingest_watermarks (
+    source_name VARCHAR(100) PRIMARY KEY,
+    watermark_column VARCHAR(100),
+    watermark_value BIGINT,
+    file_offset BIGINT,
+    -- First block of an append-only source; the whole file of a mutable one
+    head_checksum VARCHAR(64),
+    rows_loaded BIGINT,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Transactions whose mart rows must be recomputed
+CREATE TABLE IF NOT EXISTS mart_pending_changes (
+    transaction_id BIGINT PRIMARY KEY,
+    queued_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Transactions waiting to be scored (models/scoring/risk_score.sql)
+CREATE TABLE IF NOT EXISTS risk_pending_transactions (
+    transaction_id BIGINT PRIMARY KEY,
+    queued_at TIMESTAMPTZ DEFAULT NOW()
+);
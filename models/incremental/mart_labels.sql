@@ -0,0 +1,86 @@
+/* Label types of the compact mart (models/intermediate_compact). Labels are only
+ ever added, each in its sorted position, so a type never has to be dropped (which
+ would cascade to the rollup and sample columns of that type) and a new category,
+ brand, card type or gender can be added before the rows that carry it are
+ written. A new label is only usable once the transaction adding it commits.  */
+-- Creates the enum type with the given labels in sorted order, or adds the
+-- labels it does not have yet, each before the first larger existing label
+CREATE OR REPLACE FUNCTION add_labels(type_name TEXT, labels TEXT []) RETURNS VOID AS $$
+DECLARE
+    new_label TEXT;
+    next_label TEXT;
+BEGIN
+    IF to_regtype(type_name) IS NULL THEN
+        EXECUTE format(
+            'CREATE TYPE %I AS ENUM (%s)',
+            type_name,
+            (
+                SELECT string_agg(quote_literal(label), ', ' ORDER BY label)
+                FROM (SELECT DISTINCT label FROM unnest(labels) AS label) AS l
+                WHERE label IS NOT NULL
+            )
+        );
+        RETURN;
+    END IF;
+
+    FOR new_label IN
+        SELECT DISTINCT label
+        FROM unnest(labels) AS label
+        WHERE label IS NOT NULL
+          AND label NOT IN (
+              SELECT enumlabel :: TEXT FROM pg_enum
+              WHERE enumtypid = to_regtype(type_name)
+          )
+        ORDER BY label
+    LOOP
+        SELECT MIN(enumlabel :: TEXT) INTO next_label
+        FROM pg_enum
+        WHERE enumtypid = to_regtype(type_name)
+          AND enumlabel :: TEXT > new_label;
+
+        IF next_label IS NULL THEN
+            EXECUTE format('ALTER TYPE %I ADD VALUE %L', type_name, new_label);
+        ELSE
+            EXECUTE format(
+                'ALTER TYPE %I ADD VALUE %L BEFORE %L', type_name, new_label, next_label
+            );
+        END IF;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Brings every label type up to date with the dimension tables and the given
+-- transaction types. Without create_types it does nothing unless a compact mart
+-- has been built, so incremental loads can call it for any layout.
+CREATE OR REPLACE FUNCTION sync_mart_labels(
+    transaction_types TEXT [],
+    create_types BOOLEAN DEFAULT FALSE
+) RETURNS VOID AS $$
+BEGIN
+    IF NOT create_types AND to_regtype('transaction_type_label') IS NULL THEN
+        RETURN;
+    END IF;
+
+    PERFORM add_labels(
+        'transaction_status_label',
+        ARRAY ['Confirmed Fraud', 'Rejected', 'Successful']
+    );
+    PERFORM add_labels('transaction_type_label', transaction_types);
+    PERFORM add_labels(
+        'card_brand_label',
+        ARRAY(SELECT DISTINCT card_brand FROM cards_data WHERE card_brand IS NOT NULL)
+    );
+    PERFORM add_labels(
+        'card_type_label',
+        ARRAY(SELECT DISTINCT card_type FROM cards_data WHERE card_type IS NOT NULL)
+    );
+    PERFORM add_labels(
+        'gender_label',
+        ARRAY(SELECT DISTINCT gender FROM users_data WHERE gender IS NOT NULL)
+    );
+    PERFORM add_labels(
+        'merchant_category_label',
+        ARRAY(SELECT DISTINCT category FROM mcc_codes WHERE category IS NOT NULL)
+    );
+END;
+$$ LANGUAGE plpgsql;
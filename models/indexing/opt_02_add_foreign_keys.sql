@@ -18,7 +18,16 @@ ADD
     CONSTRAINT fk_mcc FOREIGN KEY (mcc) REFERENCES mcc_codes (mcc);
 
 -- train_fraud_data -> transactions_data (id)
-ALTER TABLE
-    train_fraud_labels
-ADD
-    CONSTRAINT fk_transaction_fraud FOREIGN KEY (id) REFERENCES transactions_data (id);
\ No newline at end of file
+-- A year-partitioned transactions_data has no unique key on id alone, so this FK
+-- only applies to the plain table
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_class WHERE relname = 'transactions_data' AND relkind = 'r'
+    ) THEN
+        ALTER TABLE
+            train_fraud_labels
+        ADD
+            CONSTRAINT fk_transaction_fraud FOREIGN KEY (id) REFERENCES transactions_data (id);
+    END IF;
+END $$;
\ No newline at end of file
@@ -0,0 +1,21 @@
+-- Same indexes as models/indexing, built without blocking writes. Each
+-- statement runs on its own autocommit connection. Concurrent builds on one
+-- table conflict with each other, so they run in sequence; tables run in parallel.
+
+-- INDEX IF NOT EXISTS 1: Transaction Date
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_transactions_date ON transactions_data (date);
+
+-- INDEX IF NOT EXISTS 2: Client ID
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_transactions_client_id ON transactions_data (client_id);
+
+-- INDEX IF NOT EXISTS 3: Card ID
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_transactions_card_id ON transactions_data (card_id);
+
+-- INDEX IF NOT EXISTS 4: Merchant Category Code (MCC)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_transactions_mcc ON transactions_data (mcc);
+
+-- INDEX IF NOT EXISTS 5: Composite (Date & Client)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_transactions_date_client_id ON transactions_data (date, client_id);
+
+-- INDEX IF NOT EXISTS 6: Fraud Transaction ID
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_fraud_id ON train_fraud_labels (id);
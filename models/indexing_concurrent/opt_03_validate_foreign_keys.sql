@@ -0,0 +1,9 @@
+-- Scan existing rows for the NOT VALID foreign keys. VALIDATE CONSTRAINT only
+-- takes SHARE UPDATE EXCLUSIVE, so reads and writes continue meanwhile.
+ALTER TABLE transactions_data VALIDATE CONSTRAINT fk_client;
+
+ALTER TABLE transactions_data VALIDATE CONSTRAINT fk_card;
+
+ALTER TABLE transactions_data VALIDATE CONSTRAINT fk_mcc;
+
+ALTER TABLE train_fraud_labels VALIDATE CONSTRAINT fk_transaction_fraud;
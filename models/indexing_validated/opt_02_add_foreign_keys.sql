@@ -0,0 +1,27 @@
+-- Foreign Keys for Referential Integrity after a validated load. Every loaded
+-- row was already checked against the key sets (see ingest_validations), so the
+-- keys are added NOT VALID: Postgres enforces them for all new rows, without
+-- scanning the existing ones again.
+-- Transactions_data -> users_data (client_id)
+ALTER TABLE
+    transactions_data
+ADD
+    CONSTRAINT fk_client FOREIGN KEY (client_id) REFERENCES users_data (id) NOT VALID;
+
+-- Transactions_data -> cards_data (card_id)
+ALTER TABLE
+    transactions_data
+ADD
+    CONSTRAINT fk_card FOREIGN KEY (card_id) REFERENCES cards_data (id) NOT VALID;
+
+-- Transactions_data -> mcc_codes (mcc)
+ALTER TABLE
+    transactions_data
+ADD
+    CONSTRAINT fk_mcc FOREIGN KEY (mcc) REFERENCES mcc_codes (mcc) NOT VALID;
+
+-- train_fraud_data -> transactions_data (id)
+ALTER TABLE
+    train_fraud_labels
+ADD
+    CONSTRAINT fk_transaction_fraud FOREIGN KEY (id) REFERENCES transactions_data (id) NOT VALID;
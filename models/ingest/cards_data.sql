@@ -0,0 +1,16 @@
+-- Final cards_data schema for clean-on-ingest loads (see scripts/cleaning.py)
+CREATE TABLE cards_data (
+    id SMALLINT,
+    client_id SMALLINT,
+    card_brand TEXT,
+    card_type TEXT,
+    cvv BIGINT,
+    has_chip BOOLEAN,
+    num_cards_issued SMALLINT,
+    credit_limit DECIMAL(14, 2),
+    year_pin_last_changed SMALLINT,
+    card_on_dark_web BOOLEAN,
+    card_issued_date DATE,
+    card_expiration_date DATE,
+    card_number_masked VARCHAR(19)
+);
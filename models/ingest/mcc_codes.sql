@@ -0,0 +1,2 @@
+-- Final mcc_codes schema for clean-on-ingest loads (see scripts/cleaning.py)
+CREATE TABLE mcc_codes (mcc SMALLINT, category TEXT);
@@ -0,0 +1,2 @@
+-- Final train_fraud_labels schema for clean-on-ingest loads (see scripts/cleaning.py)
+CREATE TABLE train_fraud_labels (id BIGINT, is_fraud BOOLEAN);
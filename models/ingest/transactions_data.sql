@@ -0,0 +1,16 @@
+-- Final transactions_data schema for clean-on-ingest loads (see scripts/cleaning.py)
+CREATE TABLE transactions_data (
+    id INTEGER,
+    date DATE,
+    client_id SMALLINT,
+    card_id SMALLINT,
+    amount DECIMAL(14, 2),
+    use_chip TEXT,
+    merchant_id INTEGER,
+    merchant_city TEXT,
+    merchant_state TEXT,
+    zip BIGINT,
+    mcc SMALLINT,
+    errors TEXT,
+    transaction_time VARCHAR(20)
+);
@@ -0,0 +1,17 @@
+-- Final users_data schema for clean-on-ingest loads (see scripts/cleaning.py)
+CREATE TABLE users_data (
+    id SMALLINT,
+    current_age SMALLINT,
+    retirement_age SMALLINT,
+    birth_year SMALLINT,
+    birth_month SMALLINT,
+    gender TEXT,
+    address TEXT,
+    latitude DOUBLE PRECISION,
+    longitude DOUBLE PRECISION,
+    per_capita_income INTEGER,
+    yearly_income INTEGER,
+    total_debt INTEGER,
+    credit_score SMALLINT,
+    num_credit_cards SMALLINT
+);
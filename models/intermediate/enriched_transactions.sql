@@ -1,8 +1,15 @@
 /* int_enriched_transactions will be the datamart for our reporting and analysis.
  This is applicable because in real life, you may want to control what data your
  Analyst have access to, without providing unrestricted access to dimensions.    */
--- Drop view if exists
-DROP MATERIALIZED VIEW IF EXISTS enriched_transactions;
+-- Drop the mart whether it was built as a materialized view or as a table
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_matviews WHERE matviewname = 'enriched_transactions') THEN
+        DROP MATERIALIZED VIEW enriched_transactions;
+    END IF;
+END $$;
+
+DROP TABLE IF EXISTS enriched_transactions;
 
 CREATE MATERIALIZED VIEW enriched_transactions AS
 SELECT
@@ -14,6 +21,7 @@ SELECT
     -- Transaction Details & Operations Data
     t.date AS transaction_date,
     t.transaction_time,
+    EXTRACT(HOUR FROM t.transaction_time :: time) :: SMALLINT AS hour_of_day,
     t.amount AS transaction_amount,
     t.use_chip AS transaction_type,
     t.errors AS transaction_error,
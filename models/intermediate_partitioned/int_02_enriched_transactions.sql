@@ -0,0 +1,39 @@
+/* Table form of the data mart, range-partitioned by year of transaction_date
+ (enriched_transactions_y<year>). Dashboard year filters prune to a single
+ partition, and old years can be refreshed, vacuumed or detached on their own. */
+-- Drop the mart whether it was built as a materialized view or as a table
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_matviews WHERE matviewname = 'enriched_transactions') THEN
+        DROP MATERIALIZED VIEW enriched_transactions;
+    END IF;
+END $$;
+
+DROP TABLE IF EXISTS enriched_transactions;
+
+CREATE TABLE enriched_transactions (LIKE enriched_transactions_source) PARTITION BY RANGE (transaction_date);
+
+SELECT
+    ensure_year_partitions(
+        'enriched_transactions',
+        MIN(EXTRACT(YEAR FROM date)) :: INT,
+        MAX(EXTRACT(YEAR FROM date)) :: INT
+    )
+FROM
+    transactions_data;
+
+INSERT INTO
+    enriched_transactions
+SELECT
+    *
+FROM
+    enriched_transactions_source;
+
+-- Unique indexes on a partitioned table must include the partition key
+CREATE UNIQUE INDEX IF NOT EXISTS idx_int_transaction_id ON enriched_transactions (transaction_id, transaction_date);
+
+CREATE INDEX IF NOT EXISTS idx_int_date_status ON enriched_transactions (transaction_date, transaction_status);
+
+CREATE INDEX IF NOT EXISTS idx_int_client_card ON enriched_transactions (client_id, card_id);
+
+CREATE INDEX IF NOT EXISTS idx_int_mcc ON enriched_transactions (mcc);
@@ -0,0 +1,64 @@
+/* enriched_transactions_source is the row definition of the data mart. The table
+ form of the mart is built from it, and incremental loads re-read only the changed
+ transaction ids through it, so the join logic lives in one place.            */
+-- Dropped rather than replaced, since the column layout differs between the
+-- default and the compact (models/intermediate_compact) definitions
+DROP VIEW IF EXISTS enriched_transactions_source;
+
+CREATE VIEW enriched_transactions_source AS
+SELECT
+    -- Primary Keys & Other Ids
+    t.id AS transaction_id,
+    t.client_id,
+    t.card_id,
+    t.mcc,
+    -- Transaction Details & Operations Data
+    t.date AS transaction_date,
+    t.transaction_time,
+    EXTRACT(HOUR FROM t.transaction_time :: time) :: SMALLINT AS hour_of_day,
+    t.amount AS transaction_amount,
+    t.use_chip AS transaction_type,
+    t.errors AS transaction_error,
+    -- Merchant Details
+    t.merchant_id,
+    t.merchant_city,
+    t.merchant_state,
+    t.zip,
+    -- Fraud Flagging & Calculating Loss
+    COALESCE(f.is_fraud, FALSE) AS is_fraud,
+    CASE
+        WHEN t.errors IS NOT NULL THEN 'Rejected'
+        WHEN COALESCE(f.is_fraud, FALSE) IS TRUE THEN 'Confirmed Fraud'
+        ELSE 'Successful'
+    END AS transaction_status,
+    CASE
+        WHEN COALESCE(f.is_fraud, FALSE) IS TRUE
+        AND t.errors IS NULL THEN t.amount
+        ELSE 0.00
+    END AS fraud_loss_amount,
+    -- Card Information (Dimension)
+    c.card_brand,
+    c.card_type,
+    c.credit_limit,
+    c.has_chip AS card_has_chip,
+    c.card_on_dark_web,
+    c.card_issued_date,
+    c.num_cards_issued AS total_cards_issued_to_client,
+    -- User Demographics (Dimension)
+    u.gender,
+    u.current_age AS age,
+    u.num_credit_cards,
+    u.yearly_income AS income,
+    u.per_capita_income,
+    u.credit_score,
+    u.total_debt,
+    u.latitude,
+    u.longitude,
+    -- Merchant Categories (Dimension)
+    m.category AS merchant_category
+FROM
+    transactions_data AS t
+    LEFT JOIN train_fraud_labels AS f ON t.id = f.id
+    LEFT JOIN cards_data AS c ON t.card_id = c.id
+    LEFT JOIN users_data AS u ON t.client_id = u.id
+    LEFT JOIN mcc_codes AS m ON t.mcc = m.mcc;
\ No newline at end of file
@@ -0,0 +1,25 @@
+/* Table form of the data mart. Unlike the materialized view it can be patched in
+ place, so incremental loads only rewrite the rows of new or changed transactions. */
+-- Drop the mart whether it was built as a materialized view or as a table
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_matviews WHERE matviewname = 'enriched_transactions') THEN
+        DROP MATERIALIZED VIEW enriched_transactions;
+    END IF;
+END $$;
+
+DROP TABLE IF EXISTS enriched_transactions;
+
+CREATE TABLE enriched_transactions AS
+SELECT
+    *
+FROM
+    enriched_transactions_source;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_int_transaction_id ON enriched_transactions (transaction_id);
+
+CREATE INDEX IF NOT EXISTS idx_int_date_status ON enriched_transactions (transaction_date, transaction_status);
+
+CREATE INDEX IF NOT EXISTS idx_int_client_card ON enriched_transactions (client_id, card_id);
+
+CREATE INDEX IF NOT EXISTS idx_int_mcc ON enriched_transactions (mcc);
\ No newline at end of file
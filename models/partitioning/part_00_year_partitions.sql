@@ -0,0 +1,27 @@
+-- Creates one partition per calendar year (<parent>_y<year>) on a table
+-- range-partitioned by date. No-op when the parent is not partitioned.
+CREATE OR REPLACE FUNCTION ensure_year_partitions(
+    parent TEXT,
+    from_year INT,
+    to_year INT
+) RETURNS VOID AS $$
+DECLARE
+    partition_year INT;
+BEGIN
+    IF from_year IS NULL OR NOT EXISTS (
+        SELECT 1 FROM pg_class WHERE relname = parent AND relkind = 'p'
+    ) THEN
+        RETURN;
+    END IF;
+
+    FOR partition_year IN from_year..to_year LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+            parent || '_y' || partition_year,
+            parent,
+            make_date(partition_year, 1, 1),
+            make_date(partition_year + 1, 1, 1)
+        );
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
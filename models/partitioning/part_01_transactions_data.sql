@@ -0,0 +1,44 @@
+/* Rebuild the staged transactions_data as a table range-partitioned by year of
+ date, so each year can be scanned, vacuumed or detached on its own. The primary
+ key must include the partition key, so it becomes (id, date).                 */
+DO $$
+DECLARE
+    first_year INT;
+    last_year INT;
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_class WHERE relname = 'transactions_data' AND relkind = 'p'
+    ) THEN
+        RETURN;
+    END IF;
+
+    ALTER TABLE transactions_data RENAME TO transactions_data_unpartitioned;
+
+    CREATE TABLE transactions_data (
+        LIKE transactions_data_unpartitioned INCLUDING DEFAULTS
+    ) PARTITION BY RANGE (date);
+
+    SELECT
+        MIN(EXTRACT(YEAR FROM date)) :: INT,
+        MAX(EXTRACT(YEAR FROM date)) :: INT INTO first_year,
+        last_year
+    FROM
+        transactions_data_unpartitioned;
+
+    PERFORM ensure_year_partitions('transactions_data', first_year, last_year);
+
+    INSERT INTO
+        transactions_data
+    SELECT
+        *
+    FROM
+        transactions_data_unpartitioned;
+
+    -- CASCADE clears a stale mart still pointing at the old table; run_data_mart rebuilds it
+    DROP TABLE transactions_data_unpartitioned CASCADE;
+
+    ALTER TABLE
+        transactions_data
+    ADD
+        PRIMARY KEY (id, date);
+END $$;
@@ -0,0 +1,53 @@
+/* One scan of the filtered mart feeds all four dashboard panels: each grouping
+ set reproduces daily_metrics, hourly_stats, demographic_stats or category_stats,
+ tagged by grain so DataLoader can split the result back into four frames.     */
+SELECT
+    CASE
+        WHEN GROUPING(transaction_date) = 0 THEN 'date'
+        WHEN GROUPING(hour_of_day) = 0 THEN 'hour'
+        WHEN GROUPING(age_group) = 0 THEN 'age_group'
+        ELSE 'merchant_category'
+    END AS grain,
+    transaction_date,
+    hour_of_day,
+    age_group,
+    merchant_category,
+    COUNT(transaction_id) AS vol,
+    SUM(transaction_amount) AS rev,
+    SUM(
+        CASE
+            WHEN is_fraud = TRUE THEN 1
+            ELSE 0
+        END
+    ) AS fraud_cases,
+    SUM(fraud_loss_amount) AS fraud_loss
+FROM
+    (
+        SELECT
+            transaction_id,
+            transaction_date,
+            hour_of_day,
+            CASE
+                WHEN age < 25 THEN 'Gen Z (<25)'
+                WHEN age BETWEEN 25
+                AND 40 THEN 'Millennial (25-40)'
+                WHEN age BETWEEN 41
+                AND 60 THEN 'Gen X (41-60)'
+                ELSE 'Senior (60+)'
+            END AS age_group,
+            merchant_category,
+            transaction_amount,
+            is_fraud,
+            fraud_loss_amount
+        FROM
+            enriched_transactions
+        WHERE
+            1 = 1 -- FILTERS --
+    ) AS e
+GROUP BY
+    GROUPING SETS (
+        (transaction_date),
+        (hour_of_day),
+        (age_group),
+        (merchant_category)
+    );
@@ -1,9 +1,5 @@
 SELECT
-    EXTRACT(
-        HOUR
-        FROM
-            transaction_time :: time
-    ) AS hour_of_day,
+    hour_of_day,
     COUNT(transaction_id) AS vol,
     SUM(
         CASE
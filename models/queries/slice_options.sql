@@ -0,0 +1,6 @@
+SELECT
+    DISTINCT card_brand :: TEXT AS card_brand,
+    card_type :: TEXT AS card_type,
+    gender :: TEXT AS gender
+FROM
+    enriched_transactions;
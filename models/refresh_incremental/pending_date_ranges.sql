@@ -0,0 +1,28 @@
+-- Contiguous [start_date, end_date) ranges of the dates with queued changes in
+-- mart_pending_changes, so the rollups and samples are rebuilt only for those
+-- dates (a backfilled 2010 transaction next to today's delta is two short ranges,
+-- not a decade). Consecutive dates share an island: date - row number is constant.
+SELECT
+    MIN(date) AS start_date,
+    MAX(date) + 1 AS end_date
+FROM
+    (
+        SELECT
+            date,
+            date - ROW_NUMBER() OVER (
+                ORDER BY
+                    date
+            ) :: INT AS island
+        FROM
+            (
+                SELECT
+                    DISTINCT t.date
+                FROM
+                    transactions_data AS t
+                    INNER JOIN mart_pending_changes AS p ON t.id = p.transaction_id
+            ) AS d
+    ) AS i
+GROUP BY
+    island
+ORDER BY
+    start_date;
@@ -0,0 +1,32 @@
+-- Recompute the table form of the mart for transaction dates in [:start_date, :end_date).
+-- Runs as one transaction, so readers keep seeing the previous rows until commit.
+SELECT
+    ensure_year_partitions(
+        'enriched_transactions',
+        EXTRACT(YEAR FROM CAST(:start_date AS DATE)) :: INT,
+        EXTRACT(YEAR FROM CAST(:end_date AS DATE) - 1) :: INT
+    );
+
+DELETE FROM
+    enriched_transactions
+WHERE
+    transaction_date >= :start_date
+    AND transaction_date < :end_date;
+
+INSERT INTO
+    enriched_transactions
+SELECT
+    *
+FROM
+    enriched_transactions_source
+WHERE
+    transaction_date >= :start_date
+    AND transaction_date < :end_date;
+
+-- Queued ids inside the window are now current
+DELETE FROM
+    mart_pending_changes AS p USING transactions_data AS t
+WHERE
+    p.transaction_id = t.id
+    AND t.date >= :start_date
+    AND t.date < :end_date;
@@ -0,0 +1,61 @@
+-- Rebuild rollup_transactions for transaction dates in [:start_date, :end_date)
+-- after a scoped mart refresh; same grouping sets as models/rollups.
+DELETE FROM
+    rollup_transactions
+WHERE
+    transaction_date >= :start_date
+    AND transaction_date < :end_date;
+
+INSERT INTO
+    rollup_transactions
+SELECT
+    CASE
+        WHEN GROUPING(hour_of_day) = 0 THEN 'hour'
+        WHEN GROUPING(age_group) = 0 THEN 'age_group'
+        WHEN GROUPING(merchant_category) = 0 THEN 'merchant_category'
+        ELSE 'date'
+    END :: VARCHAR(20) AS grain,
+    transaction_date,
+    hour_of_day,
+    age_group,
+    merchant_category,
+    COUNT(transaction_id) AS vol,
+    SUM(transaction_amount) AS rev,
+    SUM(
+        CASE
+            WHEN is_fraud = TRUE THEN 1
+            ELSE 0
+        END
+    ) AS fraud_cases,
+    SUM(fraud_loss_amount) AS fraud_loss
+FROM
+    (
+        SELECT
+            transaction_id,
+            transaction_date,
+            hour_of_day,
+            CASE
+                WHEN age < 25 THEN 'Gen Z (<25)'
+                WHEN age BETWEEN 25
+                AND 40 THEN 'Millennial (25-40)'
+                WHEN age BETWEEN 41
+                AND 60 THEN 'Gen X (41-60)'
+                ELSE 'Senior (60+)'
+            END AS age_group,
+            merchant_category,
+            transaction_amount,
+            is_fraud,
+            fraud_loss_amount
+        FROM
+            enriched_transactions
+        WHERE
+            transaction_date >= :start_date
+            AND transaction_date < :end_date
+    ) AS e
+GROUP BY
+    GROUPING SETS (
+        (transaction_date),
+        (transaction_date, hour_of_day),
+        (transaction_date, age_group),
+        (transaction_date, merchant_category)
+    );
@@ -0,0 +1,58 @@
+-- Redraw sample_transactions for transaction dates in [:start_date, :end_date)
+-- after a scoped mart refresh, with the stored stratum probabilities (see
+-- models/samples). A stratum first seen in the range is sampled in full.
+INSERT INTO
+    sample_strata (
+        sample_name,
+        stratum_category,
+        is_fraud,
+        population,
+        inclusion_prob
+    )
+SELECT
+    s.sample_name,
+    t.stratum_category,
+    t.is_fraud,
+    0,
+    1.0
+FROM
+    (
+        SELECT
+            DISTINCT sample_name
+        FROM
+            sample_strata
+    ) AS s
+    CROSS JOIN (
+        SELECT
+            DISTINCT COALESCE(merchant_category :: TEXT, '') AS stratum_category,
+            is_fraud
+        FROM
+            enriched_transactions
+        WHERE
+            transaction_date >= :start_date
+            AND transaction_date < :end_date
+    ) AS t
+ON CONFLICT DO NOTHING;
+
+DELETE FROM
+    sample_transactions
+WHERE
+    transaction_date >= :start_date
+    AND transaction_date < :end_date;
+
+INSERT INTO
+    sample_transactions
+SELECT
+    s.sample_name,
+    s.inclusion_prob,
+    e.*
+FROM
+    enriched_transactions AS e
+    INNER JOIN sample_strata AS s
+        ON s.stratum_category = COALESCE(e.merchant_category :: TEXT, '')
+        AND s.is_fraud = e.is_fraud
+WHERE
+    e.transaction_date >= :start_date
+    AND e.transaction_date < :end_date
+    AND (hashtext(e.transaction_id :: TEXT) :: BIGINT + 2147483648) / 4294967296.0
+        < s.inclusion_prob;
@@ -0,0 +1,16 @@
+-- Add the labels of the transactions queued in mart_pending_changes, and of the
+-- dimension tables, to a compact mart's label types (see models/incremental/
+-- mart_labels.sql). Runs and commits before the queued rows are rewritten, since
+-- the new labels cannot be used in the transaction that adds them.
+SELECT
+    sync_mart_labels(
+        ARRAY(
+            SELECT
+                DISTINCT t.use_chip
+            FROM
+                transactions_data AS t
+                INNER JOIN mart_pending_changes AS p ON t.id = p.transaction_id
+            WHERE
+                t.use_chip IS NOT NULL
+        )
+    );
@@ -0,0 +1,17 @@
+-- Add the labels of transactions dated in [:start_date, :end_date), and of the
+-- dimension tables, to a compact mart's label types (see models/incremental/
+-- mart_labels.sql). Runs and commits before the range is rewritten, since the
+-- new labels cannot be used in the transaction that adds them.
+SELECT
+    sync_mart_labels(
+        ARRAY(
+            SELECT
+                DISTINCT use_chip
+            FROM
+                transactions_data
+            WHERE
+                date >= :start_date
+                AND date < :end_date
+                AND use_chip IS NOT NULL
+        )
+    );
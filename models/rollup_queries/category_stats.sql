@@ -0,0 +1,12 @@
+SELECT
+    merchant_category,
+    SUM(vol) :: BIGINT AS vol,
+    SUM(rev) AS rev,
+    SUM(fraud_cases) :: BIGINT AS fraud_cases,
+    SUM(fraud_loss) AS fraud_loss
+FROM
+    rollup_transactions
+WHERE
+    grain = 'merchant_category' -- FILTERS --
+GROUP BY
+    merchant_category;
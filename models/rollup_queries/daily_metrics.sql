@@ -0,0 +1,14 @@
+SELECT
+    transaction_date,
+    SUM(vol) :: BIGINT AS vol,
+    SUM(rev) AS rev,
+    SUM(fraud_cases) :: BIGINT AS fraud_cases,
+    SUM(fraud_loss) AS fraud_loss
+FROM
+    rollup_transactions
+WHERE
+    grain = 'date' -- FILTERS --
+GROUP BY
+    transaction_date
+ORDER BY
+    transaction_date;
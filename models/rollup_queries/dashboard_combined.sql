@@ -0,0 +1,26 @@
+-- Rollup version of dashboard_combined: one pass over the year's rollup rows,
+-- collapsing each grain to the same shape as the mart query
+SELECT
+    grain,
+    CASE
+        WHEN grain = 'date' THEN transaction_date
+    END AS transaction_date,
+    hour_of_day,
+    age_group,
+    merchant_category,
+    SUM(vol) :: BIGINT AS vol,
+    SUM(rev) AS rev,
+    SUM(fraud_cases) :: BIGINT AS fraud_cases,
+    SUM(fraud_loss) AS fraud_loss
+FROM
+    rollup_transactions
+WHERE
+    1 = 1 -- FILTERS --
+GROUP BY
+    grain,
+    CASE
+        WHEN grain = 'date' THEN transaction_date
+    END,
+    hour_of_day,
+    age_group,
+    merchant_category;
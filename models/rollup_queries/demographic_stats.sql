@@ -0,0 +1,10 @@
+SELECT
+    age_group,
+    SUM(vol) :: BIGINT AS vol,
+    SUM(fraud_cases) :: BIGINT AS fraud_cases
+FROM
+    rollup_transactions
+WHERE
+    grain = 'age_group' -- FILTERS --
+GROUP BY
+    age_group;
@@ -0,0 +1,12 @@
+SELECT
+    hour_of_day,
+    SUM(vol) :: BIGINT AS vol,
+    SUM(fraud_cases) :: BIGINT AS fraud_cases
+FROM
+    rollup_transactions
+WHERE
+    grain = 'hour' -- FILTERS --
+GROUP BY
+    hour_of_day
+ORDER BY
+    hour_of_day;
@@ -0,0 +1,12 @@
+SELECT
+    DISTINCT EXTRACT(
+        YEAR
+        FROM
+            transaction_date
+    ) :: INT AS report_year
+FROM
+    rollup_transactions
+WHERE
+    grain = 'date'
+ORDER BY
+    1 DESC;
@@ -0,0 +1,65 @@
+/* rollup_transactions pre-aggregates the mart for the dashboard. Each dashboard
+ query groups by day plus at most one dimension, so a single pass builds one
+ grouping set per dimension (grain = date | hour | age_group | merchant_category)
+ instead of the full cross product, which would be nearly as large as the mart. */
+-- Build beside the live table, then swap, so readers are only locked for the rename
+DROP TABLE IF EXISTS rollup_transactions_new;
+
+CREATE TABLE rollup_transactions_new AS
+SELECT
+    CASE
+        WHEN GROUPING(hour_of_day) = 0 THEN 'hour'
+        WHEN GROUPING(age_group) = 0 THEN 'age_group'
+        WHEN GROUPING(merchant_category) = 0 THEN 'merchant_category'
+        ELSE 'date'
+    END :: VARCHAR(20) AS grain,
+    transaction_date,
+    hour_of_day,
+    age_group,
+    merchant_category,
+    COUNT(transaction_id) AS vol,
+    SUM(transaction_amount) AS rev,
+    SUM(
+        CASE
+            WHEN is_fraud = TRUE THEN 1
+            ELSE 0
+        END
+    ) AS fraud_cases,
+    SUM(fraud_loss_amount) AS fraud_loss
+FROM
+    (
+        SELECT
+            transaction_id,
+            transaction_date,
+            hour_of_day,
+            CASE
+                WHEN age < 25 THEN 'Gen Z (<25)'
+                WHEN age BETWEEN 25
+                AND 40 THEN 'Millennial (25-40)'
+                WHEN age BETWEEN 41
+                AND 60 THEN 'Gen X (41-60)'
+                ELSE 'Senior (60+)'
+            END AS age_group,
+            merchant_category,
+            transaction_amount,
+            is_fraud,
+            fraud_loss_amount
+        FROM
+            enriched_transactions
+    ) AS e
+GROUP BY
+    GROUPING SETS (
+        (transaction_date),
+        (transaction_date, hour_of_day),
+        (transaction_date, age_group),
+        (transaction_date, merchant_category)
+    );
+
+CREATE INDEX idx_rollup_grain_date_new ON rollup_transactions_new (grain, transaction_date);
+
+DROP TABLE IF EXISTS rollup_transactions;
+
+ALTER TABLE
+    rollup_transactions_new RENAME TO rollup_transactions;
+
+ALTER INDEX idx_rollup_grain_date_new RENAME TO idx_rollup_grain_date;
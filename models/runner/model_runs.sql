@@ -0,0 +1,10 @@
+-- Last run of each SQL model, used by scripts/model_runner.py to skip models
+-- whose SQL and inputs are unchanged and to resume after a failure
+CREATE TABLE IF NOT EXISTS model_runs (
+    model VARCHAR(200) PRIMARY KEY,
+    fingerprint CHAR(64) NOT NULL,
+    status VARCHAR(10) NOT NULL,
+    duration_s DOUBLE PRECISION,
+    error TEXT,
+    finished_at TIMESTAMPTZ NOT NULL
+);
@@ -0,0 +1,36 @@
+-- Estimated from sample_transactions: each sampled row stands for
+-- 1 / inclusion_prob mart rows; <measure>_var is the estimate's variance
+SELECT
+    merchant_category,
+    SUM(1 / inclusion_prob) AS vol,
+    SUM((1 - inclusion_prob) / (inclusion_prob * inclusion_prob)) AS vol_var,
+    SUM(transaction_amount / inclusion_prob) AS rev,
+    SUM(
+        (1 - inclusion_prob) * transaction_amount * transaction_amount / (
+            inclusion_prob * inclusion_prob
+        )
+    ) AS rev_var,
+    SUM(
+        CASE
+            WHEN is_fraud = TRUE THEN 1 / inclusion_prob
+            ELSE 0
+        END
+    ) AS fraud_cases,
+    SUM(
+        CASE
+            WHEN is_fraud = TRUE THEN (1 - inclusion_prob) / (inclusion_prob * inclusion_prob)
+            ELSE 0
+        END
+    ) AS fraud_cases_var,
+    SUM(fraud_loss_amount / inclusion_prob) AS fraud_loss,
+    SUM(
+        (1 - inclusion_prob) * fraud_loss_amount * fraud_loss_amount / (
+            inclusion_prob * inclusion_prob
+        )
+    ) AS fraud_loss_var
+FROM
+    sample_transactions
+WHERE
+    sample_name = :sample_name -- FILTERS --
+GROUP BY
+    merchant_category;
@@ -0,0 +1,70 @@
+/* Sample counterpart of models/queries/dashboard_combined.sql: one scan of the
+ filtered sample feeds all four panels. Each sampled row stands for
+ 1 / inclusion_prob mart rows; <measure>_var is the estimate's variance.       */
+SELECT
+    CASE
+        WHEN GROUPING(transaction_date) = 0 THEN 'date'
+        WHEN GROUPING(hour_of_day) = 0 THEN 'hour'
+        WHEN GROUPING(age_group) = 0 THEN 'age_group'
+        ELSE 'merchant_category'
+    END AS grain,
+    transaction_date,
+    hour_of_day,
+    age_group,
+    merchant_category,
+    SUM(1 / inclusion_prob) AS vol,
+    SUM((1 - inclusion_prob) / (inclusion_prob * inclusion_prob)) AS vol_var,
+    SUM(transaction_amount / inclusion_prob) AS rev,
+    SUM(
+        (1 - inclusion_prob) * transaction_amount * transaction_amount / (
+            inclusion_prob * inclusion_prob
+        )
+    ) AS rev_var,
+    SUM(
+        CASE
+            WHEN is_fraud = TRUE THEN 1 / inclusion_prob
+            ELSE 0
+        END
+    ) AS fraud_cases,
+    SUM(
+        CASE
+            WHEN is_fraud = TRUE THEN (1 - inclusion_prob) / (inclusion_prob * inclusion_prob)
+            ELSE 0
+        END
+    ) AS fraud_cases_var,
+    SUM(fraud_loss_amount / inclusion_prob) AS fraud_loss,
+    SUM(
+        (1 - inclusion_prob) * fraud_loss_amount * fraud_loss_amount / (
+            inclusion_prob * inclusion_prob
+        )
+    ) AS fraud_loss_var
+FROM
+    (
+        SELECT
+            transaction_date,
+            hour_of_day,
+            CASE
+                WHEN age < 25 THEN 'Gen Z (<25)'
+                WHEN age BETWEEN 25
+                AND 40 THEN 'Millennial (25-40)'
+                WHEN age BETWEEN 41
+                AND 60 THEN 'Gen X (41-60)'
+                ELSE 'Senior (60+)'
+            END AS age_group,
+            merchant_category,
+            transaction_amount,
+            is_fraud,
+            fraud_loss_amount,
+            inclusion_prob
+        FROM
+            sample_transactions
+        WHERE
+            sample_name = :sample_name -- FILTERS --
+    ) AS e
+GROUP BY
+    GROUPING SETS (
+        (transaction_date),
+        (hour_of_day),
+        (age_group),
+        (merchant_category)
+    );
@@ -0,0 +1,31 @@
+-- Estimated from sample_transactions: each sampled row stands for
+-- 1 / inclusion_prob mart rows; <measure>_var is the estimate's variance
+SELECT
+    CASE
+        WHEN age < 25 THEN 'Gen Z (<25)'
+        WHEN age BETWEEN 25
+        AND 40 THEN 'Millennial (25-40)'
+        WHEN age BETWEEN 41
+        AND 60 THEN 'Gen X (41-60)'
+        ELSE 'Senior (60+)'
+    END AS age_group,
+    SUM(1 / inclusion_prob) AS vol,
+    SUM((1 - inclusion_prob) / (inclusion_prob * inclusion_prob)) AS vol_var,
+    SUM(
+        CASE
+            WHEN is_fraud = TRUE THEN 1 / inclusion_prob
+            ELSE 0
+        END
+    ) AS fraud_cases,
+    SUM(
+        CASE
+            WHEN is_fraud = TRUE THEN (1 - inclusion_prob) / (inclusion_prob * inclusion_prob)
+            ELSE 0
+        END
+    ) AS fraud_cases_var
+FROM
+    sample_transactions
+WHERE
+    sample_name = :sample_name -- FILTERS --
+GROUP BY
+    age_group;
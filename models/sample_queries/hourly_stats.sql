@@ -0,0 +1,26 @@
+-- Estimated from sample_transactions: each sampled row stands for
+-- 1 / inclusion_prob mart rows; <measure>_var is the estimate's variance
+SELECT
+    hour_of_day,
+    SUM(1 / inclusion_prob) AS vol,
+    SUM((1 - inclusion_prob) / (inclusion_prob * inclusion_prob)) AS vol_var,
+    SUM(
+        CASE
+            WHEN is_fraud = TRUE THEN 1 / inclusion_prob
+            ELSE 0
+        END
+    ) AS fraud_cases,
+    SUM(
+        CASE
+            WHEN is_fraud = TRUE THEN (1 - inclusion_prob) / (inclusion_prob * inclusion_prob)
+            ELSE 0
+        END
+    ) AS fraud_cases_var
+FROM
+    sample_transactions
+WHERE
+    sample_name = :sample_name -- FILTERS --
+GROUP BY
+    hour_of_day
+ORDER BY
+    hour_of_day;
@@ -0,0 +1,79 @@
+/* sample_transactions holds stratified samples of the mart for the dashboard's
+ approximate mode. Every (merchant_category, is_fraud) stratum is sampled at the
+ sample's fraction, raised so that each stratum keeps at least min_rows rows;
+ small strata such as fraud in a quiet category are therefore kept in full.
+ Rows are drawn by a hash of transaction_id, so a rebuild draws the same rows,
+ and each row carries its inclusion probability for the estimates in
+ models/sample_queries (SUM(x / inclusion_prob)).                              */
+-- Build beside the live tables, then swap, so readers are only locked for the rename
+DROP TABLE IF EXISTS sample_strata_new;
+
+DROP TABLE IF EXISTS sample_transactions_new;
+
+CREATE TABLE sample_strata_new AS
+WITH samples (sample_name, fraction, min_rows) AS (
+    VALUES
+        ('1pct', 0.01, 2000),
+        ('0.1pct', 0.001, 200)
+),
+strata AS (
+    SELECT
+        COALESCE(merchant_category :: TEXT, '') AS stratum_category,
+        is_fraud,
+        COUNT(*) AS population
+    FROM
+        enriched_transactions
+    GROUP BY
+        1,
+        2
+)
+SELECT
+    s.sample_name :: VARCHAR(10) AS sample_name,
+    t.stratum_category,
+    t.is_fraud,
+    t.population,
+    LEAST(
+        1.0,
+        GREATEST(s.fraction, s.min_rows :: NUMERIC / t.population)
+    ) :: DOUBLE PRECISION AS inclusion_prob
+FROM
+    samples AS s
+    CROSS JOIN strata AS t;
+
+ALTER TABLE
+    sample_strata_new
+ADD
+    CONSTRAINT sample_strata_new_pkey PRIMARY KEY (sample_name, stratum_category, is_fraud);
+
+CREATE TABLE sample_transactions_new AS
+SELECT
+    s.sample_name,
+    s.inclusion_prob,
+    e.*
+FROM
+    enriched_transactions AS e
+    INNER JOIN sample_strata_new AS s
+        ON s.stratum_category = COALESCE(e.merchant_category :: TEXT, '')
+        AND s.is_fraud = e.is_fraud
+WHERE
+    -- transaction_id hashed onto [0, 1)
+    (hashtext(e.transaction_id :: TEXT) :: BIGINT + 2147483648) / 4294967296.0
+        < s.inclusion_prob;
+
+CREATE INDEX idx_sample_name_date_new ON sample_transactions_new (sample_name, transaction_date);
+
+DROP TABLE IF EXISTS sample_transactions;
+
+DROP TABLE IF EXISTS sample_strata;
+
+ALTER TABLE
+    sample_strata_new RENAME TO sample_strata;
+
+ALTER INDEX sample_strata_new_pkey RENAME TO sample_strata_pkey;
+
+ALTER TABLE
+    sample_transactions_new RENAME TO sample_transactions;
+
+ALTER INDEX idx_sample_name_date_new RENAME TO idx_sample_name_date;
+
+ANALYZE sample_transactions;
@@ -0,0 +1,357 @@
+/* Fraud risk scoring. Scores the transactions queued in risk_pending_transactions
+ by the incremental loads (inc_01), whatever their id or date, so each run only
+ processes the new transactions plus the 7 days of history before each of their
+ dates. The first run after a reset (an empty risk_score) scores the whole mart.
+ Velocity features are sliding RANGE windows over each card's and each client's
+ transactions sorted by time: one sort per partitioning, no correlated lookups. */
+CREATE TABLE IF NOT EXISTS risk_score (
+    transaction_id INTEGER PRIMARY KEY,
+    transaction_date DATE NOT NULL,
+    client_id SMALLINT,
+    card_id SMALLINT,
+    card_txn_1h INTEGER,
+    card_amount_1h DECIMAL(14, 2),
+    card_txn_24h INTEGER,
+    card_amount_24h DECIMAL(14, 2),
+    card_txn_7d INTEGER,
+    card_amount_7d DECIMAL(14, 2),
+    client_txn_24h INTEGER,
+    client_amount_24h DECIMAL(14, 2),
+    is_new_merchant BOOLEAN,
+    is_off_hours BOOLEAN,
+    distance_from_home_km DOUBLE PRECISION,
+    risk_score SMALLINT NOT NULL,
+    scored_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_risk_date_score ON risk_score (transaction_date, risk_score);
+
+-- First transaction of each client at each merchant
+CREATE TABLE IF NOT EXISTS risk_client_merchants (
+    client_id SMALLINT,
+    merchant_id INTEGER,
+    first_transaction_id INTEGER NOT NULL,
+    PRIMARY KEY (client_id, merchant_id)
+);
+
+-- Merchants carry only a zip, so each zip is located at the mean home of the
+-- clients who shop there in person, over every in-person transaction scored so far
+CREATE TABLE IF NOT EXISTS risk_zip_locations (
+    zip BIGINT PRIMARY KEY,
+    latitude DOUBLE PRECISION NOT NULL,
+    longitude DOUBLE PRECISION NOT NULL,
+    transactions INTEGER NOT NULL DEFAULT 0
+);
+
+ALTER TABLE
+    risk_zip_locations
+ADD
+    COLUMN IF NOT EXISTS transactions INTEGER NOT NULL DEFAULT 0;
+
+-- Also created with the other incremental queues (models/incremental/ingest_ledger.sql)
+CREATE TABLE IF NOT EXISTS risk_pending_transactions (
+    transaction_id BIGINT PRIMARY KEY,
+    queued_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Each branch is gated by a one-time check, so only one of them scans anything
+CREATE TEMPORARY TABLE risk_batch_ids ON COMMIT DROP AS
+SELECT
+    transaction_id
+FROM
+    enriched_transactions
+WHERE
+    NOT EXISTS (
+        SELECT
+            1
+        FROM
+            risk_score
+    )
+UNION ALL
+SELECT
+    p.transaction_id
+FROM
+    risk_pending_transactions AS p
+WHERE
+    EXISTS (
+        SELECT
+            1
+        FROM
+            risk_score
+    )
+    AND NOT EXISTS (
+        SELECT
+            1
+        FROM
+            risk_score AS r
+        WHERE
+            r.transaction_id = p.transaction_id
+    );
+
+CREATE TEMPORARY TABLE risk_batch ON COMMIT DROP AS
+SELECT
+    transaction_id,
+    client_id,
+    card_id,
+    merchant_id,
+    zip,
+    transaction_date,
+    transaction_date + transaction_time :: time AS transaction_ts,
+    hour_of_day,
+    transaction_amount,
+    latitude,
+    longitude,
+    transaction_type :: TEXT = 'Online Transaction' AS is_online
+FROM
+    enriched_transactions AS e
+    INNER JOIN risk_batch_ids AS i ON i.transaction_id = e.transaction_id;
+
+-- The new transactions plus the 7 days of their clients' history before each of
+-- their dates (a backfilled transaction adds 9 days, not every day since it)
+CREATE TEMPORARY TABLE risk_window ON COMMIT DROP AS
+SELECT
+    e.transaction_id,
+    e.client_id,
+    e.card_id,
+    e.transaction_date + e.transaction_time :: time AS transaction_ts,
+    e.transaction_amount,
+    FALSE AS is_new
+FROM
+    enriched_transactions AS e
+WHERE
+    e.transaction_date IN (
+        SELECT
+            DISTINCT b.transaction_date - days.n
+        FROM
+            risk_batch AS b
+            CROSS JOIN generate_series(0, 8) AS days (n)
+    )
+    AND NOT EXISTS (
+        SELECT
+            1
+        FROM
+            risk_batch AS b
+        WHERE
+            b.transaction_id = e.transaction_id
+    )
+    AND e.client_id IN (
+        SELECT
+            DISTINCT client_id
+        FROM
+            risk_batch
+    )
+UNION ALL
+SELECT
+    transaction_id,
+    client_id,
+    card_id,
+    transaction_ts,
+    transaction_amount,
+    TRUE
+FROM
+    risk_batch;
+
+INSERT INTO
+    risk_client_merchants (client_id, merchant_id, first_transaction_id)
+SELECT
+    client_id,
+    merchant_id,
+    MIN(transaction_id)
+FROM
+    risk_batch
+WHERE
+    client_id IS NOT NULL
+    AND merchant_id IS NOT NULL
+GROUP BY
+    client_id,
+    merchant_id ON CONFLICT (client_id, merchant_id) DO
+UPDATE
+SET
+    first_transaction_id = LEAST(
+        risk_client_merchants.first_transaction_id,
+        EXCLUDED.first_transaction_id
+    );
+
+-- Folds the batch's in-person transactions into each zip's running mean
+INSERT INTO
+    risk_zip_locations (zip, latitude, longitude, transactions)
+SELECT
+    zip,
+    AVG(latitude),
+    AVG(longitude),
+    COUNT(*)
+FROM
+    risk_batch
+WHERE
+    zip IS NOT NULL
+    AND latitude IS NOT NULL
+    AND is_online IS FALSE
+GROUP BY
+    zip ON CONFLICT (zip) DO
+UPDATE
+SET
+    latitude = (
+        risk_zip_locations.latitude * risk_zip_locations.transactions
+        + EXCLUDED.latitude * EXCLUDED.transactions
+    ) / (risk_zip_locations.transactions + EXCLUDED.transactions),
+    longitude = (
+        risk_zip_locations.longitude * risk_zip_locations.transactions
+        + EXCLUDED.longitude * EXCLUDED.transactions
+    ) / (risk_zip_locations.transactions + EXCLUDED.transactions),
+    transactions = risk_zip_locations.transactions + EXCLUDED.transactions;
+
+INSERT INTO
+    risk_score (
+        transaction_id,
+        transaction_date,
+        client_id,
+        card_id,
+        card_txn_1h,
+        card_amount_1h,
+        card_txn_24h,
+        card_amount_24h,
+        card_txn_7d,
+        card_amount_7d,
+        client_txn_24h,
+        client_amount_24h,
+        is_new_merchant,
+        is_off_hours,
+        distance_from_home_km,
+        risk_score
+    )
+SELECT
+    f.transaction_id,
+    f.transaction_date,
+    f.client_id,
+    f.card_id,
+    f.card_txn_1h,
+    f.card_amount_1h,
+    f.card_txn_24h,
+    f.card_amount_24h,
+    f.card_txn_7d,
+    f.card_amount_7d,
+    f.client_txn_24h,
+    f.client_amount_24h,
+    f.is_new_merchant,
+    f.is_off_hours,
+    f.distance_from_home_km,
+    -- Points per signal, capped at 100
+    LEAST(
+        100,
+        -- Card reused within the hour
+        20 * LEAST(f.card_txn_1h - 1, 2)
+        -- Day's spend over 3x the card's daily average for the week
+        + CASE
+            WHEN f.card_amount_24h > 100
+            AND f.card_amount_24h > 3 * f.card_amount_7d / 7 THEN 15
+            ELSE 0
+        END
+        + CASE
+            WHEN f.client_txn_24h >= 10 THEN 10
+            ELSE 0
+        END
+        + CASE
+            WHEN f.is_new_merchant THEN 15
+            ELSE 0
+        END
+        + CASE
+            WHEN f.is_off_hours THEN 10
+            ELSE 0
+        END
+        + CASE
+            WHEN f.distance_from_home_km > 1000 THEN 20
+            WHEN f.distance_from_home_km > 100 THEN 10
+            ELSE 0
+        END
+    ) :: SMALLINT
+FROM
+    (
+        SELECT
+            b.transaction_id,
+            b.transaction_date,
+            b.client_id,
+            b.card_id,
+            v.card_txn_1h,
+            v.card_amount_1h,
+            v.card_txn_24h,
+            v.card_amount_24h,
+            v.card_txn_7d,
+            v.card_amount_7d,
+            v.client_txn_24h,
+            v.client_amount_24h,
+            COALESCE(m.first_transaction_id = b.transaction_id, FALSE) AS is_new_merchant,
+            b.hour_of_day < 6 AS is_off_hours,
+            -- Haversine distance between the client's home and the merchant zip
+            2 * 6371 * ASIN(
+                LEAST(
+                    1,
+                    SQRT(
+                        POWER(SIN(RADIANS(z.latitude - b.latitude) / 2), 2)
+                        + COS(RADIANS(b.latitude)) * COS(RADIANS(z.latitude))
+                        * POWER(SIN(RADIANS(z.longitude - b.longitude) / 2), 2)
+                    )
+                )
+            ) AS distance_from_home_km
+        FROM
+            (
+                SELECT
+                    transaction_id,
+                    is_new,
+                    COUNT(*) OVER (
+                        card_time RANGE BETWEEN INTERVAL '1 hour' PRECEDING
+                        AND CURRENT ROW
+                    ) AS card_txn_1h,
+                    SUM(transaction_amount) OVER (
+                        card_time RANGE BETWEEN INTERVAL '1 hour' PRECEDING
+                        AND CURRENT ROW
+                    ) AS card_amount_1h,
+                    COUNT(*) OVER (
+                        card_time RANGE BETWEEN INTERVAL '24 hours' PRECEDING
+                        AND CURRENT ROW
+                    ) AS card_txn_24h,
+                    SUM(transaction_amount) OVER (
+                        card_time RANGE BETWEEN INTERVAL '24 hours' PRECEDING
+                        AND CURRENT ROW
+                    ) AS card_amount_24h,
+                    COUNT(*) OVER (
+                        card_time RANGE BETWEEN INTERVAL '7 days' PRECEDING
+                        AND CURRENT ROW
+                    ) AS card_txn_7d,
+                    SUM(transaction_amount) OVER (
+                        card_time RANGE BETWEEN INTERVAL '7 days' PRECEDING
+                        AND CURRENT ROW
+                    ) AS card_amount_7d,
+                    COUNT(*) OVER (
+                        client_time RANGE BETWEEN INTERVAL '24 hours' PRECEDING
+                        AND CURRENT ROW
+                    ) AS client_txn_24h,
+                    SUM(transaction_amount) OVER (
+                        client_time RANGE BETWEEN INTERVAL '24 hours' PRECEDING
+                        AND CURRENT ROW
+                    ) AS client_amount_24h
+                FROM
+                    risk_window
+                WINDOW
+                    card_time AS (PARTITION BY card_id ORDER BY transaction_ts),
+                    client_time AS (PARTITION BY client_id ORDER BY transaction_ts)
+            ) AS v
+            INNER JOIN risk_batch AS b ON b.transaction_id = v.transaction_id
+            LEFT JOIN risk_client_merchants AS m ON m.client_id = b.client_id
+            AND m.merchant_id = b.merchant_id
+            LEFT JOIN risk_zip_locations AS z ON z.zip = b.zip
+        WHERE
+            v.is_new
+    ) AS f;
+
+-- Scored transactions leave the queue; ids not in the mart yet wait for it
+DELETE FROM
+    risk_pending_transactions AS p
+WHERE
+    EXISTS (
+        SELECT
+            1
+        FROM
+            risk_score AS r
+        WHERE
+            r.transaction_id = p.transaction_id
+    );
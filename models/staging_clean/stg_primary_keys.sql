@@ -0,0 +1,25 @@
+-- Rows were cleaned and typed during ingestion, so staging only adds the keys
+ALTER TABLE
+    cards_data
+ADD
+    PRIMARY KEY (id);
+
+ALTER TABLE
+    mcc_codes
+ADD
+    PRIMARY KEY (mcc);
+
+ALTER TABLE
+    train_fraud_labels
+ADD
+    PRIMARY KEY (id);
+
+ALTER TABLE
+    transactions_data
+ADD
+    PRIMARY KEY (id);
+
+ALTER TABLE
+    users_data
+ADD
+    PRIMARY KEY (id);
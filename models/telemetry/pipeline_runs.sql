@@ -0,0 +1,32 @@
+-- One row per telemetry span (pipeline stage, refresh step or dashboard query)
+CREATE TABLE IF NOT EXISTS pipeline_runs (
+    run_id VARCHAR(32) NOT NULL,
+    component VARCHAR(20) NOT NULL,
+    stage VARCHAR(30) NOT NULL,
+    name VARCHAR(200) NOT NULL,
+    status VARCHAR(10) NOT NULL,
+    error TEXT,
+    started_at TIMESTAMPTZ NOT NULL,
+    wall_s DOUBLE PRECISION,
+    cpu_s DOUBLE PRECISION,
+    client_sql_s DOUBLE PRECISION,
+    rows BIGINT,
+    bytes BIGINT,
+    peak_rss_mb DOUBLE PRECISION,
+    attrs JSONB
+);
+
+-- client_sql_s was stored as db_s before it was renamed
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = current_schema()
+          AND table_name = 'pipeline_runs'
+          AND column_name = 'db_s'
+    ) THEN
+        ALTER TABLE pipeline_runs RENAME COLUMN db_s TO client_sql_s;
+    END IF;
+END $$;
+
+CREATE INDEX IF NOT EXISTS idx_pipeline_runs_stage ON pipeline_runs (component, stage, name, started_at);
@@ -0,0 +1,34 @@
+-- Rows quarantined by the validated load (scripts/validation.py), with the
+-- reasons they were rejected and their raw values. run_id is the loader's
+-- telemetry run (pipeline_runs); a reload replaces only its own tables' rejects.
+CREATE TABLE IF NOT EXISTS ingest_rejects (
+    reject_id BIGSERIAL PRIMARY KEY,
+    run_id VARCHAR(32),
+    source_table TEXT NOT NULL,
+    source_id BIGINT,
+    reason TEXT NOT NULL,
+    raw JSONB,
+    rejected_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+ALTER TABLE
+    ingest_rejects
+ADD
+    COLUMN IF NOT EXISTS run_id VARCHAR(32);
+
+CREATE INDEX IF NOT EXISTS idx_ingest_rejects_table ON ingest_rejects (source_table);
+
+-- Tables whose current rows were all checked against their foreign keys while
+-- loading; cleared by any load that is not validated
+CREATE TABLE IF NOT EXISTS ingest_validations (
+    table_name TEXT PRIMARY KEY,
+    rows_accepted BIGINT NOT NULL,
+    rows_rejected BIGINT NOT NULL,
+    validated_at TIMESTAMPTZ NOT NULL,
+    run_id VARCHAR(32)
+);
+
+ALTER TABLE
+    ingest_validations
+ADD
+    COLUMN IF NOT EXISTS run_id VARCHAR(32);
@@ -0,0 +1,88 @@
+import sys
+import time
+import pathlib
+import argparse
+import statistics
+
+# Compares the dashboard fetch paths (pd.read_sql vs COPY into typed columns)
+# on the dashboard queries, bypassing the result cache.
+sys.path.insert(0, str(pathlib.Path("dashboard").resolve()))
+from report_data import FETCHERS, DataLoader, compile_filters, get_engine
+
+
+def benchmark(query_paths, modes, repeat, use_rollups, **filters):
+    filter_sql, params = compile_filters(**filters)
+    results = []
+
+    for query_path in query_paths:
+        loader = DataLoader(query_path, use_rollups=use_rollups)
+        query = loader._build_query(loader._query_path({}), filter_sql)
+
+        for mode in modes:
+            timings = []
+            for _ in range(repeat):
+                start_time = time.perf_counter()
+                df = FETCHERS[mode](query, params)
+                timings.append(time.perf_counter() - start_time)
+
+            results.append(
+                {
+                    "query": query_path.name,
+                    "mode": mode,
+                    "rows": len(df),
+                    "median_s": statistics.median(timings),
+                    "memory_mb": df.memory_usage(deep=True).sum() / 1024**2,
+                    "object_columns": int((df.dtypes == object).sum()),
+                }
+            )
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark dashboard fetch paths")
+    parser.add_argument(
+        "--queries",
+        nargs="+",
+        default=[
+            "daily_metrics.sql",
+            "hourly_stats.sql",
+            "demographic_stats.sql",
+            "category_stats.sql",
+            "dashboard_combined.sql",
+        ],
+        help="Query files in models/queries",
+    )
+    parser.add_argument("--year", type=int, help="Restrict to one year (default: all)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per query and mode")
+    parser.add_argument(
+        "--mart",
+        action="store_true",
+        help="Query the mart directly instead of the rollups (larger results)",
+    )
+    args = parser.parse_args()
+
+    if get_engine() is None:
+        print("Error: DB_CONNECTION_STRING not found in .env file.")
+        exit()
+
+    query_dir = pathlib.Path("models/queries")
+    results = benchmark(
+        [query_dir / name for name in args.queries],
+        list(FETCHERS),
+        args.repeat,
+        not args.mart,
+        year=args.year,
+    )
+
+    print(
+        f"\n{'Query':<26} {'Mode':<9} {'Rows':>10} {'Median':>10} {'Memory':>10} {'Object cols':>12}"
+    )
+    for row in results:
+        print(
+            f"{row['query']:<26} {row['mode']:<9} {row['rows']:>10,} "
+            f"{row['median_s'] * 1000:>8.1f}ms {row['memory_mb']:>8.2f}MB "
+            f"{row['object_columns']:>12}"
+        )
+
+    get_engine().dispose()
@@ -0,0 +1,263 @@
+import os
+import sys
+import json
+import time
+import pathlib
+import argparse
+import platform
+import statistics
+import importlib.util
+from datetime import date, datetime, timedelta, timezone
+from sqlalchemy import text
+from dotenv import load_dotenv
+
+# End-to-end benchmark: times each RevenueOpsPipeline stage (menu option 6
+# order), the mart refresh and every models/queries query (exact, rollup and
+# sample versions), then writes a JSON report. --compare prints the change
+# against an earlier report.
+
+load_dotenv()
+
+# Dashboard queries must reach Postgres, not the shared result cache
+os.environ["RESULT_CACHE_ENABLED"] = "false"
+
+SCRIPTS = pathlib.Path(__file__).resolve().parent
+PIPELINE_STAGES = [
+    "drop_foreign_keys",
+    "load_raw_data",
+    "run_staging_models",
+    "run_data_mart",
+    "run_index_models",
+]
+
+
+def load_script(file_name):
+    # The scripts have hyphenated file names, so they are imported by path
+    spec = importlib.util.spec_from_file_location(
+        file_name[:-3].replace("-", "_"), SCRIPTS / file_name
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def bench_pipeline(db_url, args):
+    load_data = load_script("load-data.py")
+    pipeline = load_data.RevenueOpsPipeline(
+        db_url,
+        loader=args.loader,
+        unlogged=args.unlogged,
+        defer_indexes=args.defer_indexes,
+        chunksize=args.chunksize,
+        memory_limit_mb=args.memory_limit_mb,
+        workers=args.workers,
+        mart_table=args.mart_table,
+        clean_on_ingest=args.clean_on_ingest,
+        partition_by_year=args.partition_by_year,
+        compact_mart=args.compact_mart,
+        # Time every model, not only those whose inputs changed since the last run
+        full_refresh=True,
+        concurrent_indexes=args.concurrent_indexes,
+        maintenance_work_mem=args.maintenance_work_mem,
+        parallel_maintenance_workers=args.parallel_maintenance_workers,
+        validate_on_ingest=args.validate_on_ingest,
+    )
+    pipeline.paths["raw"] = pathlib.Path(args.data_dir)
+    pipeline.connect()
+
+    results = []
+    try:
+        for stage in PIPELINE_STAGES:
+            start_time = time.perf_counter()
+            getattr(pipeline, stage)()
+            results.append(
+                {
+                    "group": "pipeline",
+                    "name": stage,
+                    "seconds": time.perf_counter() - start_time,
+                }
+            )
+    finally:
+        pipeline.engine.dispose()
+    return results
+
+
+def bench_refresh(db_url):
+    refresh_view = load_script("refresh-view.py")
+    refresher = refresh_view.RefreshViews(db_url)
+    refresher.connect()
+
+    try:
+        start_time = time.perf_counter()
+        if refresher.martIsView():
+            name = "refresh full"
+            refresher.refreshView()
+        else:
+            # A table mart is patched by range; benchmark the latest year
+            with refresher.engine.connect() as connection:
+                last_date = connection.execute(
+                    text("SELECT MAX(transaction_date) FROM enriched_transactions")
+                ).scalar()
+            name = "refresh latest year"
+            refresher.refreshDateRange(
+                date(last_date.year, 1, 1), last_date + timedelta(days=1)
+            )
+        return [
+            {
+                "group": "refresh",
+                "name": name,
+                "seconds": time.perf_counter() - start_time,
+            }
+        ]
+    finally:
+        refresher.engine.dispose()
+
+
+def bench_queries(repeat):
+    sys.path.insert(0, str(SCRIPTS.parent / "dashboard"))
+    from report_data import FETCH_MODE, FETCHERS, DataLoader, compile_filters
+
+    query_dir = SCRIPTS.parent / "models" / "queries"
+    years = DataLoader(query_dir / "year_options.sql").get_data()
+    year = int(years["report_year"].max()) if not years.empty else None
+    filter_sql, params = compile_filters(year=year)
+
+    results = []
+    for query_path in sorted(query_dir.glob("*.sql")):
+        for source in ["mart", "rollup", "sample 1pct", "sample 0.1pct"]:
+            if source.startswith("sample"):
+                sample = source.split()[1]
+                loader = DataLoader(query_path, sample=sample)
+                source_path = loader._sample_path()
+                query_params = {**params, "sample_name": sample}
+            else:
+                loader = DataLoader(query_path, use_rollups=source == "rollup")
+                source_path = loader._query_path({})
+                query_params = params
+            if source_path is None or (
+                source == "rollup" and source_path == query_path
+            ):
+                continue
+
+            query = loader._build_query(source_path, filter_sql)
+            timings = []
+            for _ in range(repeat):
+                start_time = time.perf_counter()
+                df = FETCHERS[FETCH_MODE](query, query_params)
+                timings.append(time.perf_counter() - start_time)
+
+            results.append(
+                {
+                    "group": f"query ({source})",
+                    "name": query_path.name,
+                    "seconds": statistics.median(timings),
+                    "rows": len(df),
+                }
+            )
+
+    return results
+
+
+def compare(results, baseline_path):
+    with open(baseline_path) as f:
+        baseline = {
+            (row["group"], row["name"]): row["seconds"] for row in json.load(f)["results"]
+        }
+
+    print(f"\nComparison with {baseline_path}:")
+    print(f"{'Group':<22} {'Step':<28} {'Before':>10} {'After':>10} {'Change':>9}")
+    for row in results:
+        before = baseline.get((row["group"], row["name"]))
+        if before is None:
+            continue
+        change = (row["seconds"] - before) / before if before else 0
+        print(
+            f"{row['group']:<22} {row['name']:<28} {before:>9.2f}s "
+            f"{row['seconds']:>9.2f}s {change:>+8.1%}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline and dashboard")
+    parser.add_argument(
+        "--data-dir",
+        default="data/synthetic",
+        help="Raw files to load (default: data/synthetic, see generate-data.py)",
+    )
+    parser.add_argument(
+        "--generate",
+        type=int,
+        metavar="ROWS",
+        help="First generate a synthetic data set with this many transactions",
+    )
+    parser.add_argument("--label", default="run", help="Name recorded in the report")
+    parser.add_argument("--out", default="benchmarks", help="Report directory")
+    parser.add_argument("--compare", help="Earlier report to compare against")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per query")
+    parser.add_argument(
+        "--skip-pipeline",
+        action="store_true",
+        help="Only benchmark the refresh and the queries on the loaded database",
+    )
+
+    # Same loader options as load-data.py
+    parser.add_argument("--loader", choices=["copy", "to_sql"], default="copy")
+    parser.add_argument("--unlogged", action="store_true")
+    parser.add_argument("--defer-indexes", action="store_true")
+    parser.add_argument("--chunksize", type=int)
+    parser.add_argument("--memory-limit-mb", type=int)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--mart-table", action="store_true")
+    parser.add_argument("--clean-on-ingest", action="store_true")
+    parser.add_argument("--validate-on-ingest", action="store_true")
+    parser.add_argument("--partition-by-year", action="store_true")
+    parser.add_argument("--compact-mart", action="store_true")
+    parser.add_argument("--concurrent-indexes", action="store_true")
+    parser.add_argument("--maintenance-work-mem")
+    parser.add_argument("--parallel-maintenance-workers", type=int)
+    args = parser.parse_args()
+
+    DB_CONNECTION_STRING = os.getenv("DB_CONNECTION_STRING")
+    if not DB_CONNECTION_STRING:
+        print("Error: DB_CONNECTION_STRING not found in .env file.")
+        exit()
+
+    if args.generate:
+        generate_data = load_script("generate-data.py")
+        print(f"\nGenerating {args.generate:,} transactions in {args.data_dir}...")
+        generate_data.generate(args.data_dir, args.generate)
+
+    results = []
+    if not args.skip_pipeline:
+        results += bench_pipeline(DB_CONNECTION_STRING, args)
+    results += bench_refresh(DB_CONNECTION_STRING)
+    results += bench_queries(args.repeat)
+
+    data_dir = pathlib.Path(args.data_dir)
+    report = {
+        "label": args.label,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "host": platform.node(),
+        "python": platform.python_version(),
+        "options": vars(args),
+        "data_files": {
+            f.name: f.stat().st_size for f in sorted(data_dir.glob("*.*"))
+        },
+        "results": results,
+    }
+
+    out_dir = pathlib.Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    report_path = out_dir / f"{args.label}_{stamp}.json"
+    with open(report_path, "w") as f:
+        json.dump(report, f, indent=2, default=str)
+
+    print(f"\n{'Group':<22} {'Step':<28} {'Seconds':>10} {'Rows':>10}")
+    for row in results:
+        rows = f"{row['rows']:,}" if "rows" in row else ""
+        print(f"{row['group']:<22} {row['name']:<28} {row['seconds']:>9.2f}s {rows:>10}")
+    print(f"\nReport written to {report_path}")
+
+    if args.compare:
+        compare(results, args.compare)
@@ -0,0 +1,121 @@
+import pandas as pd
+
+# Cleaning rules applied to raw batches while they stream into Postgres.
+# They mirror the UPDATE / ALTER COLUMN logic in models/staging, so rows land
+# once, already typed, in the schemas defined in models/ingest. Incremental
+# deltas are always cleaned here, whichever way the full load was staged.
+
+
+# --- Column Rules ---
+def strip_currency(values):
+    # "$1,234.50" / "$ 1,234" -> 1234.50
+    cleaned = values.astype("string").str.replace(r"[$,\s]", "", regex=True)
+    return pd.to_numeric(cleaned, errors="coerce")
+
+
+def to_int(values):
+    # Nullable integers, so missing values render as NULL instead of "123.0"
+    return pd.to_numeric(values, errors="coerce").round().astype("Int64")
+
+
+def to_date(values):
+    return pd.to_datetime(values, errors="coerce").dt.date
+
+
+def extract_time(values):
+    # "2010-01-01 07:21:00" -> "07:21:00"
+    return pd.to_datetime(values, errors="coerce").dt.strftime("%H:%M:%S")
+
+
+def yes_no_to_bool(values, true_value="YES"):
+    # Case-insensitive flag; missing values stay NULL
+    flags = values.astype("string").str.strip().str.upper() == true_value.upper()
+    return flags.astype("boolean").where(values.notna())
+
+
+def month_year_to_date(values):
+    # "MM/YYYY" -> first day of that month
+    return pd.to_datetime(values, format="%m/%Y", errors="coerce").dt.date
+
+
+def mask_card_number(values):
+    # 4556123412341234 -> "4556-****-****-1234"
+    digits = values.astype("string").str.replace(r"\D", "", regex=True)
+    return digits.str[:4] + "-****-****-" + digits.str[-4:]
+
+
+# --- Table Rules ---
+def clean_transactions_data(df):
+    return pd.DataFrame(
+        {
+            "id": to_int(df["id"]),
+            "date": to_date(df["date"]),
+            "client_id": to_int(df["client_id"]),
+            "card_id": to_int(df["card_id"]),
+            "amount": strip_currency(df["amount"]).round(2),
+            "use_chip": df["use_chip"],
+            "merchant_id": to_int(df["merchant_id"]),
+            "merchant_city": df["merchant_city"],
+            "merchant_state": df["merchant_state"],
+            "zip": to_int(df["zip"]),
+            "mcc": to_int(df["mcc"]),
+            "errors": df["errors"],
+            "transaction_time": extract_time(df["date"]),
+        }
+    )
+
+
+def clean_users_data(df):
+    df = df.copy()
+    for column in ["per_capita_income", "yearly_income", "total_debt"]:
+        df[column] = to_int(strip_currency(df[column]))
+    for column in [
+        "id",
+        "current_age",
+        "retirement_age",
+        "birth_year",
+        "birth_month",
+        "credit_score",
+        "num_credit_cards",
+    ]:
+        df[column] = to_int(df[column])
+    return df
+
+
+def clean_cards_data(df):
+    df = df.copy()
+    df["credit_limit"] = strip_currency(df["credit_limit"]).round(2)
+    for column in ["id", "client_id", "num_cards_issued", "year_pin_last_changed"]:
+        df[column] = to_int(df[column])
+    for column in ["has_chip", "card_on_dark_web"]:
+        df[column] = yes_no_to_bool(df[column])
+
+    df["card_issued_date"] = month_year_to_date(df["acct_open_date"])
+    df["card_expiration_date"] = month_year_to_date(df["expires"])
+    df["card_number_masked"] = mask_card_number(df["card_number"])
+    return df.drop(columns=["acct_open_date", "expires", "card_number"])
+
+
+def clean_mcc_codes(df):
+    df = df.rename(columns={0: "category", "0": "category"})
+    df["mcc"] = to_int(df["mcc"])
+    return df
+
+
+def clean_train_fraud_labels(df):
+    return pd.DataFrame(
+        {
+            "id": to_int(df["id"]),
+            "is_fraud": yes_no_to_bool(df["is_fraud"], true_value="Yes"),
+        }
+    )
+
+
+# Raw table name -> batch cleaner
+CLEANERS = {
+    "transactions_data": clean_transactions_data,
+    "users_data": clean_users_data,
+    "cards_data": clean_cards_data,
+    "mcc_codes": clean_mcc_codes,
+    "train_fraud_labels": clean_train_fraud_labels,
+}
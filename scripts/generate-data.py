@@ -0,0 +1,278 @@
+import json
+import time
+import pathlib
+import argparse
+import numpy as np
+import pandas as pd
+
+# Synthetic stand-in for the Kaggle source files, with the same file names,
+# columns and raw formatting ("$-77.00" amounts, YES/NO flags, MM/YYYY dates,
+# {"target": {...}} labels), so every pipeline stage can be benchmarked at any
+# scale. Output is deterministic for a given --seed.
+
+# Rows generated and appended per block, to keep memory flat at large scales
+BLOCK_ROWS = 1_000_000
+
+MCC_CODES = {
+    "5411": "Grocery Stores, Supermarkets",
+    "5812": "Eating Places and Restaurants",
+    "5541": "Service Stations",
+    "5912": "Drug Stores and Pharmacies",
+    "5300": "Wholesale Clubs",
+    "4829": "Money Transfer",
+    "5499": "Miscellaneous Food Stores",
+    "4121": "Taxicabs and Limousines",
+    "5311": "Department Stores",
+    "4900": "Utilities - Electric, Gas, Water, Sanitary",
+    "5814": "Fast Food Restaurants",
+    "7538": "Automotive Service Shops",
+    "4814": "Telecommunication Services",
+    "5942": "Book Stores",
+    "7832": "Motion Picture Theaters",
+    "5732": "Electronics Stores",
+    "3001": "Airlines",
+    "7011": "Lodging - Hotels, Motels, Resorts",
+    "5651": "Family Clothing Stores",
+    "5815": "Digital Goods - Media, Books, Apps",
+}
+CITIES = [
+    ("Beulah", "ND", 58523),
+    ("La Verne", "CA", 91750),
+    ("Monterey Park", "CA", 91754),
+    ("Bronx", "NY", 10463),
+    ("Houston", "TX", 77002),
+    ("Chicago", "IL", 60601),
+    ("Miami", "FL", 33101),
+    ("Seattle", "WA", 98101),
+    ("Denver", "CO", 80202),
+    ("Atlanta", "GA", 30303),
+]
+USE_CHIP = ["Swipe Transaction", "Chip Transaction", "Online Transaction"]
+ERRORS = [
+    "Insufficient Balance",
+    "Bad PIN",
+    "Technical Glitch",
+    "Bad CVV",
+    "Bad Expiration",
+    "Bad Card Number",
+    "Bad Zipcode",
+]
+CARD_BRANDS = ["Visa", "Mastercard", "Amex", "Discover"]
+CARD_TYPES = ["Debit", "Credit", "Debit (Prepaid)"]
+
+
+def currency(values, decimals=0):
+    # 1234.5 -> "$1234.50", -77 -> "$-77.00", as in the source files
+    return pd.Series(values).map(lambda v: f"${v:.{decimals}f}")
+
+
+def month_year(rng, count, first_year, last_year):
+    # "MM/YYYY", as in the acct_open_date and expires columns
+    months = rng.integers(1, 13, count)
+    years = rng.integers(first_year, last_year + 1, count)
+    return [f"{m:02d}/{y}" for m, y in zip(months, years)]
+
+
+def generate_users(rng, count):
+    birth_year = rng.integers(1935, 2003, count)
+    yearly_income = rng.lognormal(10.8, 0.5, count).round().astype(int)
+
+    return pd.DataFrame(
+        {
+            "id": np.arange(count),
+            "current_age": 2020 - birth_year,
+            "retirement_age": rng.integers(60, 75, count),
+            "birth_year": birth_year,
+            "birth_month": rng.integers(1, 13, count),
+            "gender": rng.choice(["Female", "Male"], count),
+            "address": [f"{n} Main Street" for n in rng.integers(1, 9999, count)],
+            "latitude": rng.uniform(25, 48, count).round(2),
+            "longitude": rng.uniform(-122, -71, count).round(2),
+            "per_capita_income": currency((yearly_income * 0.5).round()),
+            "yearly_income": currency(yearly_income),
+            "total_debt": currency(rng.integers(0, 200000, count)),
+            "credit_score": rng.integers(480, 851, count),
+            "num_credit_cards": rng.integers(1, 9, count),
+        }
+    )
+
+
+def generate_cards(rng, users, cards_per_user):
+    count = len(users) * cards_per_user
+    numbers = rng.integers(4_000_000_000_000_000, 5_999_999_999_999_999, count)
+
+    return pd.DataFrame(
+        {
+            "id": np.arange(count),
+            "client_id": np.repeat(users["id"].to_numpy(), cards_per_user),
+            "card_brand": rng.choice(CARD_BRANDS, count, p=[0.55, 0.3, 0.1, 0.05]),
+            "card_type": rng.choice(CARD_TYPES, count, p=[0.6, 0.3, 0.1]),
+            "card_number": numbers,
+            "expires": month_year(rng, count, 2020, 2030),
+            "cvv": rng.integers(100, 1000, count),
+            "has_chip": rng.choice(["YES", "NO"], count, p=[0.9, 0.1]),
+            "num_cards_issued": rng.integers(1, 4, count),
+            "credit_limit": currency(rng.integers(0, 40000, count)),
+            "acct_open_date": month_year(rng, count, 1995, 2019),
+            "year_pin_last_changed": rng.integers(2002, 2021, count),
+            "card_on_dark_web": "No",
+        }
+    )
+
+
+def generate_transactions(rng, first_id, count, cards, start, end):
+    card_index = rng.integers(0, len(cards), count)
+    city_index = rng.integers(0, len(CITIES), count)
+    use_chip = rng.choice(USE_CHIP, count, p=[0.5, 0.38, 0.12])
+    online = use_chip == "Online Transaction"
+
+    # Timestamps (epoch seconds in [start, end)) sorted so ids follow time
+    seconds = np.sort(rng.integers(start, end, count))
+    dates = pd.to_datetime(seconds, unit="s").strftime("%Y-%m-%d %H:%M:%S")
+
+    amounts = rng.lognormal(3.5, 1.1, count).round(2)
+    amounts[rng.random(count) < 0.05] *= -1  # refunds
+    errors = np.where(rng.random(count) < 0.016, rng.choice(ERRORS, count), None)
+
+    cities = np.array([c[0] for c in CITIES], dtype=object)[city_index]
+    states = np.array([c[1] for c in CITIES], dtype=object)[city_index]
+    zips = np.array([c[2] for c in CITIES], dtype=float)[city_index]
+
+    return pd.DataFrame(
+        {
+            "id": np.arange(first_id, first_id + count),
+            "date": dates,
+            "client_id": cards["client_id"].to_numpy()[card_index],
+            "card_id": cards["id"].to_numpy()[card_index],
+            "amount": currency(amounts, 2),
+            "use_chip": use_chip,
+            "merchant_id": rng.integers(1, 100000, count),
+            "merchant_city": np.where(online, "ONLINE", cities),
+            "merchant_state": np.where(online, None, states),
+            "zip": np.where(online, np.nan, zips),
+            "mcc": rng.choice(np.array(list(MCC_CODES), dtype=int), count),
+            "errors": errors,
+        }
+    )
+
+
+def write_labels(f, ids, rng, fraud_rate, first):
+    # Members of {"target": {"<id>": "Yes" | "No", ...}} written incrementally
+    flags = np.where(rng.random(len(ids)) < fraud_rate, "Yes", "No")
+    members = ", ".join(f'"{i}": "{flag}"' for i, flag in zip(ids, flags))
+    if members:
+        f.write(members if first else ", " + members)
+    return first and not members
+
+
+def generate(
+    out_dir,
+    transactions,
+    users=2000,
+    cards_per_user=3,
+    start_year=2010,
+    end_year=2019,
+    labeled=0.67,
+    fraud_rate=0.0015,
+    seed=42,
+):
+    if users * cards_per_user > 32767:
+        raise ValueError("users x cards-per-user must fit SMALLINT card ids (<= 32767)")
+
+    out_dir = pathlib.Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+
+    users_df = generate_users(rng, users)
+    users_df.to_csv(out_dir / "users_data.csv", index=False)
+
+    cards_df = generate_cards(rng, users_df, cards_per_user)
+    cards_df.to_csv(out_dir / "cards_data.csv", index=False)
+
+    with open(out_dir / "mcc_codes.json", "w") as f:
+        json.dump(MCC_CODES, f)
+
+    start = pd.Timestamp(f"{start_year}-01-01").value // 10**9
+    end = pd.Timestamp(f"{end_year + 1}-01-01").value // 10**9
+    span = end - start
+
+    # Transactions and labels are appended block by block, each block drawing
+    # from its own seeded stream and covering its slice of the date range
+    with open(out_dir / "transactions_data.csv", "w", newline="") as tx_file, open(
+        out_dir / "train_fraud_labels.json", "w"
+    ) as label_file:
+        label_file.write('{"target": {')
+        first_label = True
+
+        for number, first_id in enumerate(range(0, transactions, BLOCK_ROWS)):
+            block_rng = np.random.default_rng([seed, number])
+            count = min(BLOCK_ROWS, transactions - first_id)
+
+            block = generate_transactions(
+                block_rng,
+                first_id,
+                count,
+                cards_df,
+                start + span * first_id // transactions,
+                start + span * (first_id + count) // transactions,
+            )
+            block.to_csv(tx_file, index=False, header=number == 0)
+
+            label_ids = block["id"].to_numpy()[block_rng.random(count) < labeled]
+            first_label = write_labels(
+                label_file, label_ids, block_rng, fraud_rate, first_label
+            )
+
+        label_file.write("}}")
+
+    return {
+        "transactions": transactions,
+        "users": users,
+        "cards": len(cards_df),
+        "mcc_codes": len(MCC_CODES),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic raw source files")
+    parser.add_argument(
+        "--out",
+        default="data/synthetic",
+        help="Output directory (default: data/synthetic)",
+    )
+    parser.add_argument("--transactions", type=int, default=1_000_000)
+    parser.add_argument(
+        "--users", type=int, default=2000, help="At most 32767 (SMALLINT ids)"
+    )
+    parser.add_argument("--cards-per-user", type=int, default=3)
+    parser.add_argument("--start-year", type=int, default=2010)
+    parser.add_argument("--end-year", type=int, default=2019)
+    parser.add_argument(
+        "--labeled",
+        type=float,
+        default=0.67,
+        help="Share of transactions with a fraud label",
+    )
+    parser.add_argument(
+        "--fraud-rate", type=float, default=0.0015, help="Share of labels that are fraud"
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"\nGenerating synthetic data in {args.out}...", end=" ", flush=True)
+    start_time = time.time()
+    counts = generate(
+        args.out,
+        args.transactions,
+        args.users,
+        args.cards_per_user,
+        args.start_year,
+        args.end_year,
+        args.labeled,
+        args.fraud_rate,
+        args.seed,
+    )
+    elapsed = time.time() - start_time
+    print(f"→ Success [{elapsed:.2f}s]")
+    for name, count in counts.items():
+        print(f"  - {name}: {count:,} Rows")
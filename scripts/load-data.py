@@ -1,29 +1,185 @@
+import io
 import os
 import json
+import hashlib
 import time
+import re
 import pathlib
+import argparse
+import functools
+import itertools
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import pandas as pd
 from sqlalchemy import create_engine, text
 from dotenv import load_dotenv
+from cleaning import CLEANERS
+from telemetry import Telemetry, submit_in_context
+from model_runner import ModelRunner
+from validation import LOAD_PHASES, REFERENCES, ReferentialValidator, write_rejects
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Rows rendered to CSV per block while streaming a COPY
+COPY_BLOCK_ROWS = 50000
+
+# Streaming reader settings
+SAMPLE_ROWS = 1000  # Rows sampled to estimate per-row memory
+MEMORY_OVERHEAD = 4  # Parsed batch + CSV render + driver buffers, per row
+JSON_BLOCK_CHARS = 1024 * 1024
+JSON_PAIR_PATTERN = re.compile(r'("(?:[^"\\]|\\.)*")\s*:\s*("(?:[^"\\]|\\.)*")')
+
+# Parallel load settings
+SHARD_MIN_BYTES = 64 * 1024 * 1024  # CSVs above this are split across workers
+SHARD_BATCH_ROWS = 100000
+
+# Incremental load settings
+HEAD_CHECKSUM_BYTES = 1024 * 1024
+# Append-only sources and the monotonically increasing key used as their watermark
+INCREMENTAL_SOURCES = {"transactions_data": "id"}
+# Sources whose rows change in place (a transaction is relabelled): when the
+# whole-file checksum changes, the full file is staged and its model applies
+# only the rows that differ
+MUTABLE_SOURCES = {"train_fraud_labels"}
+# Models that stage each source's delta table, in dependency order
+INCREMENTAL_MODELS = {
+    "transactions_data": "inc_01_stg_transactions_data.sql",
+    "train_fraud_labels": "inc_02_stg_train_fraud_labels.sql",
+}
+INCREMENTAL_MART_MODEL = "inc_03_enriched_transactions.sql"
+
+
+class CopyStream:
+    # File-like adapter that renders DataFrame batches to CSV lazily for COPY FROM STDIN
+    def __init__(self, frames):
+        self._blocks = (
+            frame.iloc[start : start + COPY_BLOCK_ROWS]
+            for frame in frames
+            for start in range(0, len(frame), COPY_BLOCK_ROWS)
+        )
+        self._current = io.StringIO()
+        self.rows = 0
+
+    def read(self, size=-1):
+        chunk = self._current.read(size)
+        while not chunk:
+            frame = next(self._blocks, None)
+            if frame is None:
+                return ""
+            self.rows += len(frame)
+            self._current = io.StringIO(frame.to_csv(index=False, header=False))
+            chunk = self._current.read(size)
+        return chunk
+
+
+class ByteRange(io.RawIOBase):
+    # Read-only view over [start, end) of a file so pandas can parse a single shard
+    def __init__(self, file_path, start, end):
+        self._file = open(file_path, "rb")
+        self._file.seek(start)
+        self._remaining = end - start
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        size = min(len(buffer), self._remaining)
+        if size <= 0:
+            return 0
+        data = self._file.read(size)
+        buffer[: len(data)] = data
+        self._remaining -= len(data)
+        return len(data)
+
+    def close(self):
+        self._file.close()
+        super().close()
+
 
 class RevenueOpsPipeline:
-    def __init__(self, db_connection_string):
+    def __init__(
+        self,
+        db_connection_string,
+        loader="copy",
+        unlogged=False,
+        defer_indexes=False,
+        chunksize=None,
+        memory_limit_mb=None,
+        workers=1,
+        mart_table=False,
+        clean_on_ingest=False,
+        partition_by_year=False,
+        compact_mart=False,
+        full_refresh=False,
+        concurrent_indexes=False,
+        maintenance_work_mem=None,
+        parallel_maintenance_workers=None,
+        validate_on_ingest=False,
+    ):
         self.db_url = db_connection_string
         self.engine = None
+        # Per-stage spans (rows, bytes, wall/CPU/client SQL time, peak RSS) as JSON lines
+        self.telemetry = Telemetry("pipeline")
+        # "copy" streams rows with COPY FROM STDIN, "to_sql" keeps the pandas INSERT path
+        self.loader = loader
+        self.unlogged = unlogged
+        self.defer_indexes = defer_indexes
+        # Either setting switches the reader to bounded-memory batches
+        self.chunksize = chunksize
+        self.memory_limit_mb = memory_limit_mb
+        self.workers = workers
+        # Build the mart as a plain table so incremental loads can patch it
+        self.mart_table = mart_table
+        # Clean and type rows while loading (scripts/cleaning.py) instead of UPDATE staging
+        self.clean_on_ingest = clean_on_ingest or validate_on_ingest
+        # Check foreign keys while loading (scripts/validation.py), quarantining
+        # orphans and unparseable rows; validation needs the cleaned, typed keys
+        self.validate_on_ingest = validate_on_ingest
+        self.validator = None
+        # Range-partition transactions_data and the (table) mart by year
+        self.partition_by_year = partition_by_year
+        # Store the mart's low-cardinality labels as enums (implies the table mart)
+        self.compact_mart = compact_mart
+        # Rerun every SQL model instead of skipping those whose inputs are unchanged
+        self.full_refresh = full_refresh
+        # Build indexes with CREATE INDEX CONCURRENTLY and add FKs NOT VALID, then
+        # VALIDATE them, so the tables stay readable and writable meanwhile
+        self.concurrent_indexes = concurrent_indexes
+        # Server settings for the index and constraint builds
+        self.index_settings = {}
+        if maintenance_work_mem:
+            self.index_settings["maintenance_work_mem"] = maintenance_work_mem
+        if parallel_maintenance_workers is not None:
+            self.index_settings["max_parallel_maintenance_workers"] = (
+                parallel_maintenance_workers
+            )
         self.paths = {
             "raw": pathlib.Path("data/raw"),
             "staging": pathlib.Path("models/staging"),
+            "staging_clean": pathlib.Path("models/staging_clean"),
+            "ingest": pathlib.Path("models/ingest"),
             "indexing": pathlib.Path("models/indexing"),
+            "indexing_concurrent": pathlib.Path("models/indexing_concurrent"),
+            "indexing_validated": pathlib.Path("models/indexing_validated"),
+            "validation": pathlib.Path("models/validation"),
             "intermediate": pathlib.Path("models/intermediate"),
+            "intermediate_table": pathlib.Path("models/intermediate_table"),
+            "intermediate_compact": pathlib.Path("models/intermediate_compact"),
+            "incremental": pathlib.Path("models/incremental"),
+            "partitioning": pathlib.Path("models/partitioning"),
+            "rollups": pathlib.Path("models/rollups"),
+            "samples": pathlib.Path("models/samples"),
+            "scoring": pathlib.Path("models/scoring"),
+            "cache": pathlib.Path("models/cache"),
+            "refresh_incremental": pathlib.Path("models/refresh_incremental"),
+            "intermediate_partitioned": pathlib.Path("models/intermediate_partitioned"),
         }
 
     def connect(self):
         print(f"\nConnecting to Database...")
-        self.engine = create_engine(self.db_url)
+        # One pooled connection per load worker
+        self.engine = create_engine(self.db_url, pool_size=max(5, self.workers))
+        self.telemetry.instrument(self.engine)
         print("Connection Established.\n")
 
     def _read_file_to_df(self, file_path):
@@ -47,92 +203,660 @@ def _read_file_to_df(self, file_path):
                 return pd.read_json(file_path)
         return None
 
-    def load_raw_data(self):
-        # Ingest raw files from data/raw into Postgres
-        print("\nStarting Raw Data Load...")
+    def _drop_indexes(self, connection, table_name):
+        # Drop secondary indexes on a table and return their definitions for rebuild
+        rows = connection.execute(
+            text(
+                """
+                SELECT i.indexname, i.indexdef
+                FROM pg_indexes AS i
+                WHERE i.schemaname = current_schema()
+                  AND i.tablename = :table_name
+                  AND NOT EXISTS (
+                      SELECT 1 FROM pg_constraint AS c WHERE c.conname = i.indexname
+                  )
+                """
+            ),
+            {"table_name": table_name},
+        ).fetchall()
 
-        total_rows = 0  # Row counter
+        for index_name, _ in rows:
+            connection.execute(text(f'DROP INDEX IF EXISTS "{index_name}"'))
+        return [index_def for _, index_def in rows]
 
-        for file_path in sorted(self.paths["raw"].glob("*.*")):
-            if file_path.name.startswith("."):
+    def _batch_rows(self, file_path):
+        # Rows per batch: explicit chunksize, or derived from the memory ceiling
+        if self.chunksize:
+            return self.chunksize
+
+        if file_path.suffix == ".csv":
+            sample = pd.read_csv(file_path, nrows=SAMPLE_ROWS)
+        else:
+            pairs = next(self._iter_json_pairs(file_path, SAMPLE_ROWS), [])
+            sample = pd.DataFrame(pairs)
+
+        if sample.empty:
+            return SAMPLE_ROWS
+
+        row_bytes = sample.memory_usage(deep=True, index=False).sum() / len(sample)
+        budget = self.memory_limit_mb * 1024 * 1024
+        return max(1000, int(budget / (row_bytes * MEMORY_OVERHEAD)))
+
+    def _iter_json_pairs(self, file_path, batch_size):
+        # Incrementally scan flat {"key": "value"} members, yielding lists of pairs
+        pairs = []
+        tail = ""
+
+        with open(file_path) as f:
+            while True:
+                block = f.read(JSON_BLOCK_CHARS)
+                buffer = tail + block
+                consumed = 0
+
+                for match in JSON_PAIR_PATTERN.finditer(buffer):
+                    key, value = json.loads(f"[{match.group(1)}, {match.group(2)}]")
+                    pairs.append((key, value))
+                    consumed = match.end()
+
+                    if len(pairs) >= batch_size:
+                        yield pairs
+                        pairs = []
+
+                tail = buffer[consumed:]
+                if not block:
+                    break
+
+        if pairs:
+            yield pairs
+
+    def _stream_batch_rows(self, file_path):
+        # Batch size for paths that always stream, even without a configured ceiling
+        if self.chunksize or self.memory_limit_mb:
+            return self._batch_rows(file_path)
+        return SHARD_BATCH_ROWS
+
+    def _iter_file_batches(self, file_path, stream=None):
+        # Yield DataFrame batches; whole files unless a chunksize or memory ceiling is set
+        if stream is None:
+            stream = bool(self.chunksize or self.memory_limit_mb)
+
+        if not stream:
+            df = self._read_file_to_df(file_path)
+            if df is not None:
+                yield df
+            return
+
+        batch_rows = self._stream_batch_rows(file_path)
+
+        if file_path.suffix == ".csv":
+            yield from pd.read_csv(file_path, chunksize=batch_rows)
+        elif file_path.name == "mcc_codes.json":
+            for pairs in self._iter_json_pairs(file_path, batch_rows):
+                yield pd.DataFrame(pairs, columns=["mcc", "0"])
+        elif file_path.name.lower() == "train_fraud_labels.json":
+            for pairs in self._iter_json_pairs(file_path, batch_rows):
+                yield pd.DataFrame(pairs, columns=["id", "is_fraud"])
+        elif file_path.suffix == ".json":
+            yield pd.read_json(file_path)
+
+    def _conform_batch(self, df, dtypes):
+        # Keep later batches on the column types chosen from the first batch
+        for column, dtype in dtypes.items():
+            if column not in df.columns or df[column].dtype == dtype:
                 continue
+            if dtype.kind in "iu":
+                df[column] = df[column].astype("Int64")
+            elif dtype.kind == "f":
+                df[column] = df[column].astype("float64")
+            elif dtype.kind == "O":
+                df[column] = df[column].astype(object)
+        return df
+
+    def _csv_body_start(self, file_path):
+        # Byte offset of the first data row (just past the header line)
+        with open(file_path, "rb") as f:
+            f.readline()
+            return f.tell()
+
+    def _csv_shards(self, file_path, count):
+        # Split a CSV body into byte ranges that start and end on line boundaries
+        # (assumes no quoted field spans a newline, which holds for the raw exports)
+        size = file_path.stat().st_size
+        body_start = self._csv_body_start(file_path)
+        with open(file_path, "rb") as f:
+            offsets = [body_start]
+
+            for i in range(1, count):
+                f.seek(max(body_start + (size - body_start) * i // count, offsets[-1]))
+                f.readline()
+                offsets.append(min(f.tell(), size))
+
+        offsets.append(size)
+        return [(a, b) for a, b in zip(offsets, offsets[1:]) if b > a]
+
+    def _iter_csv_range(self, file_path, start, end, columns, batch_rows):
+        # Parse one byte range of a CSV in batches
+        reader = io.BufferedReader(ByteRange(file_path, start, end))
+        try:
+            yield from pd.read_csv(
+                reader, names=columns, header=None, chunksize=batch_rows
+            )
+        finally:
+            reader.close()
+
+    def _prepare_table(self, first, table_name, if_exists, source=None):
+        # Create the target table from a batch schema; returns the definitions of the
+        # secondary indexes dropped before a reload or an append, to rebuild after it.
+        # A delta table (source set) takes the column types of the table it feeds.
+        index_defs = []
+
+        with self.engine.connect() as connection:
+            if self.defer_indexes:
+                index_defs = self._drop_indexes(connection, table_name)
+            if if_exists == "replace":
+                # CASCADE so a dependent mart does not block the reload; run_data_mart rebuilds it
+                connection.execute(text(f'DROP TABLE IF EXISTS "{table_name}" CASCADE'))
+
+            ddl_file = self.paths["ingest"] / f"{table_name}.sql"
+            if self._cleans(table_name) and if_exists == "replace" and ddl_file.exists():
+                # Cleaned batches land directly in the final typed schema
+                with open(ddl_file, "r") as f:
+                    connection.execute(text(f.read()))
+            elif source is not None and if_exists == "replace":
+                connection.execute(
+                    text(f'CREATE TABLE "{table_name}" (LIKE "{source}")')
+                )
+            else:
+                # Let pandas derive the column types from an empty frame
+                first.head(0).to_sql(
+                    table_name, connection, if_exists="append", index=False
+                )
+
+            if self.unlogged and if_exists == "replace":
+                # Switched back by _set_logged once staging is done
+                connection.execute(text(f'ALTER TABLE "{table_name}" SET UNLOGGED'))
+            connection.commit()
+
+        return index_defs
+
+    def _restore_indexes(self, index_defs):
+        with self.engine.connect() as connection:
+            for index_def in index_defs:
+                connection.execute(text(index_def))
+            connection.commit()
+
+    def _copy_batches(self, batches, table_name, if_exists="replace", source=None):
+        # Bulk load DataFrame batches through a single COPY FROM STDIN
+        first = next(batches)
+        stream = CopyStream(itertools.chain([first], batches))
+        index_defs = self._prepare_table(first, table_name, if_exists, source)
+
+        columns = ", ".join(f'"{column}"' for column in first.columns)
+        raw_connection = self.engine.raw_connection()
+        try:
+            cursor = raw_connection.cursor()
+            cursor.copy_expert(
+                f'COPY "{table_name}" ({columns}) FROM STDIN WITH (FORMAT csv)',
+                stream,
+            )
+            cursor.close()
+            raw_connection.commit()
+        except Exception:
+            raw_connection.rollback()
+            raise
+        finally:
+            raw_connection.close()
+
+        if index_defs:
+            self._restore_indexes(index_defs)
+
+        return stream.rows
+
+    def _pin_dtypes(self, df):
+        # Columns that are empty in the first batch stay TEXT so later values still fit
+        for column in df.columns[df.isna().all().values]:
+            df[column] = df[column].astype(object)
+        return df.dtypes
+
+    def _cleans(self, table_name):
+        return self.clean_on_ingest and table_name in CLEANERS
+
+    def _clean_batch(self, df, table_name):
+        # Apply the clean-on-ingest rules for this table, if enabled
+        if self._cleans(table_name):
+            return CLEANERS[table_name](df)
+        return df
+
+    def _validate_batch(self, df, table_name):
+        # Clean the batch, then quarantine the rows that fail validation
+        clean = self._clean_batch(df, table_name)
+        if self.validator is None:
+            return clean
+
+        accepted, rejects = self.validator.validate(table_name, df, clean)
+        if rejects is not None:
+            write_rejects(self.engine, rejects)
+        return accepted
+
+    def _write_batches(
+        self, batches, table_name, if_exists="replace", dtypes=None, source=None
+    ):
+        # Feed batches to the configured loader and return the number of rows written.
+        # source names the raw table whose rules clean a delta table's batches.
+        if source is None:
+            batches = (self._validate_batch(df, table_name) for df in batches)
+        else:
+            batches = (CLEANERS[source](df) for df in batches)
+        first = next(batches, None)
+        if first is None:
+            return None
+
+        if dtypes is None:
+            dtypes = self._pin_dtypes(first)
+        else:
+            first = self._conform_batch(first, dtypes)
+
+        conformed = itertools.chain(
+            [first], (self._conform_batch(df, dtypes) for df in batches)
+        )
+
+        if self.loader == "copy":
+            return self._copy_batches(conformed, table_name, if_exists, source)
+
+        # Typed schema when cleaning, unlogged and deferred indexes as for COPY
+        index_defs = self._prepare_table(first, table_name, if_exists, source)
 
+        rows = 0
+        for df in conformed:
+            df.to_sql(
+                table_name,
+                self.engine,
+                if_exists="append",
+                index=False,
+                method="multi",
+                chunksize=5000,
+            )
+            rows += len(df)
+
+        if index_defs:
+            self._restore_indexes(index_defs)
+        return rows
+
+    def _run_load_task(self, label, load, size):
+        # Worker body: run one table or shard load on its own pooled connection
+        print(f"  [{label}] started", flush=True)
+        start_time = time.time()
+        try:
+            with self.telemetry.span("load", label) as span:
+                rows = load() or 0
+                span.rows, span.bytes = rows, size
+            elapsed = time.time() - start_time
+            rate = rows / elapsed if elapsed else 0
+            print(
+                f"  [{label}] → {rows:,} Rows [{elapsed:.2f}s, {rate:,.0f} rows/s]",
+                flush=True,
+            )
+            return rows, elapsed, None
+        except Exception as e:
+            elapsed = time.time() - start_time
+            print(f"  [{label}] Failed → {e} [{elapsed:.2f}s]", flush=True)
+            return 0, elapsed, e
+
+    def _shard_tasks(self, file_path, table_name, deferred):
+        # Recreate the table from a cleaned sample, then one append task per byte range.
+        # Shards are parsed with the raw header and cleaned by _write_batches, like
+        # the sequential path, since a cleaner may rename, drop or reorder columns.
+        tasks = []
+        raw = pd.read_csv(file_path, nrows=SAMPLE_ROWS)
+        sample = self._clean_batch(raw, table_name)
+        dtypes = self._pin_dtypes(sample)
+        deferred[table_name] = self._prepare_table(sample, table_name, "replace")
+
+        batch_rows = self._stream_batch_rows(file_path)
+        shards = self._csv_shards(file_path, self.workers)
+
+        for number, (start, end) in enumerate(shards, start=1):
+            batches = self._iter_csv_range(
+                file_path, start, end, list(raw.columns), batch_rows
+            )
+            tasks.append(
+                (
+                    table_name,
+                    f"{table_name} shard {number}/{len(shards)}",
+                    functools.partial(
+                        self._write_batches,
+                        batches,
+                        table_name,
+                        if_exists="append",
+                        dtypes=dtypes,
+                    ),
+                    end - start,
+                )
+            )
+        return tasks
+
+    def _load_parallel(self, files):
+        # Load independent files concurrently; large CSVs are split into byte-range shards
+        tasks = []
+        summary = {}
+        # Indexes dropped before a sharded reload, rebuilt once every shard is in
+        deferred = {}
+
+        for file_path in files:
+            table_name = file_path.stem.lower()
+
+            if (
+                file_path.suffix == ".csv"
+                and file_path.stat().st_size >= SHARD_MIN_BYTES
+            ):
+                try:
+                    tasks += self._shard_tasks(file_path, table_name, deferred)
+                except Exception as e:
+                    # Same handling as a failed shard: report it, load the other tables
+                    print(f"  [{table_name}] Failed → {e}", flush=True)
+                    summary[table_name] = {
+                        "rows": 0,
+                        "tasks": 1,
+                        "busy": 0.0,
+                        "failed": 1,
+                    }
+            else:
+                batches = self._iter_file_batches(file_path)
+                tasks.append(
+                    (
+                        table_name,
+                        table_name,
+                        functools.partial(self._write_batches, batches, table_name),
+                        file_path.stat().st_size,
+                    )
+                )
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {
+                submit_in_context(
+                    executor, self._run_load_task, label, load, size
+                ): table_name
+                for table_name, label, load, size in tasks
+            }
+            for future in as_completed(futures):
+                rows, elapsed, error = future.result()
+                table = summary.setdefault(
+                    futures[future], {"rows": 0, "tasks": 0, "busy": 0.0, "failed": 0}
+                )
+                table["rows"] += rows
+                table["tasks"] += 1
+                table["busy"] += elapsed
+                table["failed"] += error is not None
+
+        for index_defs in deferred.values():
+            if index_defs:
+                self._restore_indexes(index_defs)
+
+        return summary
+
+    def _load_sequential(self, files):
+        # Load files one at a time; returns (rows loaded, tables that failed)
+        total_rows = 0
+        failed = set()
+
+        for file_path in files:
             table_name = file_path.stem.lower()
             print(f"Loading {file_path.name}", end=" ", flush=True)
 
             try:
                 start_time = time.time()
 
-                df = self._read_file_to_df(file_path)
+                with self.telemetry.span("load", table_name) as span:
+                    rows = self._write_batches(
+                        self._iter_file_batches(file_path), table_name
+                    )
+                    span.rows, span.bytes = rows, file_path.stat().st_size
 
-                if df is None:
+                if rows is None:
                     print("Skipped (Unsupported Format)")
                     continue
 
-                df.to_sql(
-                    table_name,
-                    self.engine,
-                    if_exists="replace",
-                    index=False,
-                    method="multi",
-                    chunksize=5000,
-                )
-
                 end_time = time.time()
                 elapsed = end_time - start_time
-                rows = len(df)
                 total_rows += rows
+                rate = rows / elapsed if elapsed else 0
 
-                print(f"→ {table_name} ({rows:,} Rows) [{elapsed:.2f}s]")
+                print(
+                    f"→ {table_name} ({rows:,} Rows) [{elapsed:.2f}s, {rate:,.0f} rows/s]"
+                )
 
             except Exception as e:
                 print(f"Failed → {e}")
-        print(f"Done. Total Rows Loaded: {total_rows:,}\n")
+                failed.add(table_name)
 
-    def run_staging_models(self):
-        # Executes SQL files stored in models/staging
-        print("\nRunning SQL models (Staging)...")
+        return total_rows, failed
+
+    def _load_phases(self, files):
+        # Validated loads run dimensions, then transactions, then labels, so every
+        # key set is complete before the rows that reference it are checked
+        if self.validator is None:
+            return [files]
 
-        sql_files = sorted(list(pathlib.Path("models/staging").glob("*.sql")))
+        phases = [
+            [f for f in files if f.stem.lower() in tables] for tables in LOAD_PHASES
+        ]
+        ordered = {f for phase in phases for f in phase}
+        phases.append([f for f in files if f not in ordered])
+        return [phase for phase in phases if phase]
 
+    def _expire_validation(self):
+        # Rows appended while any foreign key is missing were checked by neither
+        # the loader nor Postgres, so the earlier validation no longer holds
         with self.engine.connect() as connection:
-            for sql_file in sql_files:
-                file_name = sql_file.name
+            if not connection.execute(
+                text("SELECT to_regclass('ingest_validations')")
+            ).scalar():
+                return
+            connection.execute(
+                text(
+                    """
+                    DELETE FROM ingest_validations
+                    WHERE (
+                        SELECT COUNT(*) FROM pg_constraint
+                        WHERE conname IN (
+                            'fk_client', 'fk_card', 'fk_mcc', 'fk_transaction_fraud'
+                        )
+                    ) < 4
+                    """
+                )
+            )
+            connection.commit()
 
-                print(f"Applying model: {file_name}...", end=" ", flush=True)
+    def _prepare_validation(self, tables):
+        # Rejects and certificates of other tables stay; the reloaded tables'
+        # rows are replaced by this run's
+        self.validator = ReferentialValidator(self.telemetry.run_id)
+        with self.engine.connect() as connection:
+            with open(self.paths["validation"] / "ingest_rejects.sql", "r") as f:
+                connection.execute(text(f.read()))
+            connection.execute(
+                text("DELETE FROM ingest_rejects WHERE source_table = ANY(:tables)"),
+                {"tables": tables},
+            )
+            connection.execute(
+                text("DELETE FROM ingest_validations WHERE table_name = ANY(:tables)"),
+                {"tables": tables},
+            )
+            connection.commit()
 
-                try:
-                    start_time = time.time()
+    def _record_validation(self, loaded, failed):
+        # Certify the validated tables that loaded completely in this run
+        validator, self.validator = self.validator, None
+        certified = [t for t in REFERENCES if t in loaded and t not in failed]
 
-                    with open(sql_file, "r") as f:
-                        query = f.read()
+        with self.engine.connect() as connection:
+            for table_name in certified:
+                accepted, rejected = validator.counts[table_name]
+                connection.execute(
+                    text(
+                        """
+                        INSERT INTO ingest_validations (
+                            table_name, rows_accepted, rows_rejected, validated_at,
+                            run_id
+                        )
+                        VALUES (:table_name, :accepted, :rejected, NOW(), :run_id)
+                        """
+                    ),
+                    {
+                        "table_name": table_name,
+                        "accepted": accepted,
+                        "rejected": rejected,
+                        "run_id": validator.run_id,
+                    },
+                )
+            connection.commit()
 
-                    connection.execute(text(query))
-                    connection.commit()
-                    end_time = time.time()
-                    elapsed = end_time - start_time
-                    print(f"→ Success [{elapsed:.2f}s]")
+        print("Validation Summary:")
+        for table_name in certified:
+            accepted, rejected = validator.counts[table_name]
+            print(
+                f"  - {table_name}: {accepted:,} Rows accepted, "
+                f"{rejected:,} quarantined in ingest_rejects"
+            )
 
-                except Exception as e:
-                    end_time = time.time()
-                    elapsed = end_time - start_time
-                    print(f"Failed → {e} [{elapsed:.2f}s]")
-                    connection.rollback()
-                    return
+    def load_raw_data(self):
+        # Ingest raw files from data/raw into Postgres
+        print("\nStarting Raw Data Load...")
 
-        print("\nStaging complete.")
+        total_rows = 0  # Row counter
 
-    def run_index_models(self):
-        # Executes SQL files stored in models/indexing
-        print("\nRunning SQL models (Indexing)...")
+        files = [
+            file_path
+            for file_path in sorted(self.paths["raw"].glob("*.*"))
+            if not file_path.name.startswith(".")
+        ]
+        tables = sorted({f.stem.lower() for f in files})
 
-        sql_files = sorted(list(pathlib.Path("models/indexing").glob("*.sql")))
+        # A full reload supersedes any incremental watermarks and queues, and the
+        # validations of the tables it replaces
+        with self.engine.connect() as connection:
+            connection.execute(text("DROP TABLE IF EXISTS ingest_watermarks"))
+            connection.execute(text("DROP TABLE IF EXISTS mart_pending_changes"))
+            connection.execute(text("DROP TABLE IF EXISTS risk_pending_transactions"))
+            if not self.validate_on_ingest and connection.execute(
+                text("SELECT to_regclass('ingest_validations')")
+            ).scalar():
+                connection.execute(
+                    text(
+                        "DELETE FROM ingest_validations WHERE table_name = ANY(:tables)"
+                    ),
+                    {"tables": tables},
+                )
+            connection.commit()
+
+        # Replaced transactions were never queued for scoring; rescore them all
+        if "transactions_data" in tables:
+            self._reset_scoring()
+
+        if self.validate_on_ingest:
+            self._prepare_validation(tables)
+
+        summary = {}
+        failed = set()
+        if self.workers > 1:
+            print(f"Using {self.workers} workers")
+        run_start = time.time()
+
+        for phase in self._load_phases(files):
+            if self.validator is not None:
+                self.validator.prepare(self.engine, [f.stem.lower() for f in phase])
+
+            if self.workers > 1:
+                summary.update(self._load_parallel(phase))
+            else:
+                rows, phase_failed = self._load_sequential(phase)
+                total_rows += rows
+                failed |= phase_failed
+
+        wall = time.time() - run_start
+
+        if self.workers > 1:
+            print("\nLoad Summary:")
+            for table_name, table in sorted(summary.items()):
+                status = f", {table['failed']} failed" if table["failed"] else ""
+                print(
+                    f"  - {table_name}: {table['rows']:,} Rows "
+                    f"({table['tasks']} task(s){status}) [{table['busy']:.2f}s busy]"
+                )
+                total_rows += table["rows"]
+                if table["failed"]:
+                    failed.add(table_name)
+
+        if self.validator is not None:
+            self._record_validation(set(tables), failed)
+
+        if self.workers > 1:
+            rate = total_rows / wall if wall else 0
+            print(
+                f"Done. Total Rows Loaded: {total_rows:,} [{wall:.2f}s, {rate:,.0f} rows/s]\n"
+            )
+        else:
+            print(f"Done. Total Rows Loaded: {total_rows:,}\n")
+
+    def _head_checksum(self, file_path):
+        # Fingerprint of the first block; stays the same while a source only grows by appends
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            digest.update(f.read(HEAD_CHECKSUM_BYTES))
+        return digest.hexdigest()
+
+    def _file_checksum(self, file_path):
+        # Fingerprint of the whole file, for sources that change anywhere in place
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(HEAD_CHECKSUM_BYTES), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _delta_batches(self, file_path, offset, watermark, state):
+        """
+        Returns (batches, bytes read) of a changed source's delta: every row of a
+        mutable source, else the rows past the watermark. offset is where the
+        last run stopped reading a CSV whose head is unchanged (None otherwise);
+        only the bytes appended after it are parsed.
+        """
+        table_name = file_path.stem.lower()
+        size = file_path.stat().st_size
+        if table_name in MUTABLE_SOURCES:
+            return self._iter_file_batches(file_path, stream=True), size
+
+        if file_path.suffix == ".csv":
+            resume = offset is not None and 0 < offset < size
+            start = offset if resume else self._csv_body_start(file_path)
+            columns = list(pd.read_csv(file_path, nrows=0).columns)
+            batches = self._iter_csv_range(
+                file_path, start, size, columns, self._stream_batch_rows(file_path)
+            )
+            read_bytes = size - start
+        else:
+            batches = self._iter_file_batches(file_path, stream=True)
+            read_bytes = size
+
+        column = INCREMENTAL_SOURCES[table_name]
+        return self._iter_new_rows(batches, column, watermark, state), read_bytes
+
+    def _iter_new_rows(self, batches, column, watermark, state):
+        # Keep rows past the watermark and track the new high-water mark
+        for df in batches:
+            keys = pd.to_numeric(df[column])
+            new_rows = df[keys > watermark]
+            if new_rows.empty:
+                continue
+            state["watermark"] = max(state["watermark"], int(keys.max()))
+            yield new_rows
+
+    def _apply_incremental_models(self, tables):
+        # Stage the loaded deltas, then patch the mart and rollups for the queued transaction ids
+        sql_files = [self.paths["incremental"] / INCREMENTAL_MODELS[t] for t in tables]
 
         with self.engine.connect() as connection:
             for sql_file in sql_files:
-                file_name = sql_file.name
-
-                print(f"Applying model: {file_name}...", end=" ", flush=True)
+                print(f"Applying model: {sql_file.name}...", end=" ", flush=True)
 
                 try:
                     start_time = time.time()
@@ -140,20 +864,433 @@ def run_index_models(self):
                     with open(sql_file, "r") as f:
                         query = f.read()
 
-                    connection.execute(text(query))
-                    connection.commit()
-                    end_time = time.time()
-                    elapsed = end_time - start_time
+                    with self.telemetry.span("incremental", sql_file.name):
+                        connection.execute(text(query))
+                        connection.commit()
+                    elapsed = time.time() - start_time
                     print(f"→ Success [{elapsed:.2f}s]")
 
                 except Exception as e:
-                    end_time = time.time()
-                    elapsed = end_time - start_time
+                    elapsed = time.time() - start_time
                     print(f"Failed → {e} [{elapsed:.2f}s]")
                     connection.rollback()
-                    return
+                    return False
+
+            mart_is_view, has_rollups, has_samples = connection.execute(
+                text(
+                    """
+                    SELECT
+                        EXISTS (
+                            SELECT 1 FROM pg_matviews
+                            WHERE matviewname = 'enriched_transactions'
+                        ),
+                        to_regclass('rollup_transactions') IS NOT NULL,
+                        to_regclass('sample_transactions') IS NOT NULL
+                    """
+                )
+            ).one()
 
-        print("\nIndexing complete.")
+            if mart_is_view:
+                # A materialized view cannot be patched; build with --mart-table for delta-only upkeep
+                print(
+                    "Refreshing enriched_transactions (materialized view, full refresh)...",
+                    end=" ",
+                    flush=True,
+                )
+                start_time = time.time()
+                with self.telemetry.span("incremental", "refresh enriched_transactions"):
+                    connection.execute(
+                        text("REFRESH MATERIALIZED VIEW CONCURRENTLY enriched_transactions")
+                    )
+                    connection.execute(text("TRUNCATE mart_pending_changes"))
+                    connection.commit()
+                print(f"→ Success [{time.time() - start_time:.2f}s]")
+
+                label_files = []
+                mart_files = []
+                if has_rollups:
+                    mart_files += sorted(list(self.paths["rollups"].glob("*.sql")))
+                if has_samples:
+                    mart_files += sorted(list(self.paths["samples"].glob("*.sql")))
+                steps = [(sql_file, {}) for sql_file in mart_files]
+            else:
+                # A compact mart's new labels are committed before the rows using them
+                label_files = [
+                    self.paths["refresh_incremental"] / "sync_labels_pending.sql"
+                ]
+                range_files = []
+                if has_rollups:
+                    range_files.append(
+                        self.paths["refresh_incremental"] / "refresh_rollups_range.sql"
+                    )
+                if has_samples:
+                    range_files.append(
+                        self.paths["refresh_incremental"] / "refresh_samples_range.sql"
+                    )
+                # Rollups and samples are rebuilt only for the dates that have
+                # changes, in the mart's transaction so they agree
+                folder = self.paths["refresh_incremental"]
+                with open(folder / "pending_date_ranges.sql", "r") as f:
+                    ranges = [
+                        dict(row._mapping) for row in connection.execute(text(f.read()))
+                    ]
+                steps = [(self.paths["incremental"] / INCREMENTAL_MART_MODEL, {})]
+                steps += [(f, params) for params in ranges for f in range_files]
+
+            # Expire cached dashboard results along with the patched rows
+            steps.append((self.paths["cache"] / "refresh_generation.sql", {}))
+            files = label_files + [sql_file for sql_file, _ in steps]
+            names = list(dict.fromkeys(f.name for f in files))
+
+            print(f"Applying model: {', '.join(names)}...", end=" ", flush=True)
+            try:
+                start_time = time.time()
+                with self.telemetry.span("incremental", "mart", models=names):
+                    for sql_file in label_files:
+                        with open(sql_file, "r") as f:
+                            connection.execute(text(f.read()))
+                        connection.commit()
+                    for sql_file, params in steps:
+                        with open(sql_file, "r") as f:
+                            connection.execute(text(f.read()), params)
+                    connection.commit()
+                print(f"→ Success [{time.time() - start_time:.2f}s]")
+
+            except Exception as e:
+                print(f"Failed → {e} [{time.time() - start_time:.2f}s]")
+                connection.rollback()
+                return False
+
+        return True
+
+    def load_incremental(self):
+        # Append only rows past each source's watermark, then stage and publish that delta
+        print("\nStarting Incremental Load...")
+
+        with self.engine.connect() as connection:
+            for sql_file in [
+                self.paths["incremental"] / "ingest_ledger.sql",
+                self.paths["incremental"] / "mart_labels.sql",
+                self.paths["partitioning"] / "part_00_year_partitions.sql",
+            ]:
+                with open(sql_file, "r") as f:
+                    connection.execute(text(f.read()))
+            connection.commit()
+            ledger = {
+                row.source_name: row
+                for row in connection.execute(text("SELECT * FROM ingest_watermarks"))
+            }
+
+        updates = []
+        loaded_tables = []
+        total_rows = 0
+
+        for file_path in sorted(self.paths["raw"].glob("*.*")):
+            if file_path.name.startswith("."):
+                continue
+
+            table_name = file_path.stem.lower()
+            column = INCREMENTAL_SOURCES.get(table_name)
+            mutable = table_name in MUTABLE_SOURCES
+            entry = ledger.get(file_path.name)
+            size = file_path.stat().st_size
+            # Mutable sources are fingerprinted whole, so any relabel shows up
+            if mutable:
+                checksum = self._file_checksum(file_path)
+            else:
+                checksum = self._head_checksum(file_path)
+            same_head = entry is not None and entry.head_checksum == checksum
+
+            if same_head and entry.file_offset == size:
+                print(f"  - {file_path.name}: up to date")
+                continue
+
+            record = {
+                "source_name": file_path.name,
+                "watermark_column": column,
+                "watermark_value": None,
+                "file_offset": size,
+                "head_checksum": checksum,
+                "rows_loaded": 0,
+            }
+
+            if column is None and not mutable:
+                if entry is None:
+                    print(f"  - {file_path.name}: baseline recorded")
+                    updates.append(record)
+                else:
+                    print(
+                        f"  - {file_path.name}: changed, dimension sources need a full load (Option 2)"
+                    )
+                continue
+
+            try:
+                watermark = entry.watermark_value if entry is not None else None
+                if entry is None and not mutable:
+                    with self.engine.connect() as connection:
+                        watermark = connection.execute(
+                            text(f'SELECT COALESCE(MAX("{column}"), 0) FROM {table_name}')
+                        ).scalar()
+
+                print(f"Loading {file_path.name} delta", end=" ", flush=True)
+                start_time = time.time()
+
+                state = {"watermark": watermark}
+                offset = entry.file_offset if same_head else None
+                batches, read_bytes = self._delta_batches(
+                    file_path, offset, watermark, state
+                )
+                with self.telemetry.span("incremental", f"{table_name}_delta") as span:
+                    # Deltas are cleaned by the clean-on-ingest rules whatever the
+                    # load mode, then applied as they are by models/incremental
+                    rows = self._write_batches(
+                        batches, f"{table_name}_delta", source=table_name
+                    )
+                    span.rows, span.bytes = rows, read_bytes
+                elapsed = time.time() - start_time
+
+                rows = rows or 0
+                record["watermark_value"] = state["watermark"]
+                record["rows_loaded"] = rows
+                updates.append(record)
+                total_rows += rows
+                if rows:
+                    loaded_tables.append(table_name)
+
+                print(f"→ {table_name}_delta ({rows:,} Rows) [{elapsed:.2f}s]")
+
+            except Exception as e:
+                print(f"Failed → {e}")
+                return
+
+        if loaded_tables and not self._apply_incremental_models(loaded_tables):
+            print("\nIncremental load stopped; watermarks left unchanged.")
+            return
+        if loaded_tables:
+            self._expire_validation()
+
+        with self.engine.connect() as connection:
+            for record in updates:
+                connection.execute(
+                    text(
+                        """
+                        INSERT INTO ingest_watermarks (
+                            source_name, watermark_column, watermark_value,
+                            file_offset, head_checksum, rows_loaded, updated_at
+                        )
+                        VALUES (
+                            :source_name, :watermark_column, :watermark_value,
+                            :file_offset, :head_checksum, :rows_loaded, NOW()
+                        )
+                        ON CONFLICT (source_name) DO UPDATE SET
+                            watermark_column = EXCLUDED.watermark_column,
+                            watermark_value = EXCLUDED.watermark_value,
+                            file_offset = EXCLUDED.file_offset,
+                            head_checksum = EXCLUDED.head_checksum,
+                            rows_loaded = EXCLUDED.rows_loaded,
+                            updated_at = EXCLUDED.updated_at
+                        """
+                    ),
+                    record,
+                )
+            connection.commit()
+
+        print(f"Done. Total New Rows: {total_rows:,}\n")
+
+        # Keep an existing risk_score current with the new transactions
+        if "transactions_data" in loaded_tables:
+            with self.engine.connect() as connection:
+                scored = connection.execute(
+                    text("SELECT to_regclass('risk_score')")
+                ).scalar()
+            if scored:
+                self.run_scoring_models()
+
+    def _staging_files(self):
+        staging_folder = "staging_clean" if self.clean_on_ingest else "staging"
+        sql_files = sorted(list(self.paths[staging_folder].glob("*.sql")))
+
+        if self.partition_by_year:
+            # Rebuild the staged fact table partitioned by year
+            sql_files += sorted(list(self.paths["partitioning"].glob("*.sql")))
+        return sql_files
+
+    def _scoring_files(self):
+        return sorted(list(self.paths["scoring"].glob("*.sql")))
+
+    def _index_files(self):
+        # CREATE INDEX CONCURRENTLY is not supported on partitioned tables
+        if self.concurrent_indexes and not self.partition_by_year:
+            folder = "indexing_concurrent"
+        else:
+            folder = "indexing"
+        models = {f.name: f for f in self.paths[folder].glob("*.sql")}
+
+        # After a validated load the foreign keys skip the validating scan
+        # (NOT VALID foreign keys are not supported on partitioned tables)
+        if not self.partition_by_year and self._load_is_validated():
+            models.update(
+                {f.name: f for f in self.paths["indexing_validated"].glob("*.sql")}
+            )
+            models.pop("opt_03_validate_foreign_keys.sql", None)
+
+        return [models[name] for name in sorted(models)]
+
+    def _load_is_validated(self):
+        # Whether ingest_validations certifies every table the foreign keys check
+        with self.engine.connect() as connection:
+            if not connection.execute(
+                text("SELECT to_regclass('ingest_validations')")
+            ).scalar():
+                return False
+            validated = set(
+                connection.execute(
+                    text("SELECT table_name FROM ingest_validations")
+                ).scalars()
+            )
+        return set(REFERENCES) <= validated
+
+    def _drop_invalid_indexes(self):
+        # A failed CREATE INDEX CONCURRENTLY leaves an INVALID index behind, which
+        # IF NOT EXISTS would then keep; drop them so the rerun rebuilds them
+        with self.engine.connect() as connection:
+            connection = connection.execution_options(isolation_level="AUTOCOMMIT")
+            invalid = connection.execute(
+                text(
+                    """
+                    SELECT c.relname
+                    FROM pg_index AS i
+                    JOIN pg_class AS c ON c.oid = i.indexrelid
+                    WHERE NOT i.indisvalid
+                      AND c.relnamespace = to_regnamespace(current_schema())
+                    """
+                )
+            ).scalars()
+            for index_name in list(invalid):
+                print(f"  - Dropping invalid index {index_name}.")
+                connection.execute(
+                    text(f'DROP INDEX CONCURRENTLY IF EXISTS "{index_name}"')
+                )
+
+    def _mart_files(self):
+        if self.partition_by_year or self.mart_table or self.compact_mart:
+            # Table-mode models, with same-named compact and partitioned models
+            # taking their place
+            models = {f.name: f for f in self.paths["intermediate_table"].glob("*.sql")}
+            sql_files = []
+            overrides = []
+            if self.compact_mart:
+                overrides.append("intermediate_compact")
+                sql_files.append(self.paths["incremental"] / "mart_labels.sql")
+            if self.partition_by_year:
+                overrides.append("intermediate_partitioned")
+                sql_files.append(
+                    self.paths["partitioning"] / "part_00_year_partitions.sql"
+                )
+            for folder in overrides:
+                models.update({f.name: f for f in self.paths[folder].glob("*.sql")})
+            sql_files += [models[name] for name in sorted(models)]
+        else:
+            sql_files = sorted(list(self.paths["intermediate"].glob("*.sql")))
+
+        # Dashboard rollups and samples are rebuilt with every mart build, then
+        # cached results expire
+        sql_files += sorted(list(self.paths["rollups"].glob("*.sql")))
+        sql_files += sorted(list(self.paths["samples"].glob("*.sql")))
+        sql_files.append(self.paths["cache"] / "refresh_generation.sql")
+        return sql_files
+
+    def _run_models(self, sql_files, stage, label):
+        # Dependency-ordered, parallel across workers, skipping unchanged models
+        runner = ModelRunner(
+            self.engine,
+            self.workers,
+            self.telemetry,
+            self.full_refresh,
+            self.index_settings,
+        )
+        ok = runner.run(sql_files, stage=stage, label=label)
+        self._print_timings(runner.timings)
+        return ok
+
+    def _print_timings(self, timings):
+        # Per-model run time grouped by file, so the blocking and concurrent
+        # index paths can be compared
+        if not timings:
+            return
+
+        by_file = {}
+        for name, seconds in timings.items():
+            by_file.setdefault(name.split("#")[0], []).append(seconds)
+
+        print(f"\n{'Model':<40} {'Runs':>5} {'Total':>10} {'Longest':>10}")
+        for file_name, seconds in by_file.items():
+            print(
+                f"{file_name:<40} {len(seconds):>5} {sum(seconds):>9.2f}s "
+                f"{max(seconds):>9.2f}s"
+            )
+
+    def _set_logged(self):
+        # --unlogged only covers the load and staging; the raw tables the mart reads
+        # are made crash-safe and replicated again once staging has run
+        raw_tables = {
+            f.stem.lower()
+            for f in self.paths["raw"].glob("*.*")
+            if not f.name.startswith(".")
+        }
+        with self.engine.connect() as connection:
+            unlogged = set(
+                connection.execute(
+                    text(
+                        """
+                        SELECT relname FROM pg_class
+                        WHERE relpersistence = 'u' AND relkind IN ('r', 'p')
+                          AND relnamespace = to_regnamespace(current_schema())
+                        """
+                    )
+                ).scalars()
+            ) & raw_tables
+            if not unlogged:
+                return
+
+            # Referenced tables first: a logged table cannot reference an unlogged one
+            ordered = [t for phase in LOAD_PHASES for t in phase if t in unlogged]
+            ordered += sorted(unlogged - set(ordered))
+
+            print("Setting raw tables LOGGED...", end=" ", flush=True)
+            start_time = time.time()
+            with self.telemetry.span("stage", "set logged", tables=ordered):
+                for table_name in ordered:
+                    connection.execute(text(f'ALTER TABLE "{table_name}" SET LOGGED'))
+                connection.commit()
+            print(f"→ {len(ordered)} table(s) [{time.time() - start_time:.2f}s]")
+
+    def run_staging_models(self):
+        # Executes SQL files stored in models/staging
+        print("\nRunning SQL models (Staging)...")
+
+        ok = self._run_models(self._staging_files(), "stage", "Applying model")
+        self._set_logged()
+        if ok:
+            print("\nStaging complete.")
+
+    def run_index_models(self):
+        # Executes SQL files stored in models/indexing (or models/indexing_concurrent)
+        print("\nRunning SQL models (Indexing)...")
+
+        if self.concurrent_indexes:
+            if self.partition_by_year:
+                print("Partitioned tables cannot be indexed CONCURRENTLY; blocking.")
+            else:
+                self._drop_invalid_indexes()
+
+        start_time = time.time()
+        ok = self._run_models(self._index_files(), "index", "Applying model")
+        elapsed = time.time() - start_time
+
+        if ok:
+            mode = "concurrent" if self.concurrent_indexes else "blocking"
+            print(f"\nIndexing complete ({mode}) [{elapsed:.2f}s].")
 
     def drop_foreign_keys(self):
         print("\nDropping Foreign Key Constraints...")
@@ -179,8 +1316,9 @@ def drop_foreign_keys(self):
                         DROP CONSTRAINT IF EXISTS {constraint};
                     """
                     )
-                    connection.execute(query)
-                    connection.commit()
+                    with self.telemetry.span("index", f"drop {constraint}"):
+                        connection.execute(query)
+                        connection.commit()
                     print(f"  - Dropped {constraint}.")
                 except Exception as e:
                     print(f"  - Failed to drop {constraint}: {e}")
@@ -190,44 +1328,182 @@ def drop_foreign_keys(self):
     def run_data_mart(self):
         print("\nCreating Data Mart for Querying...")
 
-        sql_files = sorted(list(pathlib.Path("models/intermediate").glob("*.sql")))
+        if self._run_models(self._mart_files(), "mart", "Creating Mart"):
+            self._print_mart_size()
+            print("\nData Mart creation complete.")
 
+    def _print_mart_size(self):
+        # Heap and index sizes, e.g. to compare the default and compact layouts
         with self.engine.connect() as connection:
-            for sql_file in sql_files:
-                file_name = sql_file.name
+            heap, indexes = connection.execute(
+                text(
+                    """
+                    SELECT
+                        COALESCE(SUM(pg_table_size(c.oid)), 0),
+                        COALESCE(SUM(pg_indexes_size(c.oid)), 0)
+                    FROM pg_class AS c
+                    WHERE c.relname = 'enriched_transactions'
+                       OR c.oid IN (
+                           SELECT inhrelid FROM pg_inherits
+                           WHERE inhparent = to_regclass('enriched_transactions')
+                       )
+                    """
+                )
+            ).one()
+        print(
+            f"\nMart size: {heap / 1024**2:,.1f} MB heap, "
+            f"{indexes / 1024**2:,.1f} MB indexes"
+        )
 
-                print(f"Creating Mart: {file_name}...", end=" ", flush=True)
+    def _reset_scoring(self):
+        # Scoring is incremental; drop its tables so the next run scores the whole mart
+        with self.engine.connect() as connection:
+            connection.execute(
+                text(
+                    "DROP TABLE IF EXISTS risk_score, risk_client_merchants, "
+                    "risk_zip_locations"
+                )
+            )
+            connection.commit()
 
-                try:
-                    start_time = time.time()
+    def run_scoring_models(self):
+        # Velocity features and risk_score for mart transactions not yet scored
+        print("\nRunning SQL models (Scoring)...")
 
-                    with open(sql_file, "r") as f:
-                        query = f.read()
+        if self.full_refresh:
+            self._reset_scoring()
 
-                    connection.execute(text(query))
-                    connection.commit()
-                    end_time = time.time()
-                    elapsed = end_time - start_time
-                    print(f"→ Success [{elapsed:.2f}s]")
+        if self._run_models(self._scoring_files(), "score", "Scoring"):
+            print("\nScoring complete.")
 
-                except Exception as e:
-                    end_time = time.time()
-                    elapsed = end_time - start_time
-                    print(f"Failed → {e} [{elapsed:.2f}s]")
-                    connection.rollback()
-                    return
+    def run_all_models(self):
+        # Staging, mart and index models as one graph, so e.g. the dimension
+        # indexes build while the mart is still being created
+        print("\nRunning SQL models (Staging → Mart → Scoring → Indexing)...")
+
+        if self.concurrent_indexes and not self.partition_by_year:
+            self._drop_invalid_indexes()
+        if self.full_refresh:
+            self._reset_scoring()
 
-        print("\nData Mart creation complete.")
+        sql_files = (
+            self._staging_files()
+            + self._mart_files()
+            + self._scoring_files()
+            + self._index_files()
+        )
+        ok = self._run_models(sql_files, "model", "Applying model")
+        self._set_logged()
+        if ok:
+            self._print_mart_size()
+            print("\nAll models complete.")
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Revenue Ops ELT pipeline")
+    parser.add_argument(
+        "--loader",
+        choices=["copy", "to_sql"],
+        default="copy",
+        help="Raw load engine: COPY FROM STDIN (default) or pandas to_sql INSERTs",
+    )
+    parser.add_argument(
+        "--unlogged",
+        action="store_true",
+        help="Create raw tables as UNLOGGED (faster, not crash-safe)",
+    )
+    parser.add_argument(
+        "--defer-indexes",
+        action="store_true",
+        help="Drop secondary indexes before appending and rebuild them afterwards",
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        help="Stream raw files in batches of this many rows",
+    )
+    parser.add_argument(
+        "--memory-limit-mb",
+        type=int,
+        help="Stream raw files in batches sized to stay under this memory ceiling",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Load raw files concurrently, sharding large CSVs across N workers",
+    )
+    parser.add_argument(
+        "--mart-table",
+        action="store_true",
+        help="Build enriched_transactions as a table that incremental loads patch in place",
+    )
+    parser.add_argument(
+        "--clean-on-ingest",
+        action="store_true",
+        help="Clean and type rows while loading; staging then only adds primary keys",
+    )
+    parser.add_argument(
+        "--validate-on-ingest",
+        action="store_true",
+        help="Check foreign keys while loading and quarantine rejected rows "
+        "(implies --clean-on-ingest)",
+    )
+    parser.add_argument(
+        "--partition-by-year",
+        action="store_true",
+        help="Partition transactions_data and the enriched_transactions table by year",
+    )
+    parser.add_argument(
+        "--compact-mart",
+        action="store_true",
+        help="Store the mart's low-cardinality labels as enums (implies --mart-table)",
+    )
+    parser.add_argument(
+        "--full-refresh",
+        action="store_true",
+        help="Rerun every SQL model, even those whose SQL and inputs are unchanged",
+    )
+    parser.add_argument(
+        "--concurrent-indexes",
+        action="store_true",
+        help="Build indexes CONCURRENTLY and add foreign keys NOT VALID, then validate",
+    )
+    parser.add_argument(
+        "--maintenance-work-mem",
+        help="maintenance_work_mem for index and constraint builds (e.g. 1GB)",
+    )
+    parser.add_argument(
+        "--parallel-maintenance-workers",
+        type=int,
+        help="max_parallel_maintenance_workers for each index build",
+    )
+    args = parser.parse_args()
+
     DB_CONNECTION_STRING = os.getenv("DB_CONNECTION_STRING")
     run = "Y"
 
     if not DB_CONNECTION_STRING:
         raise ValueError("Error: DB_CONNECTION_STRING Not Found in .env File")
 
-    pipeline = RevenueOpsPipeline(DB_CONNECTION_STRING)
+    pipeline = RevenueOpsPipeline(
+        DB_CONNECTION_STRING,
+        loader=args.loader,
+        unlogged=args.unlogged,
+        defer_indexes=args.defer_indexes,
+        chunksize=args.chunksize,
+        memory_limit_mb=args.memory_limit_mb,
+        workers=args.workers,
+        mart_table=args.mart_table,
+        clean_on_ingest=args.clean_on_ingest,
+        partition_by_year=args.partition_by_year,
+        compact_mart=args.compact_mart,
+        full_refresh=args.full_refresh,
+        concurrent_indexes=args.concurrent_indexes,
+        maintenance_work_mem=args.maintenance_work_mem,
+        parallel_maintenance_workers=args.parallel_maintenance_workers,
+        validate_on_ingest=args.validate_on_ingest,
+    )
 
     # Establish Connection:
     pipeline.connect()
@@ -236,30 +1512,32 @@ def run_data_mart(self):
         while run.upper() == "Y":
 
             answer = input(
-                "Please Select Action:\n1. Drop Foreign Keys\n2. Load Raw Data\n3. Run Staging Models\n4. Run Index Models\n5. Create Data Mart\n6. Run All Scripts\n"
+                "Please Select Action:\n1. Drop Foreign Keys\n2. Load Raw Data\n3. Run Staging Models\n4. Run Index Models\n5. Create Data Mart\n6. Run All Scripts\n7. Incremental Load\n8. Score Transactions\n"
             )
 
-            VALID_CHOICE = ["1", "2", "3", "4", "5", "6"]
+            # Menu choice -> (telemetry stage, step) pairs, each timed as one span
+            ACTIONS = {
+                "1": [("index", pipeline.drop_foreign_keys)],
+                "2": [("load", pipeline.load_raw_data)],
+                "3": [("stage", pipeline.run_staging_models)],
+                "4": [("index", pipeline.run_index_models)],
+                "5": [("mart", pipeline.run_data_mart)],
+                "6": [
+                    ("index", pipeline.drop_foreign_keys),
+                    ("load", pipeline.load_raw_data),
+                    ("model", pipeline.run_all_models),
+                ],
+                "7": [("incremental", pipeline.load_incremental)],
+                "8": [("score", pipeline.run_scoring_models)],
+            }
 
-            if answer not in VALID_CHOICE:
-                print("\nInvalid Selection. Please enter a number between 1 and 6.")
+            if answer not in ACTIONS:
+                print("\nInvalid Selection. Please enter a number between 1 and 8.")
                 continue
-            elif answer == "1":
-                pipeline.drop_foreign_keys()
-            elif answer == "2":
-                pipeline.load_raw_data()
-            elif answer == "3":
-                pipeline.run_staging_models()
-            elif answer == "4":
-                pipeline.run_index_models()
-            elif answer == "5":
-                pipeline.run_data_mart()
-            elif answer == "6":
-                pipeline.drop_foreign_keys()
-                pipeline.load_raw_data()
-                pipeline.run_staging_models()
-                pipeline.run_data_mart()
-                pipeline.run_index_models()
+
+            for stage, step in ACTIONS[answer]:
+                with pipeline.telemetry.span(stage, step.__name__):
+                    step()
 
             run = input("Would you like to run another script?(Y/N): ")
 
@@ -0,0 +1,340 @@
+import re
+import time
+import fnmatch
+import hashlib
+import pathlib
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from sqlalchemy import text
+from telemetry import submit_in_context
+
+# Dependency-aware runner for the SQL model folders. The files of a run keep
+# their listed order as the tie-breaker, but a model only waits for the earlier
+# models it actually depends on, so independent models run in parallel on
+# separate pooled connections.
+#
+# Dependencies are inferred from the SQL: a model depends on an earlier model
+# that writes a relation it mentions, or that reads a relation it modifies.
+# Files made only of CREATE INDEX statements are split into one node per index.
+# Plain index builds on the same table do not order each other (their SHARE
+# locks are compatible). CREATE INDEX CONCURRENTLY takes SHARE UPDATE EXCLUSIVE,
+# which conflicts with itself, so concurrent builds on one table run one after
+# another and only builds on different tables run in parallel.
+# Extra edges can be declared with a header comment:
+#     -- depends_on: stg_transactions_data.sql, rollup_*.sql   ("*" = all earlier)
+#
+# CREATE INDEX CONCURRENTLY cannot run inside a transaction, so models that use
+# it run on an autocommit connection (one statement per node, as above).
+#
+# Each successful model is recorded in model_runs with a fingerprint of its SQL,
+# its upstream fingerprints and the versions of the tables it reads, so a rerun
+# skips unchanged models and resumes from whichever node failed.
+
+MODEL_RUNS_SQL = pathlib.Path("models/runner/model_runs.sql")
+
+IDENT = r'"?(\w+)"?'
+CREATED_PATTERNS = [
+    rf"\bcreate\s+(?:or\s+replace\s+)?(?:unlogged\s+)?(?:materialized\s+)?"
+    rf"(?:table|view|function)\s+(?:if\s+not\s+exists\s+)?{IDENT}",
+    rf"\bdrop\s+(?:materialized\s+)?(?:table|view|function)\s+(?:if\s+exists\s+)?{IDENT}",
+    rf"\brename\s+to\s+{IDENT}",
+]
+MODIFIED_PATTERNS = [
+    rf"\bupdate\s+(?!set\b){IDENT}",
+    rf"\balter\s+table\s+(?:if\s+exists\s+)?(?:only\s+)?{IDENT}",
+    rf"\binsert\s+into\s+{IDENT}",
+    rf"\bdelete\s+from\s+{IDENT}",
+    rf"\btruncate\s+(?:table\s+)?{IDENT}",
+    rf"\brefresh\s+materialized\s+view\s+(?:concurrently\s+)?{IDENT}",
+]
+INDEX_PATTERN = (
+    rf"\bcreate\s+(?:unique\s+)?index\s+(?:concurrently\s+)?(?:if\s+not\s+exists\s+)?"
+    rf"(?:\w+\s+)?on\s+(?:only\s+)?{IDENT}"
+)
+DEPENDS_ON_PATTERN = re.compile(
+    r"^\s*--\s*depends_on:\s*(.+)$", re.MULTILINE | re.IGNORECASE
+)
+COMMENT_PATTERN = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+
+
+def _matches(patterns, sql):
+    return {m.group(1) for p in patterns for m in re.finditer(p, sql)}
+
+
+class ModelNode:
+    def __init__(self, name, sql, declared=()):
+        self.name = name
+        self.sql = sql
+        self.declared = list(declared)
+
+        body = COMMENT_PATTERN.sub(" ", sql).lower()
+        self.refs = set(re.findall(r"\w+", body))
+        self.created = _matches(CREATED_PATTERNS, body)
+        self.modified = _matches(MODIFIED_PATTERNS, body)
+        self.indexed = _matches([INDEX_PATTERN], body)
+        self.writes = self.created | self.modified
+        self.concurrent = bool(re.search(r"\bindex\s+concurrently\b", body))
+
+        self.deps = []
+        self.fingerprint = None
+
+
+def _split_index_file(name, sql):
+    # A file of nothing but CREATE INDEX statements becomes one node per index
+    statements = [
+        s.strip() for s in COMMENT_PATTERN.sub("", sql).split(";") if s.strip()
+    ]
+    if len(statements) < 2:
+        return None
+    if not all(re.match(INDEX_PATTERN, s, re.IGNORECASE) for s in statements):
+        return None
+    return [
+        ModelNode(f"{name}#{number}", statement + ";")
+        for number, statement in enumerate(statements, start=1)
+    ]
+
+
+def build_graph(sql_files):
+    """
+    Returns the model nodes for sql_files, in order, with .deps filled in from
+    the inferred and declared dependencies.
+    """
+    nodes = []
+    for sql_file in sql_files:
+        sql_file = pathlib.Path(sql_file)
+        with open(sql_file, "r") as f:
+            sql = f.read()
+
+        declared = [
+            pattern.strip()
+            for line in DEPENDS_ON_PATTERN.findall(sql)
+            for pattern in line.split(",")
+            if pattern.strip()
+        ]
+        nodes += _split_index_file(sql_file.name, sql) or [
+            ModelNode(sql_file.name, sql, declared)
+        ]
+
+    for position, node in enumerate(nodes):
+        for earlier in nodes[:position]:
+            file_name = earlier.name.split("#")[0]
+            if (
+                earlier.writes & node.refs
+                or earlier.refs & node.writes
+                or earlier.indexed & node.writes
+                or (
+                    earlier.concurrent
+                    and node.concurrent
+                    and earlier.indexed & node.indexed
+                )
+                or any(fnmatch.fnmatch(file_name, p) for p in node.declared)
+            ):
+                node.deps.append(earlier)
+
+    return nodes
+
+
+class ModelRunner:
+    def __init__(
+        self, engine, workers=1, telemetry=None, full_refresh=False, settings=None
+    ):
+        self.engine = engine
+        self.workers = max(1, workers)
+        self.telemetry = telemetry
+        self.full_refresh = full_refresh
+        # Server settings applied around every model, e.g. maintenance_work_mem
+        self.settings = settings or {}
+        # Model -> seconds, for the models executed by the last run
+        self.timings = {}
+
+    def _source_versions(self, connection):
+        # Table -> oid (changes when a full load recreates it) and, for sources
+        # loaded incrementally, the ingest watermark or, for sources changed in
+        # place, the file checksum (either changes with every delta)
+        versions = {
+            name: [oid]
+            for name, oid in connection.execute(
+                text(
+                    """
+                    SELECT relname, oid :: BIGINT
+                    FROM pg_class
+                    WHERE relnamespace = to_regnamespace(current_schema())
+                      AND relkind IN ('r', 'p', 'v', 'm')
+                    """
+                )
+            )
+        }
+
+        if connection.execute(text("SELECT to_regclass('ingest_watermarks')")).scalar():
+            for source_name, watermark in connection.execute(
+                text(
+                    "SELECT source_name, COALESCE(watermark_value :: TEXT, "
+                    "head_checksum) FROM ingest_watermarks"
+                )
+            ):
+                table_name = pathlib.Path(source_name).stem.lower()
+                if table_name in versions:
+                    versions[table_name].append(watermark)
+
+        # The mart and its rollups are also patched in place (incremental loads,
+        # refreshes); every such change bumps the refresh generation
+        if connection.execute(text("SELECT to_regclass('refresh_generation')")).scalar():
+            generation = connection.execute(
+                text("SELECT generation FROM refresh_generation WHERE id = 1")
+            ).scalar()
+            for table_name in ["enriched_transactions", "rollup_transactions"]:
+                if table_name in versions:
+                    versions[table_name].append(generation)
+
+        return versions
+
+    def _fingerprint(self, node, versions):
+        upstream = set()
+        for dep in node.deps:
+            upstream |= dep.writes
+
+        sources = []
+        for name in sorted(node.refs & versions.keys()):
+            # Relations built upstream or rebuilt here are covered by the SQL itself
+            if name in upstream or name in node.created:
+                continue
+            # An in-place transform depends on which load it transforms; a reader
+            # depends on the current contents
+            version = versions[name][:1] if name in node.modified else versions[name]
+            sources.append((name, version))
+
+        payload = repr(
+            (node.sql, [dep.fingerprint for dep in node.deps], sources)
+        ).encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()
+
+    def _execute(self, connection, node):
+        if node.concurrent:
+            connection = connection.execution_options(isolation_level="AUTOCOMMIT")
+
+        # Transaction-local settings, or session settings reset afterwards
+        # when autocommit leaves no transaction to scope them to
+        for name, value in self.settings.items():
+            connection.execute(
+                text("SELECT set_config(:name, :value, :is_local)"),
+                {"name": name, "value": str(value), "is_local": not node.concurrent},
+            )
+        try:
+            connection.execute(text(node.sql))
+            connection.commit()
+        finally:
+            if node.concurrent:
+                for name in self.settings:
+                    connection.execute(text(f"RESET {name}"))
+
+    def _run_node(self, node, stage):
+        start_time = time.time()
+        try:
+            with self.engine.connect() as connection:
+                if self.telemetry is not None:
+                    with self.telemetry.span(stage, node.name):
+                        self._execute(connection, node)
+                else:
+                    self._execute(connection, node)
+            return time.time() - start_time, None
+        except Exception as e:
+            return time.time() - start_time, e
+
+    def _record(self, node, status, elapsed, error=None):
+        with self.engine.connect() as connection:
+            connection.execute(
+                text(
+                    """
+                    INSERT INTO model_runs (
+                        model, fingerprint, status, duration_s, error, finished_at
+                    )
+                    VALUES (:model, :fingerprint, :status, :duration_s, :error, NOW())
+                    ON CONFLICT (model) DO UPDATE SET
+                        fingerprint = EXCLUDED.fingerprint,
+                        status = EXCLUDED.status,
+                        duration_s = EXCLUDED.duration_s,
+                        error = EXCLUDED.error,
+                        finished_at = EXCLUDED.finished_at
+                    """
+                ),
+                {
+                    "model": node.name,
+                    "fingerprint": node.fingerprint,
+                    "status": status,
+                    "duration_s": elapsed,
+                    "error": str(error) if error else None,
+                },
+            )
+            connection.commit()
+
+    def run(self, sql_files, stage="model", label="Applying model"):
+        """
+        Runs the models in sql_files as a dependency graph. Returns True when
+        every model succeeded or was skipped as unchanged.
+        """
+        nodes = build_graph(sql_files)
+        self.timings = {}
+
+        with self.engine.connect() as connection:
+            with open(MODEL_RUNS_SQL, "r") as f:
+                connection.execute(text(f.read()))
+            connection.commit()
+
+            versions = self._source_versions(connection)
+            previous = {
+                model: (fingerprint, status)
+                for model, fingerprint, status in connection.execute(
+                    text("SELECT model, fingerprint, status FROM model_runs")
+                )
+            }
+
+        for node in nodes:
+            node.fingerprint = self._fingerprint(node, versions)
+
+        done, failed = set(), set()
+        pending = list(nodes)
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while pending or running:
+                for node in list(pending):
+                    if any(dep.name in failed for dep in node.deps):
+                        print(f"{label}: {node.name}... Blocked → upstream failure")
+                        failed.add(node.name)
+                        pending.remove(node)
+                    elif all(dep.name in done for dep in node.deps):
+                        pending.remove(node)
+                        if (
+                            not self.full_refresh
+                            and previous.get(node.name) == (node.fingerprint, "success")
+                        ):
+                            print(f"{label}: {node.name}... Skipped (unchanged)")
+                            done.add(node.name)
+                            continue
+                        future = submit_in_context(
+                            executor, self._run_node, node, stage
+                        )
+                        running[future] = node
+
+                if not running:
+                    continue
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    node = running.pop(future)
+                    elapsed, error = future.result()
+                    self.timings[node.name] = elapsed
+
+                    if error is None:
+                        print(f"{label}: {node.name}... → Success [{elapsed:.2f}s]")
+                        self._record(node, "success", elapsed)
+                        done.add(node.name)
+                    else:
+                        print(
+                            f"{label}: {node.name}... Failed → {error} [{elapsed:.2f}s]"
+                        )
+                        self._record(node, "failed", elapsed, error)
+                        failed.add(node.name)
+
+        if failed:
+            print(f"\n{len(failed)} model(s) failed or blocked; rerun to resume from them.")
+        return not failed
@@ -1,8 +1,12 @@
 import os
+import sys
 import time
 import pathlib
+import argparse
+from datetime import date, timedelta
 from sqlalchemy import create_engine, text
 from dotenv import load_dotenv
+from telemetry import Telemetry
 
 # Load environment variables from .env file
 load_dotenv()
@@ -13,16 +17,30 @@ class RefreshViews:
     def __init__(self, db_connection_string):
         self.db_url = db_connection_string
         self.engine = None
-        self.paths = {"refresh": pathlib.Path("models/refresh")}
+        self.telemetry = Telemetry("refresh")
+        self.paths = {
+            "refresh": pathlib.Path("models/refresh"),
+            "refresh_incremental": pathlib.Path("models/refresh_incremental"),
+            "incremental": pathlib.Path("models/incremental"),
+            "partitioning": pathlib.Path("models/partitioning"),
+            "rollups": pathlib.Path("models/rollups"),
+            "samples": pathlib.Path("models/samples"),
+            "cache": pathlib.Path("models/cache"),
+            "queries": pathlib.Path("models/queries"),
+            "dashboard": pathlib.Path("dashboard"),
+        }
 
     def connect(self):
         print(f"\nConnecting to Database...")
         self.engine = create_engine(self.db_url)
+        self.telemetry.instrument(self.engine)
         print("Connection Established.\n")
 
     def refreshView(self):
+        # Returns whether every refresh script succeeded
         print("\nStarting Materialized View Refresh...")
         sql_files = sorted(list(self.paths["refresh"].glob("*.sql")))
+        failed = []
 
         with self.engine.connect() as connection:
             for sql_file in sql_files:
@@ -37,8 +55,9 @@ def refreshView(self):
                         query = f.read()
 
                     # Execute the SQL
-                    connection.execute(text(query))
-                    connection.commit()  # Commit the successful operation
+                    with self.telemetry.span("refresh", file_name):
+                        connection.execute(text(query))
+                        connection.commit()  # Commit the successful operation
 
                     end_time = time.time()
                     elapsed = end_time - start_time
@@ -49,12 +68,300 @@ def refreshView(self):
                     elapsed = end_time - start_time
                     print(f"Failed → {e} [{elapsed:.2f}s]")
                     connection.rollback()  # Rollback on failure
+                    failed.append(file_name)
                     continue
 
+        if failed:
+            # The mart is unchanged, so rollups rebuilt from it would be stale and a
+            # new generation would expire cached results that are still correct
+            print(
+                f"\nRefresh failed ({', '.join(failed)}); rollups, samples and the "
+                "cache generation left unchanged."
+            )
+            return False
+
         print("\nAll refresh scripts completed.")
 
+        # Rollups and samples are rebuilt before the generation moves, so a
+        # dashboard that sees the new generation never caches stale results under it
+        if not self.refreshRollups():
+            print(
+                "\nRollup or sample rebuild failed; the cache generation is left "
+                "unchanged."
+            )
+            return False
+        self.bumpGeneration()
+        return True
+
+    def bumpGeneration(self):
+        # Invalidate every cached dashboard result computed before this refresh
+        with self.engine.connect() as connection:
+            with open(self.paths["cache"] / "refresh_generation.sql", "r") as f:
+                connection.execute(text(f.read()))
+            connection.commit()
+
+            generation = connection.execute(
+                text("SELECT generation FROM refresh_generation WHERE id = 1")
+            ).scalar()
+        print(f"Refresh generation → {generation}")
+
+    def warmCache(self):
+        # Pre-compute the dashboard queries for every year into the shared result cache
+        print("\nWarming Dashboard Cache...")
+        sys.path.insert(0, str(self.paths["dashboard"].resolve()))
+        from report_data import warm_cache
+
+        start_time = time.time()
+        with self.telemetry.span("refresh", "warm_cache") as span:
+            years = warm_cache(self.paths["queries"])
+            span.rows = len(years)
+        elapsed = time.time() - start_time
+        print(f"Warmed {len(years)} year(s) [{elapsed:.2f}s]")
+
+    def exportSnapshot(self):
+        # Columnar per-year copy of the mart for the dashboard's snapshot backend
+        print("\nExporting Dashboard Snapshot...")
+        sys.path.insert(0, str(self.paths["dashboard"].resolve()))
+        from snapshot import SNAPSHOT_DIR, export_snapshot, snapshot_generation
+
+        generation = None
+        with self.engine.connect() as connection:
+            if connection.execute(
+                text("SELECT to_regclass('refresh_generation')")
+            ).scalar():
+                generation = connection.execute(
+                    text("SELECT generation FROM refresh_generation WHERE id = 1")
+                ).scalar()
+        if generation is not None and generation == snapshot_generation():
+            print(f"Snapshot is current (generation {generation}).")
+            return
+
+        start_time = time.time()
+        with self.telemetry.span("refresh", "export_snapshot") as span:
+            manifest = export_snapshot(self.engine)
+            span.rows = sum(manifest["years"].values())
+        elapsed = time.time() - start_time
+        print(
+            f"Exported {span.rows:,} rows, {len(manifest['years'])} year file(s), "
+            f"generation {manifest['generation']} to {SNAPSHOT_DIR} [{elapsed:.2f}s]"
+        )
+
+    def martIsView(self):
+        with self.engine.connect() as connection:
+            return (
+                connection.execute(
+                    text(
+                        "SELECT 1 FROM pg_matviews WHERE matviewname = 'enriched_transactions'"
+                    )
+                ).first()
+                is not None
+            )
+
+    def _runIncrementalModels(self, steps):
+        # Patch the table form of the mart (with its rollups and samples) in a single
+        # transaction; readers keep seeing the previous rows until commit and are
+        # never blocked. steps are (sql_file, params) pairs, run in order.
+        names = list(dict.fromkeys(sql_file.name for sql_file, _ in steps))
+        with self.engine.connect() as connection:
+            print(f"Refreshing: {', '.join(names)}...", end=" ", flush=True)
+
+            try:
+                start_time = time.time()
+
+                with self.telemetry.span("refresh", "incremental", models=names):
+                    for sql_file, params in steps:
+                        with open(sql_file, "r") as f:
+                            query = f.read()
+
+                        connection.execute(text(query), params)
+
+                    connection.commit()
+
+                end_time = time.time()
+                elapsed = end_time - start_time
+                print(f"→ Success [{elapsed:.2f}s]")
+                return True
+
+            except Exception as e:
+                end_time = time.time()
+                elapsed = end_time - start_time
+                print(f"Failed → {e} [{elapsed:.2f}s]")
+                connection.rollback()
+                return False
+
+    def _syncLabels(self, sql_file, params=None):
+        # Add a compact mart's new labels in their own transaction, since they
+        # cannot be used by the transaction that adds them
+        with open(sql_file) as f:
+            query = f.read()
+
+        with self.engine.connect() as connection:
+            try:
+                with self.telemetry.span("refresh", sql_file.name):
+                    connection.execute(text(query), params or {})
+                    connection.commit()
+                return True
+            except Exception as e:
+                print(f"Refreshing: {sql_file.name}... Failed → {e}")
+                connection.rollback()
+                return False
+
+    def _prepareIncremental(self):
+        # Ensure the change queue and partition helper exist; report whether
+        # rollups and samples are built
+        setup_files = [
+            self.paths["incremental"] / "ingest_ledger.sql",
+            self.paths["incremental"] / "mart_labels.sql",
+            self.paths["partitioning"] / "part_00_year_partitions.sql",
+        ]
+
+        with self.engine.connect() as connection:
+            for setup_file in setup_files:
+                with open(setup_file, "r") as f:
+                    connection.execute(text(f.read()))
+            connection.commit()
+
+            return connection.execute(
+                text(
+                    """
+                    SELECT
+                        to_regclass('rollup_transactions') IS NOT NULL,
+                        to_regclass('sample_transactions') IS NOT NULL
+                    """
+                )
+            ).one()
+
+    def refreshChanges(self):
+        # Recompute only the transactions queued in mart_pending_changes; like the
+        # other refresh modes, returns whether the refresh succeeded
+        print("\nStarting Incremental Refresh (Changed Transactions)...")
+        has_rollups, has_samples = self._prepareIncremental()
+        range_files = []
+        if has_rollups:
+            range_files.append(
+                self.paths["refresh_incremental"] / "refresh_rollups_range.sql"
+            )
+        if has_samples:
+            range_files.append(
+                self.paths["refresh_incremental"] / "refresh_samples_range.sql"
+            )
+
+        # Rollups and samples are rebuilt only for the dates that have changes
+        with open(self.paths["refresh_incremental"] / "pending_date_ranges.sql") as f:
+            ranges_query = f.read()
+        with self.engine.connect() as connection:
+            ranges = [
+                dict(row._mapping) for row in connection.execute(text(ranges_query))
+            ]
+
+        if not ranges:
+            print("No queued changes.")
+            return True
+        print(f"Changed dates: {len(ranges)} range(s)")
+
+        steps = [(self.paths["incremental"] / "inc_03_enriched_transactions.sql", {})]
+        steps += [(sql_file, params) for params in ranges for sql_file in range_files]
+        # Published in the same transaction as the patched rows
+        steps.append((self.paths["cache"] / "refresh_generation.sql", {}))
+
+        sync_file = self.paths["refresh_incremental"] / "sync_labels_pending.sql"
+        if not (self._syncLabels(sync_file) and self._runIncrementalModels(steps)):
+            print("\nIncremental refresh failed; the mart is unchanged.")
+            return False
+
+        print("\nIncremental refresh completed.")
+        return True
+
+    def refreshDateRange(self, start_date, end_date):
+        # Recompute only transactions dated in [start_date, end_date)
+        print(f"\nStarting Incremental Refresh ({start_date} → {end_date})...")
+        has_rollups, has_samples = self._prepareIncremental()
+        sql_files = [self.paths["refresh_incremental"] / "refresh_date_range.sql"]
+
+        if has_rollups:
+            sql_files.append(
+                self.paths["refresh_incremental"] / "refresh_rollups_range.sql"
+            )
+        if has_samples:
+            sql_files.append(
+                self.paths["refresh_incremental"] / "refresh_samples_range.sql"
+            )
+        # Published in the same transaction as the patched rows
+        sql_files.append(self.paths["cache"] / "refresh_generation.sql")
+
+        params = {"start_date": start_date, "end_date": end_date}
+        sync_file = self.paths["refresh_incremental"] / "sync_labels_range.sql"
+        steps = [(sql_file, params) for sql_file in sql_files]
+        if not (
+            self._syncLabels(sync_file, params) and self._runIncrementalModels(steps)
+        ):
+            print("\nIncremental refresh failed; the mart is unchanged.")
+            return False
+
+        print("\nIncremental refresh completed.")
+        return True
+
+    def refreshRollups(self):
+        # Rebuild the dashboard rollups and samples after a full refresh of the mart;
+        # returns whether every rebuild succeeded
+        print("\nRebuilding Rollups and Samples...")
+        sql_files = sorted(list(self.paths["rollups"].glob("*.sql")))
+        sql_files += sorted(list(self.paths["samples"].glob("*.sql")))
+        failed = []
+
+        with self.engine.connect() as connection:
+            for sql_file in sql_files:
+                print(f"Refreshing: {sql_file.name}...", end=" ", flush=True)
+
+                try:
+                    start_time = time.time()
+
+                    with open(sql_file, "r") as f:
+                        query = f.read()
+
+                    with self.telemetry.span("refresh", sql_file.name):
+                        connection.execute(text(query))
+                        connection.commit()
+
+                    end_time = time.time()
+                    elapsed = end_time - start_time
+                    print(f"→ Success [{elapsed:.2f}s]")
+
+                except Exception as e:
+                    end_time = time.time()
+                    elapsed = end_time - start_time
+                    print(f"Failed → {e} [{elapsed:.2f}s]")
+                    connection.rollback()
+                    failed.append(sql_file.name)
+
+        return not failed
+
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Refresh the enriched_transactions mart")
+    parser.add_argument(
+        "--mode",
+        choices=["auto", "full", "changes", "range"],
+        default="auto",
+        help="full: REFRESH MATERIALIZED VIEW; changes: queued transaction ids; "
+        "range: --since/--until dates; auto: full for a view, changes for a table",
+    )
+    parser.add_argument("--since", help="Range start date (inclusive), YYYY-MM-DD")
+    parser.add_argument(
+        "--until", help="Range end date (exclusive), YYYY-MM-DD; defaults to tomorrow"
+    )
+    parser.add_argument(
+        "--warm",
+        action="store_true",
+        help="Pre-compute the dashboard queries for every year after refreshing",
+    )
+    parser.add_argument(
+        "--snapshot",
+        action="store_true",
+        help="Export the refreshed mart as the dashboard's columnar snapshot",
+    )
+    args = parser.parse_args()
+
     DB_CONNECTION_STRING = os.getenv("DB_CONNECTION_STRING")
 
     # Guardrail for DB connection
@@ -66,7 +373,34 @@ def refreshView(self):
 
     try:
         pipeline.connect()
-        pipeline.refreshView()
+
+        mode = args.mode
+        if mode != "full" and pipeline.martIsView():
+            # A materialized view can only be recomputed as a whole
+            if mode != "auto":
+                print("enriched_transactions is a materialized view; using a full refresh.")
+            mode = "full"
+        elif mode == "auto":
+            mode = "changes"
+
+        ok = False
+        with pipeline.telemetry.span("refresh", f"mode {mode}"):
+            if mode == "full":
+                ok = pipeline.refreshView()
+            elif mode == "changes":
+                ok = pipeline.refreshChanges()
+            elif not args.since:
+                print("Error: --mode range requires --since (and optionally --until).")
+            else:
+                until = args.until or (date.today() + timedelta(days=1)).isoformat()
+                ok = pipeline.refreshDateRange(args.since, until)
+
+        # A failed refresh left the generation as it was, so the published
+        # snapshot and the cached results are still current
+        if args.snapshot and ok:
+            pipeline.exportSnapshot()
+        if args.warm and ok:
+            pipeline.warmCache()
     except Exception as e:
         print(f"\nFatal error during pipeline run: {e}")
     finally:
@@ -0,0 +1,212 @@
+import os
+import json
+import time
+import uuid
+import threading
+import contextvars
+from pathlib import Path
+from datetime import datetime, timezone
+from sqlalchemy import event, text
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Structured timing spans shared by the pipeline, the refresh utility and the
+# dashboard. Each span records wall/CPU time, client_sql_s, rows, bytes and the
+# process's peak RSS, and is emitted as one JSON line. client_sql_s is measured
+# in this process around each statement, from send to result: it includes network
+# transfer and result fetching, so it bounds the server's execution time from
+# above (pg_stat_statements has the server-side figure).
+# With TELEMETRY_DB=true spans are also stored in the pipeline_runs table.
+
+ROOT = Path(__file__).resolve().parent.parent
+TELEMETRY_LOG = os.getenv("TELEMETRY_LOG", str(ROOT / "logs" / "telemetry.jsonl"))
+TELEMETRY_DB = os.getenv("TELEMETRY_DB", "false").lower() == "true"
+PIPELINE_RUNS_MODEL = ROOT / "models" / "telemetry" / "pipeline_runs.sql"
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+# Spans on worker threads add their time to a shared parent chain
+_client_sql_lock = threading.Lock()
+
+
+def peak_rss_mb():
+    # Process high-water mark; ru_maxrss is KB on Linux and bytes on macOS
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    scale = 1024**2 if os.uname().sysname == "Darwin" else 1024
+    return peak / scale
+
+
+def submit_in_context(executor, fn, *args, **kwargs):
+    # Pool threads start with an empty context, so spans opened there would lose
+    # their parent; run each task in a copy of the submitting thread's context
+    return executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+def record_client_sql_time(seconds):
+    # For statements run on raw DB-API cursors, which bypass engine events
+    span = _current_span.get()
+    if span is not None:
+        span.add_client_sql_time(seconds)
+
+
+class Span:
+    def __init__(self, component, run_id, stage, name, parent, attrs):
+        self.component = component
+        self.run_id = run_id
+        self.stage = stage
+        self.name = name
+        self.parent = parent
+        self.attrs = attrs
+        self.rows = None
+        self.bytes = None
+        self.client_sql_s = 0.0
+        self.status = "ok"
+        self.error = None
+
+    def fail(self, error):
+        # Mark a span failed when the error is handled instead of raised
+        self.status = "error"
+        self.error = str(error)
+
+    def add_client_sql_time(self, seconds):
+        span = self
+        with _client_sql_lock:
+            while span is not None:
+                span.client_sql_s += seconds
+                span = span.parent
+
+
+class Telemetry:
+    def __init__(self, component, log_path=TELEMETRY_LOG, store_in_db=TELEMETRY_DB):
+        self.component = component
+        self.run_id = uuid.uuid4().hex[:12]
+        self.log_path = Path(log_path) if log_path else None
+        self.store_in_db = store_in_db
+        self.engine = None
+        self._lock = threading.Lock()
+        self._table_ready = False
+
+    def instrument(self, engine):
+        # Attribute the client-side time of each cursor execution to the active span
+        self.engine = engine
+
+        def before_execute(conn, cursor, statement, params, context, executemany):
+            conn.info.setdefault("telemetry_start", []).append(time.perf_counter())
+
+        def after_execute(conn, cursor, statement, params, context, executemany):
+            started = conn.info["telemetry_start"].pop()
+            span = _current_span.get()
+            if span is not None:
+                span.add_client_sql_time(time.perf_counter() - started)
+
+        event.listen(engine, "before_cursor_execute", before_execute)
+        event.listen(engine, "after_cursor_execute", after_execute)
+
+    def span(self, stage, name, **attrs):
+        return _SpanContext(self, stage, name, attrs)
+
+    def emit(self, record):
+        line = json.dumps(record, default=str)
+        with self._lock:
+            if self.log_path:
+                try:
+                    self.log_path.parent.mkdir(parents=True, exist_ok=True)
+                    with open(self.log_path, "a") as f:
+                        f.write(line + "\n")
+                except OSError as e:
+                    print(f"WARNING: Telemetry log unavailable: {e}")
+                    self.log_path = None
+
+            if self.store_in_db and self.engine is not None:
+                self._store(record)
+
+    def _store(self, record):
+        # Detach from the enclosing span so the insert is not timed as its work
+        token = _current_span.set(None)
+        try:
+            with self.engine.connect() as connection:
+                if not self._table_ready:
+                    with open(PIPELINE_RUNS_MODEL, "r") as f:
+                        connection.execute(text(f.read()))
+                    self._table_ready = True
+
+                connection.execute(
+                    text(
+                        """
+                        INSERT INTO pipeline_runs (
+                            run_id, component, stage, name, status, error,
+                            started_at, wall_s, cpu_s, client_sql_s, rows,
+                            bytes, peak_rss_mb, attrs
+                        )
+                        VALUES (
+                            :run_id, :component, :stage, :name, :status, :error,
+                            :started_at, :wall_s, :cpu_s, :client_sql_s, :rows,
+                            :bytes, :peak_rss_mb, CAST(:attrs AS JSONB)
+                        )
+                        """
+                    ),
+                    {**record, "attrs": json.dumps(record["attrs"], default=str)},
+                )
+                connection.commit()
+        except Exception as e:
+            print(f"WARNING: Could not store telemetry in pipeline_runs: {e}")
+            self.store_in_db = False
+        finally:
+            _current_span.reset(token)
+
+
+class _SpanContext:
+    def __init__(self, telemetry, stage, name, attrs):
+        self.telemetry = telemetry
+        self.stage = stage
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        self.span = Span(
+            self.telemetry.component,
+            self.telemetry.run_id,
+            self.stage,
+            self.name,
+            _current_span.get(),
+            self.attrs,
+        )
+        self.token = _current_span.set(self.span)
+        self.started_at = datetime.now(timezone.utc)
+        self.wall_start = time.perf_counter()
+        # Process-wide CPU, so spans that overlap on worker threads share it
+        self.cpu_start = time.process_time()
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        wall_s = time.perf_counter() - self.wall_start
+        cpu_s = time.process_time() - self.cpu_start
+        _current_span.reset(self.token)
+
+        span = self.span
+        if exc is not None:
+            span.fail(exc)
+
+        self.telemetry.emit(
+            {
+                "run_id": span.run_id,
+                "component": span.component,
+                "stage": span.stage,
+                "name": span.name,
+                "status": span.status,
+                "error": span.error,
+                "started_at": self.started_at.isoformat(),
+                "wall_s": round(wall_s, 6),
+                "cpu_s": round(cpu_s, 6),
+                "client_sql_s": round(span.client_sql_s, 6),
+                "rows": span.rows,
+                "bytes": span.bytes,
+                "peak_rss_mb": peak_rss_mb(),
+                "attrs": span.attrs,
+            }
+        )
+        return False
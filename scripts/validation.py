@@ -0,0 +1,197 @@
+import json
+import threading
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+# Referential validation applied to cleaned batches while they stream into
+# Postgres, in place of foreign keys that check every row after the load.
+# Key sets are sorted int64 arrays probed with np.searchsorted, so a batch is
+# checked with a few vectorized passes however large the referenced table is.
+# Rejected rows go to ingest_rejects with their reasons; the rest are loaded.
+
+# Referenced table -> key column
+KEY_COLUMNS = {
+    "users_data": "id",
+    "cards_data": "id",
+    "mcc_codes": "mcc",
+    "transactions_data": "id",
+}
+# Validated table -> (column, referenced table, reason) per foreign key
+REFERENCES = {
+    "transactions_data": [
+        ("client_id", "users_data", "unknown client_id"),
+        ("card_id", "cards_data", "unknown card_id"),
+        ("mcc", "mcc_codes", "unknown mcc"),
+    ],
+    "train_fraud_labels": [
+        ("id", "transactions_data", "unknown transaction id"),
+    ],
+}
+# Validated table -> (column, reason) where a raw value failed to parse
+PARSED_COLUMNS = {
+    "transactions_data": [
+        ("id", "unparseable id"),
+        ("amount", "unparseable amount"),
+        ("date", "unparseable date"),
+    ],
+    "train_fraud_labels": [
+        ("id", "unparseable id"),
+    ],
+}
+# Tables loaded first, so the key sets exist before the tables that use them
+LOAD_PHASES = [
+    ["users_data", "cards_data", "mcc_codes"],
+    ["transactions_data"],
+    ["train_fraud_labels"],
+]
+
+
+class KeySet:
+    """
+    Set of integer keys stored as one sorted array. Keys can be added from
+    several threads while a table loads; the array is rebuilt on the next
+    membership test.
+    """
+
+    def __init__(self, keys=()):
+        self._keys = np.unique(np.asarray(keys, dtype=np.int64))
+        self._pending = []
+        self._lock = threading.Lock()
+
+    def add(self, keys):
+        with self._lock:
+            self._pending.append(np.asarray(keys, dtype=np.int64))
+
+    def __len__(self):
+        return len(self.sorted_keys())
+
+    def sorted_keys(self):
+        with self._lock:
+            if self._pending:
+                self._keys = np.unique(np.concatenate([self._keys] + self._pending))
+                self._pending = []
+            return self._keys
+
+    def contains(self, values):
+        keys = self.sorted_keys()
+        values = np.asarray(values, dtype=np.int64)
+        if not len(keys):
+            return np.zeros(len(values), dtype=bool)
+
+        positions = np.searchsorted(keys, values).clip(max=len(keys) - 1)
+        return keys[positions] == values
+
+
+class ReferentialValidator:
+    def __init__(self, run_id=None):
+        # Run that the rejects are recorded under (the loader's telemetry run)
+        self.run_id = run_id
+        self.key_sets = {}
+        # Validated table -> [rows accepted, rows rejected]
+        self.counts = {table_name: [0, 0] for table_name in REFERENCES}
+        self._lock = threading.Lock()
+
+    def load_keys(self, engine, table_name):
+        # Key set of a table already in the database
+        column = KEY_COLUMNS[table_name]
+        with engine.connect() as connection:
+            if not connection.execute(
+                text("SELECT to_regclass(:table_name)"), {"table_name": table_name}
+            ).scalar():
+                keys = []
+            else:
+                keys = connection.execute(
+                    text(
+                        f'SELECT "{column}" FROM {table_name} '
+                        f'WHERE "{column}" IS NOT NULL'
+                    )
+                ).scalars()
+                keys = np.fromiter(keys, dtype=np.int64)
+        self.key_sets[table_name] = KeySet(keys)
+
+    def prepare(self, engine, table_names):
+        # Key sets for the tables validated next; keys collected while loading
+        # a referenced table in this run are kept, the others are read back
+        for table_name in table_names:
+            for _, referenced, _ in REFERENCES.get(table_name, []):
+                if referenced not in self.key_sets:
+                    self.load_keys(engine, referenced)
+
+    def validate(self, table_name, raw, clean):
+        """
+        Returns (accepted, rejects): the clean rows that passed, and one
+        row per rejected record with its reasons and raw values.
+        Also collects the accepted keys of tables that others reference.
+        """
+        if table_name not in REFERENCES:
+            return clean, None
+
+        raw = raw.reset_index(drop=True)
+        clean = clean.reset_index(drop=True)
+        reasons = pd.Series("", index=clean.index)
+
+        for column, reason in PARSED_COLUMNS[table_name]:
+            failed = raw[column].notna() & clean[column].isna()
+            reasons[failed] += f"; {reason}"
+
+        for column, referenced, reason in REFERENCES[table_name]:
+            values = clean[column]
+            present = values.notna().to_numpy()
+            found = np.ones(len(values), dtype=bool)
+            found[present] = self.key_sets[referenced].contains(
+                values[present].to_numpy(dtype=np.int64)
+            )
+            reasons[~found] += f"; {reason}"
+
+        rejected = (reasons != "").to_numpy()
+        accepted = clean[~rejected]
+
+        if table_name in KEY_COLUMNS:
+            keys = accepted[KEY_COLUMNS[table_name]].dropna()
+            self.key_sets.setdefault(table_name, KeySet()).add(
+                keys.to_numpy(dtype=np.int64)
+            )
+
+        with self._lock:
+            self.counts[table_name][0] += len(accepted)
+            self.counts[table_name][1] += int(rejected.sum())
+
+        if not rejected.any():
+            return accepted, None
+
+        raw_rejects = raw[rejected].astype(object)
+        raw_rejects = raw_rejects.where(raw_rejects.notna(), None)
+        rejects = pd.DataFrame(
+            {
+                "run_id": self.run_id,
+                "source_table": table_name,
+                "source_id": clean.loc[rejected, "id"].astype(object).to_numpy(),
+                "reason": reasons[rejected].str[2:].to_numpy(),
+                "raw": [
+                    json.dumps(record, default=str)
+                    for record in raw_rejects.to_dict("records")
+                ],
+            }
+        )
+        return accepted, rejects
+
+
+def write_rejects(engine, rejects):
+    # Append quarantined rows to ingest_rejects (see models/validation)
+    records = rejects.astype(object).where(rejects.notna(), None).to_dict("records")
+    with engine.connect() as connection:
+        connection.execute(
+            text(
+                """
+                INSERT INTO ingest_rejects (
+                    run_id, source_table, source_id, reason, raw
+                )
+                VALUES (
+                    :run_id, :source_table, :source_id, :reason, CAST(:raw AS JSONB)
+                )
+                """
+            ),
+            records,
+        )
+        connection.commit()
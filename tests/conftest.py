@@ -0,0 +1,39 @@
+import sys
+import importlib.util
+from pathlib import Path
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# The scripts and dashboard modules import their siblings by bare name
+for folder in ("scripts", "dashboard"):
+    sys.path.insert(0, str(ROOT / folder))
+
+
+def load_script(file_name):
+    # The scripts have hyphenated file names, so they are imported by path
+    spec = importlib.util.spec_from_file_location(
+        file_name[:-3].replace("-", "_"), ROOT / "scripts" / file_name
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def load_data():
+    return load_script("load-data.py")
+
+
+@pytest.fixture(scope="session")
+def generate_data():
+    return load_script("generate-data.py")
+
+
+@pytest.fixture
+def pipeline(load_data, tmp_path):
+    # Never connected; the tests only exercise the file handling
+    pipeline = load_data.RevenueOpsPipeline("postgresql://")
+    pipeline.telemetry.log_path = None
+    pipeline.paths["raw"] = tmp_path
+    return pipeline
@@ -0,0 +1,168 @@
+import datetime
+import pandas as pd
+import pytest
+from cleaning import (
+    CLEANERS,
+    extract_time,
+    mask_card_number,
+    month_year_to_date,
+    strip_currency,
+    to_date,
+    to_int,
+    yes_no_to_bool,
+)
+
+
+def test_strip_currency():
+    values = pd.Series(["$1,234.50", "$ 1,234", "-$77.00", "12", None, "n/a"])
+
+    assert strip_currency(values).tolist()[:4] == [1234.5, 1234.0, -77.0, 12.0]
+    assert strip_currency(values).iloc[4:].isna().all()
+
+
+def test_to_int_is_nullable():
+    result = to_int(pd.Series(["7", "8.0", None, "x"]))
+
+    assert str(result.dtype) == "Int64"
+    assert result.tolist()[:2] == [7, 8]
+    assert result.iloc[2:].isna().all()
+    # Renders as an empty CSV field, which COPY reads as NULL
+    frame = pd.DataFrame({"id": result, "flag": "t"})
+    assert frame.to_csv(index=False, header=False) == "7,t\n8,t\n,t\n,t\n"
+
+
+def test_to_date_and_extract_time():
+    values = pd.Series(["2010-01-01 07:21:00", "2019-12-31 23:59:59", "bad"])
+
+    assert to_date(values).tolist()[:2] == [
+        datetime.date(2010, 1, 1),
+        datetime.date(2019, 12, 31),
+    ]
+    assert extract_time(values).tolist()[:2] == ["07:21:00", "23:59:59"]
+    assert pd.isna(to_date(values).iloc[2])
+    assert pd.isna(extract_time(values).iloc[2])
+
+
+@pytest.mark.parametrize(
+    "values, true_value, expected",
+    [
+        (["YES", "no", " Yes ", None], "YES", [True, False, True, None]),
+        (["Yes", "No", None], "Yes", [True, False, None]),
+    ],
+)
+def test_yes_no_to_bool(values, true_value, expected):
+    result = yes_no_to_bool(pd.Series(values), true_value=true_value)
+
+    assert [None if pd.isna(v) else v for v in result] == expected
+
+
+def test_month_year_to_date():
+    result = month_year_to_date(pd.Series(["09/2002", "12/2024", "2024-12"]))
+
+    assert result.tolist()[:2] == [
+        datetime.date(2002, 9, 1),
+        datetime.date(2024, 12, 1),
+    ]
+    assert pd.isna(result.iloc[2])
+
+
+def test_mask_card_number():
+    result = mask_card_number(pd.Series(["4556123412341234", 5497590243197280]))
+
+    assert result.tolist() == ["4556-****-****-1234", "5497-****-****-7280"]
+
+
+def test_clean_transactions_data():
+    raw = pd.DataFrame(
+        {
+            "id": ["7475327"],
+            "date": ["2010-01-01 00:01:00"],
+            "client_id": ["1556"],
+            "card_id": ["2972"],
+            "amount": ["$-77.00"],
+            "use_chip": ["Swipe Transaction"],
+            "merchant_id": ["59935"],
+            "merchant_city": ["Beulah"],
+            "merchant_state": ["ND"],
+            "zip": ["58523.0"],
+            "mcc": ["5499"],
+            "errors": [None],
+        }
+    )
+
+    row = CLEANERS["transactions_data"](raw).iloc[0]
+
+    assert row["id"] == 7475327 and row["zip"] == 58523 and row["mcc"] == 5499
+    assert row["date"] == datetime.date(2010, 1, 1)
+    assert row["transaction_time"] == "00:01:00"
+    assert row["amount"] == -77.0
+    assert row["use_chip"] == "Swipe Transaction"
+
+
+def test_clean_users_data():
+    raw = pd.DataFrame(
+        {
+            "id": ["825"],
+            "current_age": ["53"],
+            "retirement_age": ["66"],
+            "birth_year": ["1966"],
+            "birth_month": ["11"],
+            "per_capita_income": ["$29,278"],
+            "yearly_income": ["$59,696"],
+            "total_debt": ["$127,613"],
+            "credit_score": ["787"],
+            "num_credit_cards": ["5"],
+            "gender": ["Female"],
+        }
+    )
+
+    row = CLEANERS["users_data"](raw).iloc[0]
+
+    assert row["per_capita_income"] == 29278 and row["total_debt"] == 127613
+    assert row["credit_score"] == 787 and row["gender"] == "Female"
+
+
+def test_clean_cards_data():
+    raw = pd.DataFrame(
+        {
+            "id": ["4524"],
+            "client_id": ["825"],
+            "card_brand": ["Visa"],
+            "card_number": ["4344676511950444"],
+            "expires": ["12/2022"],
+            "has_chip": ["YES"],
+            "num_cards_issued": ["2"],
+            "credit_limit": ["$24,295"],
+            "acct_open_date": ["09/2002"],
+            "year_pin_last_changed": ["2008"],
+            "card_on_dark_web": ["No"],
+        }
+    )
+
+    df = CLEANERS["cards_data"](raw)
+    row = df.iloc[0]
+
+    assert not {"card_number", "expires", "acct_open_date"} & set(df.columns)
+    assert row["card_number_masked"] == "4344-****-****-0444"
+    assert row["card_issued_date"] == datetime.date(2002, 9, 1)
+    assert row["card_expiration_date"] == datetime.date(2022, 12, 1)
+    assert row["has_chip"] and not row["card_on_dark_web"]
+    assert row["credit_limit"] == 24295.0
+
+
+@pytest.mark.parametrize("category_column", [0, "0"])
+def test_clean_mcc_codes(category_column):
+    raw = pd.DataFrame({"mcc": ["5812"], category_column: ["Eating Places"]})
+
+    df = CLEANERS["mcc_codes"](raw)
+
+    assert df.to_dict("records") == [{"mcc": 5812, "category": "Eating Places"}]
+
+
+def test_clean_train_fraud_labels():
+    raw = pd.DataFrame({"id": ["10649266", "23410063"], "is_fraud": ["No", "Yes"]})
+
+    df = CLEANERS["train_fraud_labels"](raw)
+
+    assert df["id"].tolist() == [10649266, 23410063]
+    assert df["is_fraud"].tolist() == [False, True]
@@ -0,0 +1,98 @@
+import contextlib
+import datetime
+import pandas as pd
+import pytest
+import explorer
+
+
+@pytest.fixture
+def queries(monkeypatch):
+    # Captures the statements and parameters sent to the database
+    sent = []
+
+    def read_sql(query, connection, params):
+        sent.append((str(query), params))
+        return pd.DataFrame(
+            {
+                "transaction_date": [datetime.date(2019, 1, 1)] * 3,
+                "transaction_id": [1, 2, 3],
+            }
+        )
+
+    monkeypatch.setattr(explorer, "connect", contextlib.nullcontext)
+    monkeypatch.setattr(explorer.pd, "read_sql", read_sql)
+    return sent
+
+
+def test_fetch_page_applies_the_dashboard_slice(queries):
+    df, next_after = explorer.fetch_page(
+        after=(datetime.date(2019, 1, 1), 7),
+        page_size=2,
+        year=2019,
+        card_brand=["Visa"],
+        gender=["Female"],
+        hour=13,
+    )
+
+    sql, params = queries[0]
+    assert "card_brand IN (:f_card_brand_0)" in sql
+    assert "gender IN (:f_gender_0)" in sql
+    assert "hour_of_day = :f_hour" in sql
+    assert "transaction_id > :k_id" in sql
+    assert params["f_card_brand_0"] == "Visa" and params["f_gender_0"] == "Female"
+    assert params["f_start_date"] == datetime.date(2019, 1, 1)
+    assert (params["k_id"], params["limit"]) == (7, 3)
+    assert len(df) == 2 and next_after == (datetime.date(2019, 1, 1), 2)
+
+
+def test_compile_explorer_filters_adds_the_hour():
+    sql, params = explorer.compile_explorer_filters(hour="5", card_type=["Debit"])
+
+    assert sql == " AND card_type IN (:f_card_type_0) AND hour_of_day = :f_hour"
+    assert params == {"f_card_type_0": "Debit", "f_hour": 5}
+
+
+def test_exports_can_be_capped(queries, monkeypatch):
+    class Connection:
+        def execution_options(self, **options):
+            return self
+
+    def read_sql(query, connection, params, chunksize):
+        queries.append((str(query), params))
+        return iter([])
+
+    monkeypatch.setattr(
+        explorer, "connect", lambda: contextlib.nullcontext(Connection())
+    )
+    monkeypatch.setattr(explorer.pd, "read_sql", read_sql)
+    list(explorer.iter_batches(max_rows=500, year=2019))
+
+    sql, params = queries[0]
+    assert "LIMIT :limit" in sql and params["limit"] == 500
+
+
+def test_failed_export_removes_the_partial_file(monkeypatch, tmp_path):
+    def failing_batches(**filters):
+        yield pd.DataFrame({"transaction_id": [1]})
+        raise RuntimeError("connection lost")
+
+    monkeypatch.setattr(explorer, "iter_batches", failing_batches)
+    path = tmp_path / "export.csv"
+
+    with pytest.raises(RuntimeError):
+        explorer.export_file(str(path), "csv", year=2019)
+    assert not path.exists()
+
+
+def test_export_file_writes_csv(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        explorer,
+        "iter_batches",
+        lambda max_rows=None, **filters: iter(
+            [pd.DataFrame({"transaction_id": [1, 2]})]
+        ),
+    )
+    path = tmp_path / "export.csv"
+
+    assert explorer.export_file(str(path), "csv", max_rows=10) == 2
+    assert path.read_text() == "transaction_id\n1\n2\n"
@@ -0,0 +1,52 @@
+import json
+import pandas as pd
+
+
+def generated(generate_data, out_dir, **kwargs):
+    generate_data.generate(out_dir, 500, users=20, cards_per_user=2, **kwargs)
+    return {
+        "users": pd.read_csv(out_dir / "users_data.csv"),
+        "cards": pd.read_csv(out_dir / "cards_data.csv"),
+        "transactions": pd.read_csv(out_dir / "transactions_data.csv"),
+        "labels": json.loads((out_dir / "train_fraud_labels.json").read_text()),
+        "mcc": json.loads((out_dir / "mcc_codes.json").read_text()),
+    }
+
+
+def test_generated_files_satisfy_the_foreign_keys(generate_data, tmp_path, monkeypatch):
+    # Several blocks, so ids and labels are checked across block boundaries
+    monkeypatch.setattr(generate_data, "BLOCK_ROWS", 200)
+    data = generated(generate_data, tmp_path, labeled=0.5)
+    users, cards, tx = data["users"], data["cards"], data["transactions"]
+
+    assert tx["id"].tolist() == list(range(500))
+    assert cards["client_id"].isin(users["id"]).all()
+
+    # Each transaction's client is the owner of its card
+    owners = cards.set_index("id")["client_id"]
+    assert (tx["client_id"] == owners.loc[tx["card_id"]].to_numpy()).all()
+    assert tx["mcc"].astype(str).isin(data["mcc"]).all()
+
+    labels = data["labels"]["target"]
+    assert 0 < len(labels) < 500
+    assert {int(i) for i in labels} <= set(tx["id"])
+    assert set(labels.values()) <= {"Yes", "No"}
+
+    # Ids follow time, as in the source file
+    dates = pd.to_datetime(tx["date"])
+    assert dates.is_monotonic_increasing
+    assert dates.min().year >= 2010 and dates.max().year <= 2019
+
+
+def test_generated_files_are_reproducible_from_the_seed(generate_data, tmp_path):
+    names = ["users_data.csv", "transactions_data.csv", "train_fraud_labels.json"]
+    for run in ("a", "b"):
+        generated(generate_data, tmp_path / run, seed=7)
+    generated(generate_data, tmp_path / "c", seed=8)
+
+    for name in names:
+        first = (tmp_path / "a" / name).read_bytes()
+        assert (tmp_path / "b" / name).read_bytes() == first
+    assert (tmp_path / "c" / "transactions_data.csv").read_bytes() != (
+        tmp_path / "a" / "transactions_data.csv"
+    ).read_bytes()
@@ -0,0 +1,278 @@
+import json
+import pandas as pd
+import pytest
+from pathlib import Path
+
+
+def read_all(stream, size):
+    chunks = []
+    while True:
+        chunk = stream.read(size)
+        if not chunk:
+            return "".join(chunks)
+        chunks.append(chunk)
+
+
+def test_copy_stream_renders_batches_as_headerless_csv(load_data):
+    frames = [
+        pd.DataFrame({"id": [1, 2], "amount": ["$1.00", "-$2.50"]}),
+        pd.DataFrame({"id": [3], "amount": ["$3,000.00"]}),
+    ]
+    stream = load_data.CopyStream(iter(frames))
+
+    assert read_all(stream, 7) == '1,$1.00\n2,-$2.50\n3,"$3,000.00"\n'
+    assert stream.rows == 3
+
+
+def test_copy_stream_splits_frames_into_blocks(load_data, monkeypatch):
+    monkeypatch.setattr(load_data, "COPY_BLOCK_ROWS", 2)
+    stream = load_data.CopyStream(iter([pd.DataFrame({"id": range(5)})]))
+
+    assert read_all(stream, -1) == "0\n1\n2\n3\n4\n"
+    assert stream.rows == 5
+
+
+def test_copy_stream_of_no_rows_is_empty(load_data):
+    stream = load_data.CopyStream(iter([pd.DataFrame({"id": []})]))
+
+    assert stream.read() == ""
+    assert stream.rows == 0
+
+
+def test_iter_json_pairs_yields_flat_members_in_batches(pipeline, tmp_path):
+    path = tmp_path / "mcc_codes.json"
+    path.write_text(
+        '{"5411": "Grocery Stores", "5812": "Eating \\"Places\\"",\n'
+        '"4829": "Money Orders"}'
+    )
+
+    batches = list(pipeline._iter_json_pairs(path, 2))
+
+    assert batches == [
+        [("5411", "Grocery Stores"), ("5812", 'Eating "Places"')],
+        [("4829", "Money Orders")],
+    ]
+
+
+def test_iter_json_pairs_joins_members_split_across_blocks(
+    load_data, pipeline, tmp_path, monkeypatch
+):
+    monkeypatch.setattr(load_data, "JSON_BLOCK_CHARS", 5)
+    path = tmp_path / "train_fraud_labels.json"
+    path.write_text('{"target": {"10": "No", "11": "Yes", "12": "No"}}')
+
+    pairs = [pair for batch in pipeline._iter_json_pairs(path, 100) for pair in batch]
+
+    assert pairs == [("10", "No"), ("11", "Yes"), ("12", "No")]
+
+
+def test_iter_file_batches_streams_labels_in_batches(pipeline, tmp_path):
+    pipeline.chunksize = 2
+    path = tmp_path / "train_fraud_labels.json"
+    path.write_text('{"target": {"10": "No", "11": "Yes", "12": "No"}}')
+
+    batches = list(pipeline._iter_file_batches(path))
+
+    assert [len(df) for df in batches] == [2, 1]
+    assert list(batches[0].columns) == ["id", "is_fraud"]
+    assert batches[1].iloc[0].tolist() == ["12", "No"]
+
+
+def test_batch_rows_fits_the_memory_ceiling(pipeline, tmp_path):
+    path = tmp_path / "users_data.csv"
+    path.write_text("id,name\n" + "".join(f"{i},user{i}\n" for i in range(100)))
+
+    pipeline.memory_limit_mb = 1
+    small = pipeline._batch_rows(path)
+    pipeline.memory_limit_mb = 100
+
+    assert 1000 <= small < pipeline._batch_rows(path)
+    pipeline.chunksize = 10
+    assert pipeline._batch_rows(path) == 10
+
+
+def write_csv(path, rows):
+    path.write_text("id,amount\n" + "".join(f"{i},${i}.00\n" for i in range(rows)))
+    return path
+
+
+def test_csv_shards_cover_the_body_on_line_boundaries(pipeline, tmp_path):
+    path = write_csv(tmp_path / "transactions_data.csv", 1000)
+    data = path.read_bytes()
+
+    shards = pipeline._csv_shards(path, 4)
+
+    assert len(shards) == 4
+    assert shards[0][0] == len(b"id,amount\n")
+    assert shards[-1][1] == len(data)
+    for (_, end), (start, _) in zip(shards, shards[1:]):
+        assert end == start
+        assert data[end - 1 : end] == b"\n"
+
+
+def test_csv_shards_parse_back_to_every_row_once(pipeline, tmp_path):
+    path = write_csv(tmp_path / "transactions_data.csv", 1000)
+
+    ids = []
+    for start, end in pipeline._csv_shards(path, 3):
+        for df in pipeline._iter_csv_range(path, start, end, ["id", "amount"], 100):
+            ids += df["id"].tolist()
+
+    assert ids == list(range(1000))
+
+
+def test_csv_shards_drop_empty_ranges(pipeline, tmp_path):
+    path = write_csv(tmp_path / "transactions_data.csv", 2)
+
+    shards = pipeline._csv_shards(path, 8)
+
+    assert 1 <= len(shards) <= 2
+    assert all(end > start for start, end in shards)
+
+
+def test_load_parallel_reports_a_failed_shard_setup(
+    load_data, pipeline, tmp_path, monkeypatch
+):
+    monkeypatch.setattr(load_data, "SHARD_MIN_BYTES", 0)
+
+    def fail(*args):
+        raise RuntimeError("DDL failed")
+
+    monkeypatch.setattr(pipeline, "_prepare_table", fail)
+    pipeline.workers = 2
+    path = write_csv(tmp_path / "transactions_data.csv", 10)
+
+    summary = pipeline._load_parallel([path])
+
+    assert summary == {
+        "transactions_data": {"rows": 0, "tasks": 1, "busy": 0.0, "failed": 1}
+    }
+
+
+def test_shards_parse_the_raw_header_and_clean_each_batch(
+    load_data, pipeline, tmp_path, monkeypatch
+):
+    # A cleaner that renames and reorders its columns
+    def clean(df):
+        return pd.DataFrame(
+            {"amount_usd": df["amount"].str.strip("$").astype(float), "id": df["id"]}
+        )
+
+    monkeypatch.setitem(load_data.CLEANERS, "transactions_data", clean)
+    monkeypatch.setattr(pipeline, "_prepare_table", lambda *args: None)
+    written = []
+    monkeypatch.setattr(
+        pipeline,
+        "_copy_batches",
+        lambda batches, *args, **kwargs: written.append(pd.concat(list(batches))),
+    )
+    pipeline.clean_on_ingest = True
+    pipeline.workers = 3
+    path = write_csv(tmp_path / "transactions_data.csv", 300)
+
+    for _, _, task, _ in pipeline._shard_tasks(path, "transactions_data", {}):
+        task()
+
+    df = pd.concat(written).sort_values("id")
+    assert list(df.columns) == ["amount_usd", "id"]
+    assert df["id"].tolist() == list(range(300))
+    assert df["amount_usd"].tolist() == [float(i) for i in range(300)]
+
+
+def test_delta_batches_are_cleaned_by_the_source_rules(pipeline, monkeypatch):
+    written = {}
+
+    def copy_batches(batches, table_name, if_exists, source):
+        written[table_name] = (source, pd.concat(list(batches)))
+        return len(written[table_name][1])
+
+    monkeypatch.setattr(pipeline, "_copy_batches", copy_batches)
+    raw = pd.DataFrame({"id": ["10", "11"], "is_fraud": ["No", "Yes"]})
+
+    rows = pipeline._write_batches(
+        iter([raw]), "train_fraud_labels_delta", source="train_fraud_labels"
+    )
+
+    source, df = written["train_fraud_labels_delta"]
+    assert rows == 2 and source == "train_fraud_labels"
+    assert df["is_fraud"].tolist() == [False, True]
+
+
+def test_relabels_anywhere_in_the_label_file_are_staged(
+    pipeline, load_data, tmp_path, monkeypatch
+):
+    monkeypatch.setattr(load_data, "HEAD_CHECKSUM_BYTES", 16)
+    path = tmp_path / "train_fraud_labels.json"
+    labels = {str(i): "No" for i in range(100)}
+    path.write_text(json.dumps({"target": labels}))
+    before = pipeline._file_checksum(path)
+
+    # A relabel below every watermark, past the head block
+    labels["7"] = "Yes"
+    path.write_text(json.dumps({"target": labels}))
+    assert pipeline._file_checksum(path) != before
+
+    state = {"watermark": 99}
+    batches, read_bytes = pipeline._delta_batches(path, None, 99, state)
+    delta = pd.concat(list(batches))
+
+    assert read_bytes == path.stat().st_size
+    assert len(delta) == 100
+    assert delta.set_index("id").loc["7", "is_fraud"] == "Yes"
+
+
+def test_append_only_deltas_keep_rows_past_the_watermark(pipeline, tmp_path):
+    path = tmp_path / "transactions_data.csv"
+    path.write_text("id,amount\n1,$1\n2,$2\n3,$3\n")
+
+    state = {"watermark": 1}
+    batches, _ = pipeline._delta_batches(path, None, 1, state)
+
+    assert pd.concat(list(batches))["id"].tolist() == [2, 3]
+    assert state["watermark"] == 3
+
+
+@pytest.mark.parametrize(
+    "concurrent, partitioned, validated, expected",
+    [
+        (
+            True,
+            False,
+            False,
+            [
+                "indexing_concurrent/opt_01_add_indexes.sql",
+                "indexing_concurrent/opt_02_add_foreign_keys.sql",
+                "indexing_concurrent/opt_03_validate_foreign_keys.sql",
+            ],
+        ),
+        (
+            True,
+            False,
+            True,
+            [
+                "indexing_concurrent/opt_01_add_indexes.sql",
+                "indexing_validated/opt_02_add_foreign_keys.sql",
+            ],
+        ),
+        (
+            True,
+            True,
+            False,
+            [
+                "indexing/opt_01_add_indexes.sql",
+                "indexing/opt_02_add_foreign_keys.sql",
+            ],
+        ),
+    ],
+)
+def test_index_files_pick_the_build_mode(
+    pipeline, monkeypatch, concurrent, partitioned, validated, expected
+):
+    monkeypatch.chdir(Path(__file__).resolve().parent.parent)
+    monkeypatch.setattr(pipeline, "_load_is_validated", lambda: validated)
+    pipeline.concurrent_indexes = concurrent
+    pipeline.partition_by_year = partitioned
+
+    files = pipeline._index_files()
+
+    assert [f"{f.parent.name}/{f.name}" for f in files] == expected
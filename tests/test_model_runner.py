@@ -0,0 +1,198 @@
+from pathlib import Path
+from model_runner import ModelNode, ModelRunner, build_graph
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def write_models(tmp_path, models):
+    paths = []
+    for name, sql in models.items():
+        path = tmp_path / name
+        path.write_text(sql)
+        paths.append(path)
+    return paths
+
+
+def deps(nodes):
+    return {node.name: [dep.name for dep in node.deps] for node in nodes}
+
+
+def test_node_classifies_created_modified_and_indexed_relations():
+    node = ModelNode(
+        "m.sql",
+        """
+        -- UPDATE ignored_in_comments SET x = 1;
+        CREATE TABLE IF NOT EXISTS "rollup_new" AS SELECT * FROM enriched;
+        UPDATE users_data SET income = 0;
+        ALTER TABLE rollup_new RENAME TO rollup;
+        CREATE INDEX idx ON rollup (day);
+        """,
+    )
+
+    assert node.created == {"rollup_new", "rollup"}
+    assert node.modified == {"users_data", "rollup_new"}
+    assert node.indexed == {"rollup"}
+    assert "ignored_in_comments" not in node.refs
+    assert not node.concurrent
+
+
+def test_readers_wait_for_writers_and_independent_models_do_not(tmp_path):
+    nodes = build_graph(
+        write_models(
+            tmp_path,
+            {
+                "stg_a.sql": "UPDATE a SET x = 1;",
+                "stg_b.sql": "UPDATE b SET x = 1;",
+                "mart.sql": "CREATE TABLE mart AS SELECT * FROM a JOIN b USING (id);",
+                "report.sql": "CREATE VIEW report AS SELECT * FROM b;",
+            },
+        )
+    )
+
+    assert deps(nodes) == {
+        "stg_a.sql": [],
+        "stg_b.sql": [],
+        "mart.sql": ["stg_a.sql", "stg_b.sql"],
+        "report.sql": ["stg_b.sql"],
+    }
+
+
+def test_writers_wait_for_earlier_readers_and_index_builds(tmp_path):
+    nodes = build_graph(
+        write_models(
+            tmp_path,
+            {
+                "read.sql": "CREATE TABLE copy_a AS SELECT * FROM a;",
+                "index.sql": "CREATE INDEX idx_a ON a (x);",
+                "alter.sql": "ALTER TABLE a ADD COLUMN y INT;",
+            },
+        )
+    )
+
+    assert deps(nodes)["alter.sql"] == ["read.sql", "index.sql"]
+
+
+def test_index_only_files_split_into_independent_nodes(tmp_path):
+    nodes = build_graph(
+        write_models(
+            tmp_path,
+            {
+                "stg.sql": "ALTER TABLE t ADD PRIMARY KEY (id);",
+                "indexes.sql": """
+                    -- two indexes on the same table
+                    CREATE INDEX IF NOT EXISTS idx_t_a ON t (a);
+                    CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_t_b ON t (b);
+                """,
+            },
+        )
+    )
+
+    assert deps(nodes) == {
+        "stg.sql": [],
+        "indexes.sql#1": ["stg.sql"],
+        "indexes.sql#2": ["stg.sql"],
+    }
+    assert [node.concurrent for node in nodes] == [False, False, True]
+
+
+def test_concurrent_index_builds_on_one_table_run_in_sequence(tmp_path):
+    nodes = build_graph(
+        write_models(
+            tmp_path,
+            {
+                "indexes.sql": """
+                    CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_t_a ON t (a);
+                    CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_u_a ON u (a);
+                    CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_t_b ON t (b);
+                    CREATE INDEX IF NOT EXISTS idx_t_c ON t (c);
+                """,
+            },
+        )
+    )
+
+    assert deps(nodes) == {
+        "indexes.sql#1": [],
+        "indexes.sql#2": [],
+        "indexes.sql#3": ["indexes.sql#1"],
+        "indexes.sql#4": [],
+    }
+
+
+def test_declared_dependencies_match_earlier_file_names(tmp_path):
+    nodes = build_graph(
+        write_models(
+            tmp_path,
+            {
+                "rollup_day.sql": "CREATE TABLE r1 AS SELECT 1;",
+                "rollup_hour.sql": "CREATE TABLE r2 AS SELECT 1;",
+                "other.sql": "CREATE TABLE r3 AS SELECT 1;",
+                "after.sql": "-- depends_on: rollup_*.sql\nSELECT 1;",
+                "last.sql": "-- depends_on: *\nSELECT 2;",
+            },
+        )
+    )
+
+    assert deps(nodes)["after.sql"] == ["rollup_day.sql", "rollup_hour.sql"]
+    assert len(deps(nodes)["last.sql"]) == 4
+
+
+def test_fingerprint_follows_sql_upstream_and_source_versions(tmp_path):
+    runner = ModelRunner(engine=None)
+    nodes = build_graph(
+        write_models(
+            tmp_path,
+            {
+                "stg.sql": "UPDATE a SET x = 1;",
+                "mart.sql": "CREATE TABLE mart AS SELECT * FROM a JOIN b USING (id);",
+            },
+        )
+    )
+    stg, mart = nodes
+    versions = {"a": [1, 10], "b": [2, 20], "mart": [3]}
+
+    stg.fingerprint = runner._fingerprint(stg, versions)
+    first = runner._fingerprint(mart, versions)
+
+    # a is built upstream and mart is created here, so only b's version counts
+    assert runner._fingerprint(mart, {**versions, "a": [9], "mart": [9]}) == first
+    assert runner._fingerprint(mart, {**versions, "b": [2, 21]}) != first
+    stg.fingerprint = "changed"
+    assert runner._fingerprint(mart, versions) != first
+    # An in-place transform only tracks which load it transforms, not the watermark
+    stg.fingerprint = None
+    in_place = runner._fingerprint(stg, versions)
+    assert runner._fingerprint(stg, {**versions, "a": [1, 11]}) == in_place
+
+
+def test_repository_mart_waits_for_staging():
+    models = ROOT / "models"
+    sql_files = sorted((models / "staging").glob("*.sql"))
+    sql_files += sorted((models / "intermediate").glob("*.sql"))
+    sql_files += sorted((models / "indexing").glob("*.sql"))
+
+    graph = deps(build_graph(sql_files))
+
+    assert "stg_transactions_data.sql" in graph["enriched_transactions.sql"]
+    assert "stg_target_data.sql" in graph["enriched_transactions.sql"]
+    assert "opt_01_add_indexes.sql#1" in graph
+
+
+def test_repository_concurrent_indexes_add_keys_not_valid_then_validate():
+    sql_files = sorted((ROOT / "models" / "indexing_concurrent").glob("*.sql"))
+
+    nodes = build_graph(sql_files)
+    graph = deps(nodes)
+    builds = [node for node in nodes if node.concurrent]
+
+    # Builds on transactions_data run in turn; the labels index runs alongside
+    by_table = {}
+    for node in builds:
+        by_table.setdefault(min(node.indexed), []).append(node.name)
+    transactions = by_table["transactions_data"]
+    for earlier, later in zip(transactions, transactions[1:]):
+        assert earlier in graph[later]
+    assert not set(graph[by_table["train_fraud_labels"][0]]) & set(transactions)
+
+    # NOT VALID keys wait for every index build, and VALIDATE for the keys
+    assert set(graph["opt_02_add_foreign_keys.sql"]) == {n.name for n in builds}
+    assert "opt_02_add_foreign_keys.sql" in graph["opt_03_validate_foreign_keys.sql"]
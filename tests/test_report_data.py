@@ -0,0 +1,425 @@
+import io
+import datetime
+from pathlib import Path
+import pandas as pd
+import pytest
+from report_data import (
+    add_confidence_intervals,
+    compile_filters,
+    confidence_interval,
+    date_range,
+    parse_bools,
+)
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_date_range_of_a_year_is_half_open():
+    assert date_range(2019) == (datetime.date(2019, 1, 1), datetime.date(2020, 1, 1))
+
+
+def test_date_range_narrows_a_year_to_explicit_dates():
+    assert date_range(2019, "2019-03-01", "2021-01-01") == (
+        datetime.date(2019, 3, 1),
+        datetime.date(2020, 1, 1),
+    )
+    assert date_range(None, "2019-03-01") == (datetime.date(2019, 3, 1), None)
+
+
+def test_compile_filters_without_filters_is_empty():
+    assert compile_filters() == ("", {})
+
+
+def test_compile_filters_uses_sargable_date_bounds():
+    sql, params = compile_filters(year="2018")
+
+    assert sql == (
+        " AND transaction_date >= :f_start_date AND transaction_date < :f_end_date"
+    )
+    assert "EXTRACT" not in sql
+    assert params == {
+        "f_start_date": datetime.date(2018, 1, 1),
+        "f_end_date": datetime.date(2019, 1, 1),
+    }
+
+
+def test_compile_filters_binds_scalars_and_lists():
+    sql, params = compile_filters(
+        card_brand=["Visa", "Amex"], is_fraud=True, gender=None
+    )
+
+    assert sql == (
+        " AND card_brand IN (:f_card_brand_0, :f_card_brand_1)"
+        " AND is_fraud = :f_is_fraud"
+    )
+    assert params == {
+        "f_card_brand_0": "Visa",
+        "f_card_brand_1": "Amex",
+        "f_is_fraud": True,
+    }
+
+
+def test_compile_filters_never_inlines_values():
+    sql, params = compile_filters(merchant_city="O'Fallon; DROP TABLE x")
+
+    assert sql == " AND merchant_city = :f_merchant_city"
+    assert params == {"f_merchant_city": "O'Fallon; DROP TABLE x"}
+
+
+def test_compile_filters_empty_list_matches_nothing():
+    assert compile_filters(card_type=[]) == (" AND FALSE", {})
+
+
+def test_compile_filters_rejects_unknown_filters():
+    with pytest.raises(ValueError, match="Unknown filter"):
+        compile_filters(amount=5)
+
+
+def test_parse_bools_only_maps_boolean_columns():
+    df = pd.read_csv(io.StringIO("is_fraud,gender\nt,f\nf,t\n,t\n"))
+
+    df = parse_bools(df, ["is_fraud"])
+
+    assert df["is_fraud"].tolist()[:2] == [True, False]
+    assert pd.isna(df["is_fraud"].iloc[2])
+    assert df["gender"].tolist() == ["f", "t", "t"]
+
+
+@pytest.fixture
+def generations(monkeypatch):
+    # Published snapshot generation and the mart's, as seen by report_data
+    import report_data
+
+    state = {"snapshot": None, "database": None}
+    monkeypatch.setattr(
+        report_data.snapshot, "snapshot_generation", lambda: state["snapshot"]
+    )
+    monkeypatch.setattr(
+        report_data, "database_generation", lambda max_age=None: state["database"]
+    )
+    return state
+
+
+def test_snapshot_is_current_at_the_mart_generation(generations):
+    from report_data import snapshot_is_current
+
+    generations.update(snapshot=4, database=4)
+    assert snapshot_is_current()
+
+    generations.update(database=5)
+    assert not snapshot_is_current()
+
+
+def test_snapshot_is_trusted_without_a_database_generation(generations):
+    from report_data import snapshot_is_current
+
+    generations.update(snapshot=4, database=None)
+    assert snapshot_is_current()
+
+    generations.update(snapshot=None)
+    assert not snapshot_is_current()
+
+
+def test_stale_snapshot_reports_the_mart_generation(generations, monkeypatch):
+    import report_data
+
+    monkeypatch.setattr(report_data, "BACKEND", "snapshot")
+    generations.update(snapshot=4, database=5)
+    assert report_data.current_generation() == 5
+
+    generations.update(database=4)
+    assert report_data.current_generation() == 4
+
+
+@pytest.fixture
+def pooled(monkeypatch, tmp_path):
+    # report_data with a fresh process-wide engine over a SQLite file
+    import sqlalchemy
+    import report_data
+    from telemetry import Telemetry
+
+    created = []
+
+    def create_engine(url, connect_args, **settings):
+        created.append(settings)
+        return sqlalchemy.create_engine(
+            f"sqlite:///{tmp_path / 'pool.db'}",
+            poolclass=sqlalchemy.pool.QueuePool,
+            **settings,
+        )
+
+    monkeypatch.setenv("DB_CONNECTION_STRING", "postgresql://")
+    monkeypatch.setattr(report_data, "create_engine", create_engine)
+    monkeypatch.setattr(report_data, "_engine", None)
+    monkeypatch.setattr(
+        report_data,
+        "_pool_metrics",
+        {"connects": 0, "checkouts": 0, "wait_total_s": 0.0, "wait_max_s": 0.0},
+    )
+    monkeypatch.setattr(
+        report_data, "TELEMETRY", Telemetry("test", log_path=None, store_in_db=False)
+    )
+    return report_data, created
+
+
+def test_sessions_share_one_engine_built_from_the_pool_settings(pooled):
+    report_data, created = pooled
+
+    engine = report_data.get_engine()
+
+    assert report_data.get_engine() is engine
+    assert created == [report_data.POOL_SETTINGS]
+
+
+def test_pool_stats_count_checkouts_and_reuse_connections(pooled):
+    report_data, _ = pooled
+    assert report_data.pool_stats() == {
+        "connects": 0,
+        "checkouts": 0,
+        "wait_total_s": 0.0,
+        "wait_max_s": 0.0,
+    }
+
+    with report_data.connect():
+        held = report_data.pool_stats()
+    for _ in range(2):
+        with report_data.connect():
+            pass
+    stats = report_data.pool_stats()
+
+    assert held["checked_out"] == 1
+    assert stats["checked_out"] == 0 and stats["idle"] == 1
+    assert stats["connects"] == 1 and stats["checkouts"] == 3
+    assert stats["wait_avg_s"] == stats["wait_total_s"] / 3
+    assert stats["pool_size"] == report_data.POOL_SETTINGS["pool_size"]
+
+
+def fake_loader(results):
+    # DataLoader stand-in: query path -> DataFrame, or an error message
+    class Loader:
+        def __init__(self, query_path, sample=None):
+            self.query_path = query_path
+            self.sample = sample
+            self.error = None
+
+        def get_data(self, **filters):
+            result = results[self.query_path]
+            if callable(result):
+                result = result(self, filters)
+            if isinstance(result, str):
+                self.error = result
+                return pd.DataFrame()
+            return result
+
+    return Loader
+
+
+def test_load_concurrently_runs_every_query_at_once(monkeypatch):
+    import threading
+    import report_data
+
+    # Each query waits for the others, so a sequential run would time out
+    barrier = threading.Barrier(3, timeout=5)
+    seen = []
+
+    def query(value):
+        def run(loader, filters):
+            barrier.wait()
+            seen.append((loader.sample, filters))
+            return pd.DataFrame({"x": [value]})
+
+        return run
+
+    monkeypatch.setattr(
+        report_data,
+        "DataLoader",
+        fake_loader({"a.sql": query(1), "b.sql": query(2), "c.sql": query(3)}),
+    )
+
+    frames, timings, errors = report_data.load_concurrently(
+        {"a": "a.sql", "b": "b.sql", "c": "c.sql"}, sample="1pct", year=2019
+    )
+
+    assert {name: df["x"].tolist() for name, df in frames.items()} == {
+        "a": [1],
+        "b": [2],
+        "c": [3],
+    }
+    assert set(timings) == {"a", "b", "c"} and errors == {}
+    assert seen == [("1pct", {"year": 2019})] * 3
+
+
+def test_load_concurrently_isolates_a_failed_query(monkeypatch):
+    import report_data
+
+    monkeypatch.setattr(
+        report_data,
+        "DataLoader",
+        fake_loader({"ok.sql": pd.DataFrame({"x": [1]}), "bad.sql": "timeout"}),
+    )
+
+    frames, timings, errors = report_data.load_concurrently(
+        {"ok": "ok.sql", "bad": "bad.sql"}, max_workers=1
+    )
+
+    assert frames["ok"]["x"].tolist() == [1]
+    assert frames["bad"].empty
+    assert errors == {"bad": "timeout"}
+    assert set(timings) == {"ok", "bad"}
+
+
+def combined_rows():
+    # dashboard_combined.sql output: one row per group, tagged with its grain
+    nan = float("nan")
+    return pd.DataFrame(
+        {
+            "grain": ["hour", "date", "date", "hour", "age_group", "merchant_category"],
+            "transaction_date": [None, "2019-01-02", "2019-01-01", None, None, None],
+            "hour_of_day": [13.0, nan, nan, 9.0, nan, nan],
+            "age_group": [None, None, None, None, "Senior (60+)", None],
+            "merchant_category": [None, None, None, None, None, "Airlines"],
+            "vol": [4, 2, 3, 1, 5, 6],
+            "rev": [nan, 20.0, 30.0, nan, nan, 60.0],
+            "fraud_cases": [0, 1, 0, 1, 0, 2],
+            "fraud_loss": [nan, 5.0, 0.0, nan, nan, 9.0],
+        }
+    )
+
+
+def test_load_combined_splits_the_grains_into_the_single_query_frames(monkeypatch):
+    import report_data
+
+    monkeypatch.setattr(
+        report_data, "DataLoader", fake_loader({"combined.sql": combined_rows()})
+    )
+
+    frames, timings, errors = report_data.load_combined("combined.sql")
+
+    daily, hourly = frames["daily"], frames["hourly"]
+    assert list(daily.columns) == [
+        "transaction_date",
+        "vol",
+        "rev",
+        "fraud_cases",
+        "fraud_loss",
+    ]
+    assert daily["transaction_date"].tolist() == ["2019-01-01", "2019-01-02"]
+    assert daily["rev"].tolist() == [30.0, 20.0]
+    assert list(hourly.columns) == ["hour_of_day", "vol", "fraud_cases"]
+    assert hourly["hour_of_day"].tolist() == [9, 13]
+    assert hourly["hour_of_day"].dtype.kind == "i"
+    assert frames["demos"].to_dict("records") == [
+        {"age_group": "Senior (60+)", "vol": 5, "fraud_cases": 0}
+    ]
+    assert frames["cats"]["merchant_category"].tolist() == ["Airlines"]
+    assert list(timings) == ["combined"] and errors == {}
+
+
+def test_load_combined_keeps_estimate_columns(monkeypatch):
+    import report_data
+
+    df = combined_rows()
+    df["vol_var"], df["vol_lo"], df["vol_hi"] = 1.0, df["vol"] - 1, df["vol"] + 1
+    monkeypatch.setattr(report_data, "DataLoader", fake_loader({"combined.sql": df}))
+
+    frames, _, _ = report_data.load_combined("combined.sql", sample="1pct")
+
+    assert list(frames["hourly"].columns) == [
+        "hour_of_day",
+        "vol",
+        "fraud_cases",
+        "vol_var",
+        "vol_lo",
+        "vol_hi",
+    ]
+
+
+def test_load_combined_failure_yields_empty_frames(monkeypatch):
+    import report_data
+
+    monkeypatch.setattr(
+        report_data, "DataLoader", fake_loader({"combined.sql": "no database"})
+    )
+
+    frames, _, errors = report_data.load_combined("combined.sql")
+
+    assert set(frames) == {"daily", "hourly", "demos", "cats"}
+    assert all(frame.empty for frame in frames.values())
+    assert errors == {"combined": "no database"}
+
+
+def test_confidence_interval_of_a_scalar_estimate():
+    assert confidence_interval(100.0, 25.0, z=2) == (90.0, 110.0)
+    # Rounding can leave a tiny negative variance; it means no spread
+    assert confidence_interval(7.0, -1e-12, z=2) == (7.0, 7.0)
+
+
+def test_confidence_interval_defaults_to_the_configured_z(monkeypatch):
+    import report_data
+
+    monkeypatch.setattr(report_data, "APPROX_Z", 3.0)
+    assert confidence_interval(10.0, 4.0) == (4.0, 16.0)
+
+
+def test_add_confidence_intervals_bounds_every_estimated_measure():
+    df = pd.DataFrame(
+        {
+            "vol": [100.0, 50.0],
+            "vol_var": [16.0, -0.5],
+            "rev": [10.0, 20.0],
+            "rev_var": [1.0, 9.0],
+            "fraud_cases": [1.0, 0.0],
+        }
+    )
+
+    df = add_confidence_intervals(df, z=2)
+
+    assert df["vol_lo"].tolist() == [92.0, 50.0]
+    assert df["vol_hi"].tolist() == [108.0, 50.0]
+    assert df["rev_lo"].tolist() == [8.0, 14.0]
+    assert df["rev_hi"].tolist() == [12.0, 26.0]
+    assert "fraud_cases_lo" not in df.columns
+
+
+def test_sample_queries_return_horvitz_thompson_estimates(pooled, monkeypatch):
+    report_data, _ = pooled
+    monkeypatch.setattr(report_data, "get_result_cache", lambda: None)
+    with report_data.get_engine().begin() as connection:
+        connection.exec_driver_sql(
+            "CREATE TABLE sample_transactions "
+            "(sample_name TEXT, hour_of_day INT, is_fraud BOOLEAN, inclusion_prob REAL)"
+        )
+        connection.exec_driver_sql(
+            "INSERT INTO sample_transactions VALUES "
+            "('1pct', 9, FALSE, 0.5), ('1pct', 9, TRUE, 0.25), "
+            "('1pct', 13, TRUE, 0.1), ('0.1pct', 13, TRUE, 0.01)"
+        )
+    loader = report_data.DataLoader(
+        ROOT / "models" / "queries" / "hourly_stats.sql",
+        fetch_mode="read_sql",
+        backend="postgres",
+        sample="1pct",
+    )
+
+    df = loader.get_data()
+
+    # Each row stands for 1 / p rows, with variance (1 - p) / p^2 per row
+    assert loader.approximate and loader.error is None
+    assert df["hour_of_day"].tolist() == [9, 13]
+    assert df["vol"].tolist() == pytest.approx([6.0, 10.0])
+    assert df["vol_var"].tolist() == pytest.approx([14.0, 90.0])
+    assert df["fraud_cases"].tolist() == pytest.approx([4.0, 10.0])
+    assert df["fraud_cases_var"].tolist() == pytest.approx([12.0, 90.0])
+    margin = report_data.APPROX_Z * 90.0**0.5
+    assert df["vol_lo"].iloc[1] == pytest.approx(10.0 - margin)
+    assert df["vol_hi"].iloc[1] == pytest.approx(10.0 + margin)
+
+
+def test_unknown_samples_are_rejected(pooled):
+    report_data, _ = pooled
+    loader = report_data.DataLoader(
+        ROOT / "models" / "queries" / "hourly_stats.sql", sample="5pct"
+    )
+
+    assert loader.get_data().empty
+    assert loader.error == "Unknown sample: 5pct"
@@ -0,0 +1,76 @@
+import pickle
+import sqlite3
+import pandas as pd
+import pytest
+from result_cache import ResultCache, cache_key
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResultCache(tmp_path / "results.sqlite", 1024 * 1024)
+
+
+def test_cache_key_depends_on_query_and_params():
+    key = cache_key("SELECT 1", {"b": 2, "a": 1})
+
+    assert key == cache_key("SELECT 1", {"a": 1, "b": 2})
+    assert key != cache_key("SELECT 1", {"a": 1, "b": 3})
+    assert key != cache_key("SELECT 2", {"a": 1, "b": 2})
+
+
+def test_round_trip_keeps_dtypes(cache):
+    df = pd.DataFrame(
+        {
+            "transaction_date": pd.to_datetime(["2019-01-01", "2019-01-02"]),
+            "merchant_category": ["Grocery", None],
+            "vol": [1.5, 2.25],
+            "txn_count": pd.array([3, None], dtype="Int64"),
+            "is_fraud": [True, False],
+        }
+    )
+
+    cache.put("k", 1, df)
+
+    pd.testing.assert_frame_equal(cache.get("k", 1), df)
+
+
+def test_older_generations_miss(cache):
+    df = pd.DataFrame({"vol": [1.0]})
+    cache.put("k", 1, df)
+
+    assert cache.get("k", 2) is None
+    cache.put("other", 2, df)
+    assert cache.get("k", 1) is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    df = pd.DataFrame({"vol": range(1000)})
+    cache = ResultCache(tmp_path / "results.sqlite", 1024 * 1024)
+    cache.put("probe", 1, df)
+    size = cache._connect().execute("SELECT size FROM results").fetchone()[0]
+    cache.max_bytes = size * 2
+
+    cache.put("a", 1, df)
+    cache.put("b", 1, df)
+    cache.get("a", 1)
+    cache.put("c", 1, df)
+
+    assert cache.get("a", 1) is not None and cache.get("c", 1) is not None
+    assert cache.get("b", 1) is None
+
+
+def test_pickled_entries_from_older_versions_are_dropped(tmp_path):
+    path = tmp_path / "results.sqlite"
+    db = sqlite3.connect(path)
+    db.execute(
+        "CREATE TABLE results (key TEXT PRIMARY KEY, generation INTEGER NOT NULL, "
+        "payload BLOB NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)"
+    )
+    db.execute(
+        "INSERT INTO results VALUES ('k', 1, ?, 1, 0)",
+        (pickle.dumps(pd.DataFrame({"vol": [1.0]})),),
+    )
+    db.commit()
+    db.close()
+
+    assert ResultCache(path, 1024 * 1024).get("k", 1) is None
@@ -0,0 +1,17 @@
+import pyarrow
+from snapshot import _group
+
+
+def test_volume_counts_rows_without_a_fraud_label():
+    table = pyarrow.table(
+        {
+            "hour_of_day": [1, 1, 1, 2],
+            "fraud_flag": [1, 0, None, None],
+        }
+    )
+
+    df = _group(table, "hour_of_day", ["vol", "fraud_cases"])
+
+    assert df["hour_of_day"].tolist() == [1, 2]
+    assert df["vol"].tolist() == [3, 1]
+    assert df["fraud_cases"].fillna(0).tolist() == [1, 0]
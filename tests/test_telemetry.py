@@ -0,0 +1,70 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from telemetry import (
+    Telemetry,
+    _current_span,
+    record_client_sql_time,
+    submit_in_context,
+)
+
+
+def test_spans_emit_client_sql_time_to_every_enclosing_span(tmp_path):
+    log = tmp_path / "telemetry.jsonl"
+    telemetry = Telemetry("test", log_path=log, store_in_db=False)
+
+    with telemetry.span("load", "outer") as outer:
+        with telemetry.span("load", "inner", shard=1) as inner:
+            record_client_sql_time(0.25)
+            inner.rows = 10
+        record_client_sql_time(0.5)
+        outer.rows = 10
+
+    records = [json.loads(line) for line in log.read_text().splitlines()]
+    assert [r["name"] for r in records] == ["inner", "outer"]
+    assert [r["client_sql_s"] for r in records] == [0.25, 0.75]
+    assert "db_s" not in records[0]
+    assert records[0]["attrs"] == {"shard": 1}
+    assert records[1]["rows"] == 10 and records[1]["status"] == "ok"
+
+
+def test_failed_spans_record_the_error(tmp_path):
+    log = tmp_path / "telemetry.jsonl"
+    telemetry = Telemetry("test", log_path=log, store_in_db=False)
+
+    try:
+        with telemetry.span("refresh", "broken"):
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+
+    record = json.loads(log.read_text())
+    assert record["status"] == "error" and record["error"] == "boom"
+
+
+def test_time_outside_a_span_is_ignored(tmp_path):
+    telemetry = Telemetry("test", log_path=tmp_path / "t.jsonl", store_in_db=False)
+    with telemetry.span("load", "earlier") as earlier:
+        pass
+
+    record_client_sql_time(1.0)
+
+    assert _current_span.get() is None
+    assert earlier.client_sql_s == 0.0
+
+
+def test_spans_on_pool_threads_keep_their_parent(tmp_path):
+    log = tmp_path / "telemetry.jsonl"
+    telemetry = Telemetry("test", log_path=log, store_in_db=False)
+
+    def work(shard):
+        with telemetry.span("load", "shard", shard=shard) as span:
+            record_client_sql_time(0.25)
+        return span.parent
+
+    with telemetry.span("load", "outer") as outer:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [submit_in_context(executor, work, i) for i in range(4)]
+            parents = [future.result() for future in futures]
+
+    assert parents == [outer] * 4
+    assert outer.client_sql_s == 1.0
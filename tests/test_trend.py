@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+from trend import downsample, lttb, minmax, point_budget
+
+
+def series(n=1000, seed=7):
+    rng = np.random.default_rng(seed)
+    return np.arange(n, dtype=np.float64), rng.normal(100, 10, n)
+
+
+def test_point_budget_follows_the_chart_width():
+    assert point_budget(1100) == 550
+    assert point_budget(2) == 3
+
+
+@pytest.mark.parametrize("method", [lttb, minmax])
+def test_short_series_are_kept_whole(method):
+    x, y = series(50)
+    assert method(x, y, 50).tolist() == list(range(50))
+    assert method(x, y, 200).tolist() == list(range(50))
+
+
+@pytest.mark.parametrize("method", [lttb, minmax])
+def test_downsamplers_keep_the_ends_within_budget(method):
+    x, y = series()
+    kept = method(x, y, 100)
+
+    assert len(kept) <= 100
+    assert kept[0] == 0 and kept[-1] == len(x) - 1
+    assert (np.diff(kept) > 0).all()
+
+
+def test_lttb_keeps_exactly_the_budget():
+    x, y = series()
+    assert len(lttb(x, y, 100)) == 100
+
+
+def test_lttb_keeps_a_spike():
+    x, y = series()
+    y[517] = 1000
+    assert 517 in lttb(x, y, 50)
+
+
+def test_minmax_keeps_every_bucket_extreme():
+    x, y = series()
+    y[300], y[700] = 1000, -1000
+    kept = minmax(x, y, 10)
+
+    assert {300, 700} <= set(kept.tolist())
+    assert y[kept].max() == y.max() and y[kept].min() == y.min()
+
+
+def test_downsample_returns_long_rows_per_measure():
+    days = pd.date_range("2015-01-01", periods=400, freq="D")
+    df = pd.DataFrame(
+        {
+            "transaction_date": days[::-1],
+            "rev": np.arange(400, dtype=np.float64),
+            "fraud_loss": [None] * 400,
+        }
+    )
+    out = downsample(df, 40, "minmax")
+
+    assert list(out.columns) == ["transaction_date", "measure", "value"]
+    assert out.groupby("measure").size().max() <= 40
+    for _, rows in out.groupby("measure"):
+        assert rows["transaction_date"].is_monotonic_increasing
+        assert rows["transaction_date"].iloc[0] == days[0]
+        assert rows["transaction_date"].iloc[-1] == days[-1]
+    assert (out.loc[out["measure"] == "fraud_loss", "value"] == 0).all()
+
+
+def test_downsample_rejects_unknown_methods():
+    df = pd.DataFrame({"transaction_date": [], "rev": [], "fraud_loss": []})
+    with pytest.raises(ValueError):
+        downsample(df, 10, "mean")
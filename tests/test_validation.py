@@ -0,0 +1,127 @@
+import json
+import threading
+import numpy as np
+import pandas as pd
+from validation import KeySet, ReferentialValidator
+
+
+def test_key_set_membership():
+    keys = KeySet([5, 1, 3, 3])
+
+    assert len(keys) == 3
+    assert keys.sorted_keys().tolist() == [1, 3, 5]
+    assert keys.contains([0, 1, 2, 3, 5, 6]).tolist() == [
+        False,
+        True,
+        False,
+        True,
+        True,
+        False,
+    ]
+
+
+def test_empty_key_set_contains_nothing():
+    assert KeySet().contains([1, 2]).tolist() == [False, False]
+    assert len(KeySet()) == 0
+
+
+def test_key_set_merges_keys_added_from_threads():
+    keys = KeySet([0])
+    threads = [
+        threading.Thread(target=keys.add, args=(np.arange(i, 1000, 4),))
+        for i in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert keys.sorted_keys().tolist() == list(range(1000))
+    assert keys.contains([999, 1000]).tolist() == [True, False]
+
+
+def transactions(raw):
+    raw = pd.DataFrame(raw)
+    clean = pd.DataFrame(
+        {
+            "id": pd.to_numeric(raw["id"], errors="coerce").astype("Int64"),
+            "date": pd.to_datetime(raw["date"], errors="coerce"),
+            "client_id": raw["client_id"].astype("Int64"),
+            "card_id": raw["card_id"].astype("Int64"),
+            "amount": pd.to_numeric(raw["amount"].str.lstrip("$"), errors="coerce"),
+            "mcc": raw["mcc"].astype("Int64"),
+        }
+    )
+    return raw, clean
+
+
+def validator_with_keys():
+    validator = ReferentialValidator(run_id="run1")
+    validator.key_sets = {
+        "users_data": KeySet([1, 2]),
+        "cards_data": KeySet([10, 20]),
+        "mcc_codes": KeySet([5411]),
+    }
+    return validator
+
+
+def test_validator_quarantines_orphans_and_unparseable_rows():
+    validator = validator_with_keys()
+    raw, clean = transactions(
+        {
+            "id": ["1", "2", "3", "x"],
+            "date": ["2019-01-01", "2019-01-02", "bad", "2019-01-04"],
+            "client_id": [1, 3, 2, 2],
+            "card_id": [10, 20, 20, None],
+            "amount": ["$1.00", "$2.00", "$3.00", "$4.00"],
+            "mcc": [5411, 5411, 5411, 5411],
+        }
+    )
+
+    accepted, rejects = validator.validate("transactions_data", raw, clean)
+
+    assert accepted["id"].tolist() == [1]
+    assert rejects["run_id"].tolist() == ["run1"] * 3
+    assert rejects["source_table"].unique().tolist() == ["transactions_data"]
+    assert rejects["reason"].tolist() == [
+        "unknown client_id",
+        "unparseable date",
+        "unparseable id",
+    ]
+    assert json.loads(rejects["raw"].iloc[0])["client_id"] == 3
+    assert json.loads(rejects["raw"].iloc[2])["card_id"] is None
+    assert validator.counts["transactions_data"] == [1, 3]
+
+
+def test_validator_collects_accepted_keys_for_later_tables():
+    validator = validator_with_keys()
+    raw, clean = transactions(
+        {
+            "id": ["7", "8"],
+            "date": ["2019-01-01", "2019-01-02"],
+            "client_id": [1, 9],
+            "card_id": [10, 10],
+            "amount": ["$1.00", "$2.00"],
+            "mcc": [5411, 5411],
+        }
+    )
+    validator.validate("transactions_data", raw, clean)
+
+    labels = pd.DataFrame({"id": ["7", "8"], "is_fraud": ["No", "Yes"]})
+    clean_labels = pd.DataFrame(
+        {"id": labels["id"].astype("Int64"), "is_fraud": [False, True]}
+    )
+    accepted, rejects = validator.validate("train_fraud_labels", labels, clean_labels)
+
+    assert accepted["id"].tolist() == [7]
+    assert rejects["reason"].tolist() == ["unknown transaction id"]
+
+
+def test_unvalidated_tables_pass_through():
+    validator = ReferentialValidator()
+    clean = pd.DataFrame({"id": [1, 2]})
+
+    accepted, rejects = validator.validate("users_data", clean, clean)
+
+    assert accepted is clean
+    assert rejects is None